@@ -0,0 +1,82 @@
+import hashlib
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _current_umask() -> int:
+    # os.umask can only be read by setting it, so do it once at import
+    # rather than while other threads may be creating files.
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+UMASK = _current_umask()
+
+
+def _target_mode(path_file_name: str) -> int:
+    """Mode of the existing file, or what open() would give a new one."""
+    try:
+        return os.stat(path_file_name).st_mode & 0o7777
+    except FileNotFoundError:
+        return 0o666 & ~UMASK
+
+
+def _file_matches(path_file_name: str, data: bytes) -> bool:
+    """True when the file already holds exactly ``data``."""
+    try:
+        if os.path.getsize(path_file_name) != len(data):
+            return False
+        digest = hashlib.sha256()
+        with open(path_file_name, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return False
+    return digest.digest() == hashlib.sha256(data).digest()
+
+
+def write_if_changed(path_file_name: str, data: bytes) -> bool:
+    """Atomically replaces the file with ``data`` unless it already matches.
+
+    The file is written with write_atomic, so readers see either the old
+    or the new file. Returns True when the file was written, False when the
+    existing file was reused.
+    """
+    if _file_matches(path_file_name, data):
+        logger.info(f"Unchanged, kept existing {path_file_name}")
+        return False
+
+    write_atomic(path_file_name, data)
+    return True
+
+
+def write_atomic(path_file_name: str, data: bytes, sync: bool = True) -> None:
+    """Replaces the file with ``data`` so readers never see a partial file.
+
+    The data goes to a temporary file in the same folder, which is renamed
+    over the destination. With ``sync`` it is flushed to disk first, so the
+    new content also survives a crash; caches that can be rebuilt skip it.
+    """
+    folder = os.path.dirname(path_file_name) or "."
+    fd, tmp_path = tempfile.mkstemp(
+        dir=folder, prefix=f".{os.path.basename(path_file_name)}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            if sync:
+                f.flush()
+                os.fsync(f.fileno())
+        # mkstemp creates the file readable by its owner only.
+        os.chmod(tmp_path, _target_mode(path_file_name))
+        os.replace(tmp_path, path_file_name)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
@@ -0,0 +1,414 @@
+"""Command line entry point: ``erd-drawio <command>``.
+
+Only argparse and logging are imported at startup; every command imports
+what it needs when it runs, so ``locate`` never pays for watchdog and no
+command pays for python-dotenv unless it falls back to the .env file.
+"""
+
+import argparse
+import logging
+import os
+import sys
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def _env(name: str) -> Optional[str]:
+    """Reads a setting from the environment, loading .env on first miss."""
+    if name not in os.environ:
+        from dotenv import load_dotenv
+
+        load_dotenv()
+    return os.environ.get(name)
+
+
+def _size(text: str) -> int:
+    from drawio_tools.memory_monitor import parse_size
+
+    try:
+        return parse_size(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from e
+
+
+def _collect_dsl_files(paths: List[str]) -> List[str]:
+    files: List[str] = []
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, _, names in sorted(os.walk(path)):
+                files.extend(
+                    os.path.join(folder, name)
+                    for name in sorted(names)
+                    if name.endswith(".dsl")
+                )
+        else:
+            files.append(path)
+    return files
+
+
+def cmd_generate(args: argparse.Namespace) -> int:
+    from drawio_tools.drawio_generator import DrawioGenerator
+    from drawio_tools.memory_monitor import MemoryBudgetExceeded, MemoryMonitor
+
+    input_path = args.input
+    output_file_name = args.output
+    if input_path is None:
+        file_name = _env("INPUT_FILE_NAME_PATH")
+        if not file_name:
+            logger.error("No input given and INPUT_FILE_NAME_PATH is missing.")
+            return 1
+        input_path = os.path.join("input", file_name)
+    if output_file_name is None:
+        output_file_name = _env("OUTPUT_FILE_NAME") or (
+            os.path.splitext(os.path.basename(input_path))[0] + ".drawio"
+        )
+
+    model_cache = None
+    if args.cache_dir:
+        from drawio_tools.model_cache import ModelCache
+
+        model_cache = ModelCache(args.cache_dir)
+
+    memory_monitor = None
+    if args.memory_budget is not None or args.memory_report:
+        # Per-phase allocation sites cost two snapshots a phase, so only
+        # an explicit report pays for them.
+        memory_monitor = MemoryMonitor(
+            budget=args.memory_budget,
+            top=5 if args.memory_report else 0,
+            strategy=args.memory_strategy,
+        )
+        memory_monitor.start()
+
+    logger.info(f"Input DSL file: {input_path}")
+    try:
+        style_rules = None
+        if args.style_rules:
+            from drawio_tools.style_rules import load_style_rules
+
+            style_rules = load_style_rules(args.style_rules)
+        generator = DrawioGenerator(
+            edge_aggregation=args.edge_aggregation,
+            model_cache=model_cache,
+            wide_table_threshold=args.wide_table_threshold,
+            wide_table_policy=args.wide_table_policy,
+            table_rendering=args.table_rendering,
+            edge_waypoints=args.edge_waypoints,
+            nudge_overlaps=args.nudge_overlaps,
+            style_rules=style_rules,
+            memory_monitor=memory_monitor,
+            serializer=args.serializer,
+        )
+        generator.output_dir = args.output_dir
+        generator.import_file(input_path)
+        if output_file_name == "-":
+            generator.write_mxgraph_stream(sys.stdout.buffer, compact=args.compact)
+            return 0
+        if args.formats:
+            # One render and one layout for the .drawio and every format
+            base_name = os.path.splitext(output_file_name)[0]
+            formats = list(dict.fromkeys(["drawio", *args.formats]))
+            for path in generator.write_outputs(base_name, formats, args.compact):
+                logger.info(f"Successfully generated: {path}")
+            return 0
+        written = generator.write_mxgraph(output_file_name, compact=args.compact)
+    except MemoryBudgetExceeded as e:
+        logger.error(str(e))
+        return 1
+    except Exception as e:
+        logger.exception(f"An error occurred during Drawio generation: {e}")
+        return 1
+    finally:
+        if memory_monitor is not None:
+            if args.memory_report:
+                logger.info(memory_monitor.report())
+            memory_monitor.stop()
+    output_path = os.path.join(args.output_dir, output_file_name)
+    if written:
+        logger.info(f"Successfully generated: {output_path}")
+    else:
+        logger.info(f"Already up to date: {output_path}")
+    return 0
+
+
+def cmd_locate(args: argparse.Namespace) -> int:
+    from drawio_tools.drawio_table_locator import DrawioTableLocator
+
+    drawio_file = args.drawio_file or _env("OUTPUT_FILE_NAME")
+    if not drawio_file:
+        logger.error("No .drawio file given and OUTPUT_FILE_NAME is not set.")
+        return 1
+
+    locator = DrawioTableLocator()
+    locator.output_dir = args.output_dir
+    try:
+        if drawio_file == "-":
+            locator.read_stream(sys.stdin.buffer)
+        else:
+            locator.read_file(drawio_file)
+    except Exception as e:
+        logger.exception(f"An error occurred while processing the file: {e}")
+        return 1
+    locator.print_positions()
+    return 0
+
+
+def cmd_reverse(args: argparse.Namespace) -> int:
+    from drawio_tools.drawio_dsl_extractor import DrawioDslExtractor
+
+    extractor = DrawioDslExtractor()
+    extractor.output_dir = args.output_dir
+    try:
+        if args.drawio_file == "-":
+            extractor.read_stream(sys.stdin.buffer)
+        else:
+            extractor.read_file(args.drawio_file)
+    except Exception as e:
+        logger.exception(f"An error occurred while processing the file: {e}")
+        return 1
+    dsl = extractor.to_dsl()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(dsl)
+        logger.info(f"Successfully extracted: {args.output}")
+    else:
+        sys.stdout.write(dsl)
+    return 0
+
+
+def cmd_watch(args: argparse.Namespace) -> int:
+    import time
+
+    from watchdog.observers import Observer
+
+    from drawio_tools.drawio_watcher import RegenerationScheduler
+    from drawio_tools.watch_handlers import DrawioEventHandler, DslEventHandler
+
+    scheduler = RegenerationScheduler(
+        max_workers=args.max_workers,
+        input_dir=args.input_dir,
+        output_dir=args.output_dir,
+    )
+    scheduler.scan_includes()
+    os.makedirs(args.output_dir, exist_ok=True)
+    observer = Observer()
+    observer.schedule(DslEventHandler(scheduler), path=args.input_dir, recursive=True)
+    observer.schedule(DrawioEventHandler(), path=args.output_dir, recursive=True)
+    observer.start()
+    print(
+        f"✅ Watching '{args.input_dir}/' for .dsl and "
+        f"'{args.output_dir}/' for .drawio changes..."
+    )
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        observer.stop()
+        print("\n👋 Stopped watcher.")
+    observer.join()
+    scheduler.shutdown()
+    return 0
+
+
+def cmd_batch(args: argparse.Namespace) -> int:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from drawio_tools.drawio_watcher import output_path_for, regenerate
+    from drawio_tools.dsl_parse_cache import DslParseCache
+    from drawio_tools.model_cache import ModelCache
+
+    jobs = []
+    for path in args.inputs:
+        for dsl_file in _collect_dsl_files([path]):
+            root = path if os.path.isdir(path) else os.path.dirname(path)
+            jobs.append((dsl_file, output_path_for(dsl_file, root, args.output_dir)))
+
+    parse_cache = DslParseCache(cache_dir=args.cache_dir)
+    model_cache = ModelCache(args.cache_dir) if args.cache_dir else None
+    failures = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {
+            executor.submit(
+                regenerate, dsl_file, output_path, parse_cache, None, model_cache
+            ): dsl_file
+            for dsl_file, output_path in jobs
+        }
+        for future, dsl_file in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                failures += 1
+                logger.error(f"Failed to generate {dsl_file}: {e}")
+    logger.info(
+        f"Generated {len(jobs) - failures} of {len(jobs)} models "
+        f"({parse_cache.hits} cached parses reused)"
+    )
+    if model_cache is not None:
+        logger.info(f"Reused {model_cache.hits} cached models")
+    return 1 if failures else 0
+
+
+def cmd_diff(args: argparse.Namespace) -> int:
+    from drawio_tools.drawio_diff import DrawioDiff
+    from drawio_tools.drawio_generator import DrawioGenerator
+
+    old = DrawioGenerator()
+    new = DrawioGenerator()
+    old.import_file(args.old)
+    new.import_file(args.new)
+    new.output_dir = args.output_dir
+    diff = DrawioDiff(old, new)
+    diff.print_report()
+    if args.output:
+        diff.write_mxgraph(args.output, collapse_unchanged=args.collapse_unchanged)
+    return 1 if diff.has_changes() else 0
+
+
+def cmd_stats(args: argparse.Namespace) -> int:
+    from drawio_tools.drawio_generator import DrawioGenerator
+    from drawio_tools.schema_graph import SchemaGraph
+
+    graph = SchemaGraph.from_model(DrawioGenerator().parse(args.input))
+    graph.print_report(top=args.top)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="erd-drawio", description="Create draw.io ERD diagrams from DSL files."
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="debug logging")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="generate one .drawio file")
+    generate.add_argument(
+        "input", nargs="?", help="DSL file (default: input/$INPUT_FILE_NAME_PATH)"
+    )
+    generate.add_argument(
+        "-o",
+        "--output",
+        help=".drawio file name, - for stdout (default: $OUTPUT_FILE_NAME)",
+    )
+    generate.add_argument("--output-dir", default="output")
+    generate.add_argument("--compact", action="store_true", help="minimize file size")
+    generate.add_argument("--cache-dir", help="reuse parsed models from this folder")
+    generate.add_argument(
+        "--edge-aggregation", default="none", choices=["none", "pair", "target"]
+    )
+    generate.add_argument(
+        "--wide-table-threshold",
+        type=int,
+        help="summarize tables with more columns than this",
+    )
+    generate.add_argument(
+        "--wide-table-policy", default="summary", choices=["summary", "collapsed"]
+    )
+    generate.add_argument(
+        "--table-rendering",
+        default="rows",
+        choices=["rows", "html"],
+        help="html draws each table as a single cell",
+    )
+    generate.add_argument(
+        "--edge-waypoints",
+        action="store_true",
+        help="store edges fully routed so draw.io skips routing on open",
+    )
+    generate.add_argument(
+        "--nudge-overlaps",
+        action="store_true",
+        help="move overlapping tables apart instead of only warning",
+    )
+    generate.add_argument(
+        "--style-rules", help="JSON file of table and column style rules"
+    )
+    generate.add_argument(
+        "--serializer",
+        default="etree",
+        choices=["etree", "template"],
+        help="template writes large diagrams faster, skipping ElementTree",
+    )
+    generate.add_argument(
+        "--memory-budget",
+        type=_size,
+        help="fail (or fall back) when traced memory exceeds this, e.g. 800M",
+    )
+    generate.add_argument(
+        "--memory-strategy",
+        default="fail",
+        choices=["fail", "html"],
+        help="html retries over-budget renders with --table-rendering html",
+    )
+    generate.add_argument(
+        "--memory-report",
+        action="store_true",
+        help="log peak and net memory of each phase",
+    )
+    generate.add_argument(
+        "--format",
+        dest="formats",
+        action="append",
+        help="also emit this format (svg, mermaid, dot, json); repeatable",
+    )
+    generate.set_defaults(func=cmd_generate)
+
+    locate = commands.add_parser("locate", help="print ARRANGE lines of a .drawio")
+    locate.add_argument(
+        "drawio_file",
+        nargs="?",
+        help="file name, - for stdin (default: $OUTPUT_FILE_NAME)",
+    )
+    locate.add_argument("--output-dir", default="output")
+    locate.set_defaults(func=cmd_locate)
+
+    reverse = commands.add_parser("reverse", help="rebuild the DSL of a .drawio")
+    reverse.add_argument("drawio_file", help="file name, - for stdin")
+    reverse.add_argument("--output-dir", default="output")
+    reverse.add_argument("-o", "--output", help="DSL file to write (default: stdout)")
+    reverse.set_defaults(func=cmd_reverse)
+
+    watch = commands.add_parser("watch", help="regenerate outputs on DSL changes")
+    watch.add_argument("--input-dir", default="input")
+    watch.add_argument("--output-dir", default="output")
+    watch.add_argument(
+        "--max-workers",
+        type=int,
+        default=int(os.environ.get("WATCHER_MAX_WORKERS", "4")),
+    )
+    watch.set_defaults(func=cmd_watch)
+
+    batch = commands.add_parser("batch", help="generate many models concurrently")
+    batch.add_argument("inputs", nargs="+", help="DSL files or folders of them")
+    batch.add_argument("--output-dir", default="output")
+    batch.add_argument("--workers", type=int, default=4)
+    batch.add_argument(
+        "--cache-dir", help="persist parsed files and models in this folder"
+    )
+    batch.set_defaults(func=cmd_batch)
+
+    diff = commands.add_parser("diff", help="compare two versions of a model")
+    diff.add_argument("old")
+    diff.add_argument("new")
+    diff.add_argument("-o", "--output", help="also write a highlighted .drawio")
+    diff.add_argument("--output-dir", default="output")
+    diff.add_argument("--collapse-unchanged", action="store_true")
+    diff.set_defaults(func=cmd_diff)
+
+    stats = commands.add_parser("stats", help="print schema graph statistics")
+    stats.add_argument("input", help="DSL file")
+    stats.add_argument("--top", type=int, default=10, help="rows listed per section")
+    stats.set_defaults(func=cmd_stats)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="[%(asctime)s] [%(levelname)s] %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    )
+    result: int = args.func(args)
+    return result
@@ -0,0 +1,135 @@
+import xml.etree.ElementTree as ET
+from functools import lru_cache
+from typing import Dict, Set
+
+# mxGraphModel attributes draw.io falls back to when they are missing.
+GRAPH_MODEL_DEFAULTS = {
+    "gridSize": "10",
+    "guides": "1",
+    "tooltips": "1",
+    "connect": "1",
+    "arrows": "1",
+    "fold": "1",
+    "page": "1",
+    "pageScale": "1",
+    "math": "0",
+    "shadow": "0",
+}
+
+# Scroll offsets of the last editor session, recomputed when the file opens.
+VIEW_ONLY_ATTRIBUTES = {"dx", "dy"}
+
+# Style values identical to draw.io's built-in defaults.
+STYLE_DEFAULTS = {
+    "align": "center",
+    "collapsible": "1",
+    "fontSize": "12",
+    "fontStyle": "0",
+    "rounded": "0",
+    "shadow": "0",
+    "strokeColor": "default",
+    "verticalAlign": "middle",
+}
+
+# Keys whose empty value differs from draw.io's default, with the value
+# meaning the same thing; an empty endArrow is no arrow, not "classic".
+EMPTY_STYLE_VALUES = {"endArrow": "none"}
+
+# Ids kept verbatim: the default layers and the cells the table locator skips.
+RESERVED_IDS = {"0", "1", "title", "table-date"}
+
+# Elements wrapping an mxCell to attach metadata attributes to it
+METADATA_WRAPPERS = ("UserObject", "object")
+
+DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+
+@lru_cache(maxsize=None)
+def compact_style(style: str) -> str:
+    """Drops empty and default-valued keys from a draw.io style string."""
+    kept = []
+    for item in style.split(";"):
+        key, _, value = item.partition("=")
+        if not value and key in EMPTY_STYLE_VALUES:
+            item = f"{key}={EMPTY_STYLE_VALUES[key]}"
+        elif not value or STYLE_DEFAULTS.get(key) == value:
+            continue
+        kept.append(item)
+    return ";".join(kept)
+
+
+class IdShortener:
+    """Maps cell ids to short base-36 ids in order of first appearance.
+
+    The mapping only depends on document order, so the same diagram always
+    gets the same ids even when the original ids are random.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, str] = {}
+        self._counter = 2
+
+    def __call__(self, cell_id: str) -> str:
+        if cell_id in RESERVED_IDS:
+            return cell_id
+        short_id = self._ids.get(cell_id)
+        if short_id is None:
+            short_id = self._next_id()
+            self._ids[cell_id] = short_id
+        return short_id
+
+    def _next_id(self) -> str:
+        while True:
+            n = self._counter
+            self._counter += 1
+            digits = []
+            while n:
+                n, rem = divmod(n, 36)
+                digits.append(DIGITS[rem])
+            short_id = "".join(reversed(digits))
+            if short_id not in RESERVED_IDS:
+                return short_id
+
+
+def compact_graph_model(graph_model: ET.Element) -> None:
+    """Rewrites an mxGraphModel in place into its smallest equivalent form."""
+    for key in list(graph_model.attrib):
+        if (
+            key in VIEW_ONLY_ATTRIBUTES
+            or GRAPH_MODEL_DEFAULTS.get(key) == graph_model.attrib[key]
+        ):
+            del graph_model.attrib[key]
+
+    shorten = IdShortener()
+    # Cells the table locator reads positions from keep x="0" and y="0".
+    located: Set[int] = set()
+    for cell in graph_model.iter():
+        if cell.tag in METADATA_WRAPPERS:
+            # Wrapped cells carry their id on the UserObject.
+            cell.attrib["id"] = shorten(cell.attrib["id"])
+            located.update(id(child) for child in cell.findall("mxCell"))
+            continue
+        if cell.tag != "mxCell":
+            continue
+        attrib = cell.attrib
+        for key in ("id", "parent", "source", "target"):
+            if key in attrib:
+                attrib[key] = shorten(attrib[key])
+        if attrib.get("value"):
+            located.add(id(cell))
+        elif "value" in attrib:
+            del attrib["value"]
+        if "style" in attrib:
+            attrib["style"] = compact_style(attrib["style"])
+
+        geometry = cell.find("mxGeometry")
+        if geometry is None:
+            continue
+        if id(cell) not in located:
+            for key in ("x", "y"):
+                if geometry.attrib.get(key) == "0":
+                    del geometry.attrib[key]
+        if geometry.attrib.get("relative") == "1":
+            # Edge geometry is defined by its terminals and points only.
+            geometry.attrib.pop("width", None)
+            geometry.attrib.pop("height", None)
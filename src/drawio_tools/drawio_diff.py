@@ -0,0 +1,185 @@
+import logging
+from typing import Dict, List, Tuple
+
+from drawio_tools.drawio_generator import DrawioGenerator
+
+logger = logging.getLogger(__name__)
+
+# Highlight fills of the diff diagram
+ADDED_FILL = "#B9E0A5"
+CHANGED_FILL = "#FFE599"
+REMOVED_FILL = "#F8CECC"
+
+# (source table, source column, target table, target column)
+ReferenceKey = Tuple[str, str, str, str]
+
+
+class DrawioDiff:
+    """Structural diff between two imported versions of a model.
+
+    Tables and references are compared through per-name dictionaries, so
+    the comparison is linear in the size of both models.
+    """
+
+    def __init__(self, old: DrawioGenerator, new: DrawioGenerator) -> None:
+        self.old = old
+        self.new = new
+        self.added_tables: List[str] = []
+        self.removed_tables: List[str] = []
+        self.changed_tables: List[str] = []
+        # table -> {"added": [...], "removed": [...], "changed": [...]}
+        self.column_changes: Dict[str, Dict[str, List[str]]] = {}
+        self.added_references: List[ReferenceKey] = []
+        self.removed_references: List[ReferenceKey] = []
+        self.changed_references: List[ReferenceKey] = []
+        self._compare_tables()
+        self._compare_references()
+
+    def has_changes(self) -> bool:
+        return any(
+            [
+                self.added_tables,
+                self.removed_tables,
+                self.changed_tables,
+                self.added_references,
+                self.removed_references,
+                self.changed_references,
+            ]
+        )
+
+    def _compare_tables(self) -> None:
+        old_columns = {
+            name: tuple(columns) for name, columns in self.old.tables.items()
+        }
+        for name, columns in self.new.tables.items():
+            old = old_columns.pop(name, None)
+            if old is None:
+                self.added_tables.append(name)
+            elif old != tuple(columns):
+                self.changed_tables.append(name)
+                self.column_changes[name] = self._compare_columns(
+                    self.old.tables[name], columns
+                )
+        self.removed_tables = list(old_columns)
+
+    def _compare_columns(
+        self, old_columns: List[Tuple[str, str]], new_columns: List[Tuple[str, str]]
+    ) -> Dict[str, List[str]]:
+        old_keys = dict(old_columns)
+        new_keys = dict(new_columns)
+        return {
+            "added": [col for col in new_keys if col not in old_keys],
+            "removed": [col for col in old_keys if col not in new_keys],
+            "changed": [
+                col
+                for col, key in new_keys.items()
+                if col in old_keys and old_keys[col] != key
+            ],
+        }
+
+    def _reference_arrows(
+        self, generator: DrawioGenerator
+    ) -> Dict[ReferenceKey, Tuple[str, str]]:
+        return {
+            (
+                table,
+                ref["column_name"],
+                ref["table_reference"],
+                ref["column_reference"],
+            ): (
+                ref["start_arrow"],
+                ref["end_arrow"],
+            )
+            for table, refs in generator.references.items()
+            for ref in refs
+        }
+
+    def _compare_references(self) -> None:
+        old_refs = self._reference_arrows(self.old)
+        for key, arrows in self._reference_arrows(self.new).items():
+            old_arrows = old_refs.pop(key, None)
+            if old_arrows is None:
+                self.added_references.append(key)
+            elif old_arrows != arrows:
+                self.changed_references.append(key)
+        self.removed_references = list(old_refs)
+
+    def print_report(self) -> None:
+        for name in self.added_tables:
+            print(f"+ TABLE {name}")
+        for name in self.removed_tables:
+            print(f"- TABLE {name}")
+        for name in self.changed_tables:
+            print(f"~ TABLE {name}")
+            changes = self.column_changes[name]
+            for col in changes["added"]:
+                print(f"    + {col}")
+            for col in changes["removed"]:
+                print(f"    - {col}")
+            for col in changes["changed"]:
+                print(f"    ~ {col}")
+        for marker, refs in (
+            ("+", self.added_references),
+            ("-", self.removed_references),
+            ("~", self.changed_references),
+        ):
+            for src_table, src_col, tgt_table, tgt_col in refs:
+                print(
+                    f"{marker} REFERENCE {src_table}.{src_col} -> {tgt_table}.{tgt_col}"
+                )
+
+    def write_mxgraph(
+        self, file_name: str = "diff.drawio", collapse_unchanged: bool = False
+    ) -> bool:
+        """Writes the new model with added, changed and removed tables filled.
+
+        Removed tables are drawn from the old model at their old position,
+        with the new generator's render options.
+        With ``collapse_unchanged`` untouched tables only show their header.
+        """
+        options = self.new.render_options()
+        generator = DrawioGenerator(
+            edge_aggregation=options.edge_aggregation,
+            wide_table_threshold=options.wide_table_threshold,
+            wide_table_policy=options.wide_table_policy,
+            table_rendering=options.table_rendering,
+            edge_waypoints=options.edge_waypoints,
+            nudge_overlaps=options.nudge_overlaps,
+            style_rules=options.style_rules,
+            serializer=self.new.serializer,
+        )
+        generator.table_fill_overrides = dict(options.table_fill_overrides)
+        generator.collapsed_tables = set(options.collapsed_tables)
+        generator.output_dir = self.new.output_dir
+        generator.tables = dict(self.new.tables)
+        generator.references = self.new.references
+        generator.positions = dict(self.new.positions)
+        generator.title = self.new.title
+        generator.created_at_string = self.new.created_at_string
+
+        for name in self.removed_tables:
+            generator.tables[name] = self.old.tables[name]
+            if name in self.old.positions:
+                generator.positions.setdefault(name, self.old.positions[name])
+
+        generator.table_fill_overrides.update(
+            {name: ADDED_FILL for name in self.added_tables}
+        )
+        generator.table_fill_overrides.update(
+            {name: CHANGED_FILL for name in self.changed_tables}
+        )
+        generator.table_fill_overrides.update(
+            {name: REMOVED_FILL for name in self.removed_tables}
+        )
+        if collapse_unchanged:
+            generator.collapsed_tables.update(
+                name
+                for name in generator.tables
+                if name not in generator.table_fill_overrides
+            )
+        written = generator.write_mxgraph(file_name)
+        logger.info(
+            f"Diff: {len(self.added_tables)} added, {len(self.changed_tables)} "
+            f"changed, {len(self.removed_tables)} removed tables"
+        )
+        return written
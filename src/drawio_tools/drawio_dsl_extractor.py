@@ -0,0 +1,330 @@
+import base64
+import io
+import logging
+import os
+import re
+import xml.etree.ElementTree as ET
+import zlib
+from typing import BinaryIO, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import unquote
+
+from drawio_tools.drawio_compact import METADATA_WRAPPERS
+from drawio_tools.drawio_generator import KEY_SUFFIXES, parse_column_line
+from drawio_tools.drawio_render import ErdModel
+from drawio_tools.styles import ROW_HEIGHT
+
+logger = logging.getLogger(__name__)
+
+# Ids the generator gives the title and the CreatedAt/UpdatedAt block
+TITLE_ID = "title"
+DATE_TABLE_ID = "table-date"
+
+# "COLUMN → REFERENCED_COLUMN" lines of an aggregated edge label
+AGGREGATED_LABEL_RE = re.compile(r"^(\w+) → (\w+)$")
+
+
+class _Table(NamedTuple):
+    name: str
+    x: int
+    y: int
+    height: int
+    # DSL lines of the full column list, for wide and HTML tables
+    columns_metadata: Optional[str]
+
+
+class _Edge(NamedTuple):
+    source: str
+    target: str
+    start_arrow: str
+    end_arrow: str
+    value: str
+    exit_y: Optional[float]
+    entry_y: Optional[float]
+
+
+class DrawioDslExtractor:
+    """Rebuilds the DSL model of a .drawio file written by DrawioGenerator.
+
+    The file is read with ``iterparse`` and every cell is dropped once it is
+    classified, so memory grows with the model (tables, columns, edges)
+    rather than with the size of the XML. Cells are recognised by their
+    parent relationships (table, its rows, their icon and column cells)
+    rather than by id, so compact files with shortened ids work too.
+    """
+
+    def __init__(self) -> None:
+        self.output_dir = "output"
+        self.model = ErdModel(tables={}, references={})
+
+    def read_file(self, file_name: str) -> None:
+        """Reads the model of a .drawio file inside output_dir."""
+        with open(os.path.join(self.output_dir, file_name), "rb") as f:
+            self.read_stream(f)
+
+    def read_stream(self, stream: BinaryIO) -> None:
+        """Reads the model of a .drawio document from a binary stream."""
+        self._reset()
+        for element in self._cells(stream):
+            self._classify(element)
+        self.model = self._build_model()
+
+    def _reset(self) -> None:
+        self._title = ""
+        self._tables: Dict[str, _Table] = {}
+        self._schemas: Dict[str, Tuple[str, int, int]] = {}
+        # Row id -> its table id, and [column name, key] of each row
+        self._rows: Dict[str, str] = {}
+        self._row_columns: Dict[str, List[str]] = {}
+        self._date_values: List[str] = []
+        self._edges: List[_Edge] = []
+
+    def _cells(self, stream: BinaryIO) -> Iterator[ET.Element]:
+        """Yields each cell once complete, then frees it.
+
+        Wrapped cells are yielded as their wrapper. Compressed diagrams, as
+        saved by older draw.io versions, are inflated first.
+        """
+        context = ET.iterparse(stream, events=("start", "end"))
+        parents: List[ET.Element] = []
+        wrapped = 0
+        for event, element in context:
+            if event == "start":
+                if element.tag in METADATA_WRAPPERS:
+                    wrapped += 1
+                parents.append(element)
+                continue
+            parents.pop()
+            if element.tag in METADATA_WRAPPERS:
+                wrapped -= 1
+                yield element
+            elif element.tag == "mxCell" and not wrapped:
+                yield element
+            elif element.tag == "diagram" and (element.text or "").strip():
+                yield from self._cells(_inflate(element.text or ""))
+            else:
+                continue
+            if parents and not wrapped:
+                # Processed cells are not needed anymore.
+                parents[-1].clear()
+
+    def _classify(self, element: ET.Element) -> None:
+        if element.tag in METADATA_WRAPPERS:
+            cell = element.find("mxCell")
+            if cell is None:
+                return
+            cell_id = element.get("id", "")
+            value = element.get("table") or element.get("label") or ""
+            columns_metadata = element.get("columns")
+        else:
+            cell = element
+            cell_id = cell.get("id", "")
+            value = cell.get("value", "")
+            columns_metadata = None
+        style = _style_dict(cell.get("style", ""))
+        parent = cell.get("parent", "")
+
+        if cell.get("edge") == "1":
+            self._edges.append(
+                _Edge(
+                    source=cell.get("source", ""),
+                    target=cell.get("target", ""),
+                    # Compact files write a missing arrow as "none".
+                    start_arrow=style.get("startArrow", "").replace("none", ""),
+                    end_arrow=style.get("endArrow", "").replace("none", ""),
+                    value=value,
+                    exit_y=_float(style.get("exitY")),
+                    entry_y=_float(style.get("entryY")),
+                )
+            )
+            return
+
+        geometry = cell.find("mxGeometry")
+        geometry_attrib: Dict[str, str] = {}
+        if geometry is not None:
+            geometry_attrib = geometry.attrib
+        x = int(float(geometry_attrib.get("x", "0")))
+        y = int(float(geometry_attrib.get("y", "0")))
+        if cell_id == TITLE_ID:
+            self._title = value
+        elif style.get("shape") == "swimlane":
+            self._schemas[cell_id] = (value, x, y)
+        elif style.get("shape") == "table" or element.tag in METADATA_WRAPPERS:
+            # HTML tables are plain cells always wrapped with their name.
+            self._tables[cell_id] = _Table(
+                name=value,
+                x=x,
+                y=y,
+                height=int(float(geometry_attrib.get("height", "0"))),
+                columns_metadata=columns_metadata,
+            )
+        elif parent in self._tables:
+            # draw.io writes parents before their children.
+            self._rows[cell_id] = parent
+            self._row_columns[cell_id] = ["", ""]
+        elif parent in self._row_columns:
+            # The column cell is offset by the width of the key icon cell.
+            self._row_columns[parent][0 if "x" in geometry_attrib else 1] = value
+        elif parent == DATE_TABLE_ID:
+            self._rows[cell_id] = parent
+        elif self._rows.get(parent) == DATE_TABLE_ID:
+            self._date_values.append(value)
+
+    def _build_model(self) -> ErdModel:
+        tables: Dict[str, List[Tuple[str, str]]] = {
+            table.name: [] for table in self._tables.values()
+        }
+        for row_id, (name, key) in self._row_columns.items():
+            table = self._tables[self._rows[row_id]]
+            if table.columns_metadata is None and name:
+                tables[table.name].append((name, key))
+        for table in self._tables.values():
+            if table.columns_metadata is not None:
+                # Covers the columns hidden from wide tables.
+                tables[table.name] = _parse_columns(table.columns_metadata)
+
+        references: Dict[str, List[Dict[str, str]]] = {}
+        for edge in self._edges:
+            for source_table, ref in self._edge_references(edge):
+                references.setdefault(source_table, []).append(ref)
+
+        positions: Dict[str, Tuple[int, int]] = {}
+        for table in self._tables.values():
+            positions[table.name] = (table.x, table.y)
+        for name, x, y in self._schemas.values():
+            positions[name] = (x, y)
+
+        return ErdModel(
+            tables=tables,
+            references=references,
+            positions=positions,
+            title=self._title,
+            created_at=self._created_at(),
+        )
+
+    def _edge_references(self, edge: _Edge) -> List[Tuple[str, Dict[str, str]]]:
+        """Returns the (source table, reference) pairs an edge stands for."""
+        arrows = {"start_arrow": edge.start_arrow, "end_arrow": edge.end_arrow}
+        if edge.source in self._row_columns and edge.target in self._row_columns:
+            return [
+                (
+                    self._tables[self._rows[edge.source]].name,
+                    {
+                        "column_name": self._row_columns[edge.source][0],
+                        "table_reference": self._tables[self._rows[edge.target]].name,
+                        "column_reference": self._row_columns[edge.target][0],
+                        **arrows,
+                    },
+                )
+            ]
+        source = self._tables.get(edge.source)
+        target = self._tables.get(edge.target)
+        if source is None or target is None:
+            logger.warning(
+                f"Skipped edge from {edge.source} to {edge.target}: "
+                f"not between tables"
+            )
+            return []
+
+        # Aggregated edges list their column pairs in the label.
+        pairs = [
+            match.groups()
+            for line in edge.value.split("<br>")
+            if (match := AGGREGATED_LABEL_RE.match(line))
+        ]
+        if not pairs and edge.exit_y is not None and edge.entry_y is not None:
+            # HTML tables: the edge is pinned to the row it connects.
+            pairs = [
+                (
+                    self._html_row_column(source, edge.exit_y),
+                    self._html_row_column(target, edge.entry_y),
+                )
+            ]
+        return [
+            (
+                source.name,
+                {
+                    "column_name": column,
+                    "table_reference": target.name,
+                    "column_reference": column_reference,
+                    **arrows,
+                },
+            )
+            for column, column_reference in pairs
+        ]
+
+    def _html_row_column(self, table: _Table, relative_y: float) -> str:
+        columns = _parse_columns(table.columns_metadata or "")
+        row = int(relative_y * table.height) // ROW_HEIGHT
+        shown = table.height // ROW_HEIGHT - 1
+        # Summarized wide tables only show their key columns.
+        displayed = columns if shown >= len(columns) else [c for c in columns if c[1]]
+        return displayed[row - 1][0]
+
+    def _created_at(self) -> str:
+        """Returns the value next to "CreatedAt:" in the date block."""
+        values = self._date_values
+        if "CreatedAt:" in values[:-1]:
+            return values[values.index("CreatedAt:") + 1]
+        return ""
+
+    def to_dsl(self) -> str:
+        """Returns the extracted model as DSL text."""
+        return model_to_dsl(self.model)
+
+
+def model_to_dsl(model: ErdModel) -> str:
+    """Formats a model as a DSL file that parses back into the same model."""
+    lines: List[str] = []
+    if model.title:
+        lines.append(f"TITLE {model.title}")
+    if model.created_at:
+        lines.append(f"CREATEDAT {model.created_at}")
+    for table_name, columns in model.tables.items():
+        lines.append("")
+        lines.append(f"TABLE {table_name} {{")
+        for name, key in columns:
+            lines.append(f"    {name}{KEY_SUFFIXES.get(key, '')}")
+        lines.append("}")
+    if any(model.references.values()):
+        lines.append("")
+    for table_name, refs in model.references.items():
+        for ref in refs:
+            arrows = ""
+            if ref["start_arrow"] and ref["end_arrow"]:
+                arrows = f" [{ref['start_arrow']}, {ref['end_arrow']}]"
+            lines.append(
+                f"REFERENCE {table_name}.{ref['column_name']} -> "
+                f"{ref['table_reference']}.{ref['column_reference']}{arrows}"
+            )
+    if model.positions:
+        lines.append("")
+    for name, (x, y) in model.positions.items():
+        lines.append(f"ARRANGE {name} ({x}, {y})")
+    return "\n".join(lines).lstrip("\n") + "\n"
+
+
+def _parse_columns(columns_metadata: str) -> List[Tuple[str, str]]:
+    """Parses the DSL lines of a table's columns metadata."""
+    columns = []
+    for line in columns_metadata.splitlines():
+        column = parse_column_line(line.strip())
+        if column is not None:
+            columns.append(column)
+        elif line.strip():
+            logger.warning(f"Skipping column that is not valid DSL → {line.strip()}")
+    return columns
+
+
+def _style_dict(style: str) -> Dict[str, str]:
+    items = (item.partition("=") for item in style.split(";") if item)
+    return {key: value for key, _, value in items}
+
+
+def _float(value: Optional[str]) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
+def _inflate(text: str) -> BinaryIO:
+    """Decodes a compressed <diagram> body into its mxGraphModel XML."""
+    data = zlib.decompress(base64.b64decode(text.strip()), -zlib.MAX_WBITS)
+    return io.BytesIO(unquote(data.decode("utf-8")).encode("utf-8"))
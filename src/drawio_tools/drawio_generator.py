@@ -1,11 +1,59 @@
+import copy
+import dataclasses
+import io
+import math
 import os
 import xml.etree.ElementTree as ET
-import uuid
+from contextlib import nullcontext
+from html import escape
 from collections import defaultdict
-from typing import Dict, List, Tuple, Match, Optional
+from typing import (
+    BinaryIO,
+    Callable,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Tuple,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+    Union,
+    overload,
+)
 import re
 import logging
 from datetime import date
+from functools import lru_cache
+from drawio_tools.atomic_write import write_if_changed
+from drawio_tools.drawio_compact import compact_graph_model
+from drawio_tools.drawio_overlap import find_overlaps, resolve_overlaps
+from drawio_tools.drawio_render import (
+    ErdModel,
+    RenderOptions,
+    RenderResult,
+    write_graph_model,
+)
+from drawio_tools.drawio_svg import render_svg
+from drawio_tools.drawio_templates import TemplateRoot
+from drawio_tools.emitters import EMITTERS
+from drawio_tools.dsl_events import (
+    ArrangeEvent,
+    ColumnEvent,
+    CreatedAtEvent,
+    DslEvent,
+    IncludeEvent,
+    ReferenceEvent,
+    TableEvent,
+    TitleEvent,
+)
+from drawio_tools.dsl_parse_cache import DslParseCache, DslStatement
+from drawio_tools.memory_monitor import MemoryBudgetExceeded, MemoryMonitor
+from drawio_tools.model_cache import ModelCache
+from drawio_tools.style_rules import StyleRules
 from drawio_tools.styles import (
     TABLE_DATE_COL_STYLE,
     TABLE_DATE_ROW_STYLE,
@@ -15,7 +63,10 @@ from drawio_tools.styles import (
     ICON_CELL_STYLE,
     COLUMN_CEL_STYLE,
     EDGE_STYLE,
+    HTML_TABLE_STYLE,
+    ROW_HEIGHT,
     ROW_STYLE,
+    SCHEMA_STYLE,
 )
 
 logger = logging.getLogger(__name__)
@@ -30,63 +81,428 @@ EDGES = [
     "ERzeroToOne",
 ]
 
+# Edge aggregation modes:
+#   none   - one edge per REFERENCE, row to row
+#   pair   - references between the same two tables share one labelled edge
+#   target - like pair, and every edge into a table fans in to its header
+EDGE_AGGREGATIONS = ["none", "pair", "target"]
+
+# Rendering of tables with more columns than wide_table_threshold:
+#   summary   - only PK, FK and referenced columns plus a "+N more" row
+#   collapsed - like summary, inside a collapsed container
+# Either way the full column list is kept in the table's "columns" metadata.
+WIDE_TABLE_POLICIES = ["summary", "collapsed"]
+
+# Table rendering modes:
+#   rows - a table container with a row, icon and column cell per column
+#   html - one cell per table whose label is an HTML table; edges are pinned
+#          to the rows through exit/entry constraints
+TABLE_RENDERINGS = ["rows", "html"]
+
+# DSL suffix of each column key, used for the "columns" metadata
+KEY_SUFFIXES = {"PK": " *", "FK": " +"}
+
+# Table name, optionally qualified by its schema: "orders" or "sales.orders"
+TABLE_NAME = r"\w+(?:\.\w+)?"
+
+# Geometry of the swimlane drawn around the tables of each schema
+SCHEMA_HEADER = 30
+SCHEMA_PADDING = 20
+SCHEMA_GAP = 40
+
+# Serializers of the .drawio document:
+#   etree    - build an ElementTree and write it
+#   template - format each cell from string templates, without Elements;
+#              compact output still goes through etree
+SERIALIZERS = ["etree", "template"]
+
+GRAPH_MODEL_ATTRIBUTES = {
+    "dx": "3247",
+    "dy": "533",
+    "grid": "0",
+    "gridSize": "10",
+    "guides": "1",
+    "tooltips": "1",
+    "connect": "1",
+    "arrows": "1",
+    "fold": "1",
+    "page": "1",
+    "pageScale": "1",
+    "pageWidth": "850",
+    "pageHeight": "1100",
+    "math": "0",
+    "shadow": "0",
+}
+
+# Cells are added either to an ElementTree <root> or to a TemplateRoot.
+CellRoot = TypeVar("CellRoot", ET.Element, TemplateRoot)
+
+
+def parse_column_line(line: str) -> Optional[Tuple[str, str]]:
+    """Parses a column line such as ``ORDER_ID *`` into (name, key)."""
+    if m := re.match(r"^(\w+)\s*\*$", line):
+        return (m.group(1), "PK")
+    elif m := re.match(r"^(\w+)\s*\+$", line):
+        return (m.group(1), "FK")
+    elif m := re.match(r"^(\w+)$", line):
+        return (m.group(1), "")
+    return None
+
+
+@lru_cache(maxsize=None)
+def _camel_case(key: str) -> str:
+    """Converts snake_case style keys; the few distinct keys are cached."""
+    parts = key.split("_")
+    return parts[0] + "".join(p.capitalize() for p in parts[1:])
+
+
+class RenderCancelled(Exception):
+    """Raised at a phase boundary when ``should_cancel`` returns True."""
+
 
 class DrawioGenerator:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        parse_cache: Optional[DslParseCache] = None,
+        edge_aggregation: str = "none",
+        model_cache: Optional[ModelCache] = None,
+        wide_table_threshold: Optional[int] = None,
+        wide_table_policy: str = "summary",
+        table_rendering: str = "rows",
+        edge_waypoints: bool = False,
+        nudge_overlaps: bool = False,
+        style_rules: Optional[StyleRules] = None,
+        memory_monitor: Optional[MemoryMonitor] = None,
+        serializer: str = "etree",
+    ) -> None:
         self.output_dir = "output"
+        # Model of the last import_file; see parse and render for the
+        # stateless API.
+        self.tables: Dict[str, List[Tuple[str, str]]] = {}
+        self.references: Dict[str, List[Dict[str, str]]] = {}
+        self.positions: Dict[str, Tuple[int, int]] = {}
+        self.title = ""
+        self.created_at_string = ""
+        self.edge_aggregation = edge_aggregation
+        # Tables with more columns than this use wide_table_policy.
+        self.wide_table_threshold = wide_table_threshold
+        self.wide_table_policy = wide_table_policy
+        self.table_rendering = table_rendering
+        # Store every edge routed with orthogonal waypoints and pinned sides.
+        self.edge_waypoints = edge_waypoints
+        # Move overlapping tables apart instead of only reporting them.
+        self.nudge_overlaps = nudge_overlaps
+        # Table and column style overrides matched by name.
+        self.style_rules = style_rules
+        # Per-table fill colours replacing the FACT/DIM defaults and rules.
+        self.table_fill_overrides: Dict[str, str] = {}
+        # Tables rendered as collapsed containers showing only their header.
+        self.collapsed_tables: Set[str] = set()
+        # Polled between parse and render phases to abandon stale work.
+        self.should_cancel: Optional[Callable[[], bool]] = None
         self.table_sizes: Dict[str, Tuple[int, int]] = defaultdict(lambda: (0, 0))
+        # See _referenced_columns; reset whenever the model changes.
+        self._referenced_index: Optional[Dict[str, Set[str]]] = None
+        # Share one cache between generators to parse INCLUDEd files only once
+        # per batch or watcher session.
+        self.parse_cache = parse_cache if parse_cache is not None else DslParseCache()
+        # Root files are only kept in a cache shared with other generators;
+        # otherwise they are streamed, since nothing would reuse them.
+        self._cache_root_files = parse_cache is not None
+        # Opt-in on-disk cache of whole parsed models, shared across runs.
+        self.model_cache = model_cache
+        # Opt-in per-phase memory peaks, checked against its budget.
+        self.memory_monitor = memory_monitor
+        # How write_mxgraph turns the cells into XML; see SERIALIZERS.
+        self.serializer = serializer
 
     def import_file(self, path_file_name: str) -> None:
-        (
+        with self._memory_phase("parse"):
+            model = self.parse(path_file_name)
+        self.tables = {name: list(columns) for name, columns in model.tables.items()}
+        self.references = {
+            table: [dict(ref) for ref in refs]
+            for table, refs in model.references.items()
+        }
+        self.positions = dict(model.positions)
+        self.title = model.title
+        self.created_at_string = model.created_at
+        self._referenced_index = None
+        self._check_cancelled("parse")
+
+    def parse(self, path_file_name: str) -> ErdModel:
+        """Parses a DSL file into an immutable model, leaving self untouched."""
+        parsed = None
+        if self.model_cache is not None:
+            parsed = self.model_cache.get(path_file_name)
+        if parsed is None:
+            included: Set[str] = set()
+            parsed = self._parse_dsl_file(path_file_name, included)
+            if self.model_cache is not None:
+                included.discard(os.path.realpath(path_file_name))
+                self.model_cache.put(path_file_name, parsed, sorted(included))
+        else:
+            logger.debug(f"Reusing cached model of {path_file_name}")
+        return ErdModel(*parsed)
+
+    def model(self) -> ErdModel:
+        """Returns a frozen snapshot of the generator's current model."""
+        return ErdModel(
             self.tables,
             self.references,
             self.positions,
             self.title,
             self.created_at_string,
-        ) = self._parse_dsl_file(path_file_name)
+        )
+
+    def render_options(self) -> RenderOptions:
+        """Returns the generator's rendering attributes as RenderOptions."""
+        return RenderOptions(
+            edge_aggregation=self.edge_aggregation,
+            wide_table_threshold=self.wide_table_threshold,
+            wide_table_policy=self.wide_table_policy,
+            table_rendering=self.table_rendering,
+            edge_waypoints=self.edge_waypoints,
+            nudge_overlaps=self.nudge_overlaps,
+            table_fill_overrides=dict(self.table_fill_overrides),
+            collapsed_tables=frozenset(self.collapsed_tables),
+            style_rules=self.style_rules,
+        )
+
+    def render(
+        self,
+        model: ErdModel,
+        options: Optional[RenderOptions] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+    ) -> RenderResult:
+        """Renders a model to an mxGraphModel without changing the generator.
+
+        The work happens on a copy made for this call, so one generator and
+        its caches can serve many threads at once.
+        """
+        worker = self._render_worker(model, options or RenderOptions(), should_cancel)
+        layout = worker._compute_layout()
+        graph_model = worker._build_graph_model(layout)
+        return RenderResult(
+            graph_model=graph_model,
+            layout=layout,
+            table_sizes=dict(worker.table_sizes),
+        )
+
+    def _render_worker(
+        self,
+        model: ErdModel,
+        options: RenderOptions,
+        should_cancel: Optional[Callable[[], bool]],
+    ) -> "DrawioGenerator":
+        """Returns a copy of the generator holding one model and its options."""
+        worker = copy.copy(self)
+        worker.tables = model.tables  # type: ignore[assignment]
+        worker.references = model.references  # type: ignore[assignment]
+        worker.positions = model.positions  # type: ignore[assignment]
+        worker.title = model.title
+        worker.created_at_string = model.created_at
+        worker.edge_aggregation = options.edge_aggregation
+        worker.wide_table_threshold = options.wide_table_threshold
+        worker.wide_table_policy = options.wide_table_policy
+        worker.table_rendering = options.table_rendering
+        worker.edge_waypoints = options.edge_waypoints
+        worker.nudge_overlaps = options.nudge_overlaps
+        worker.table_fill_overrides = dict(options.table_fill_overrides)
+        worker.collapsed_tables = set(options.collapsed_tables)
+        worker.style_rules = options.style_rules
+        worker.should_cancel = should_cancel
+        worker.table_sizes = defaultdict(lambda: (0, 0))
+        worker._referenced_index = None
+        return worker
+
+    def _check_cancelled(self, phase: str) -> None:
+        if self.should_cancel is not None and self.should_cancel():
+            raise RenderCancelled(f"Cancelled after {phase}")
+
+    def _memory_phase(self, phase: str) -> ContextManager[None]:
+        if self.memory_monitor is None:
+            return nullcontext()
+        return self.memory_monitor.phase(phase)
+
+    def _check_memory(self, phase: str) -> None:
+        if self.memory_monitor is not None:
+            self.memory_monitor.check(phase)
 
     ## Parse DSL FILE
-    def _parse_dsl_file(self, path_file_name: str) -> Tuple[
+    def iter_events(self, path_file_name: str) -> Iterator[DslEvent]:
+        """Yields the statements and columns of a DSL file as typed events.
+
+        INCLUDEd files are followed in place. Lines are read one at a time
+        and nothing is kept but the chain of open INCLUDEs, so memory stays
+        flat however large the model; stop iterating to stop reading.
+        References are not resolved against tables, since they may precede
+        them: that check belongs to the consumer (see parse).
+        """
+        return self._iter_events(path_file_name, [], set(), use_cache=False)
+
+    def _iter_events(
+        self,
+        path_file_name: str,
+        include_stack: List[str],
+        included: Set[str],
+        use_cache: bool,
+    ) -> Iterator[DslEvent]:
+        """Yields a file's events, following INCLUDEs.
+
+        With ``use_cache`` the events of INCLUDEd files, and of the root
+        file when parse_cache is shared, come from parse_cache, which keeps
+        them all in memory but parses every file only once. Other files are
+        streamed a line at a time.
+        """
+        real_path = os.path.realpath(path_file_name)
+        include_stack.append(real_path)
+        included.add(real_path)
+
+        events: Iterable[DslEvent]
+        if use_cache and (len(include_stack) > 1 or self._cache_root_files):
+            events = self.parse_cache.get_or_parse(
+                path_file_name, self._parse_dsl_statements
+            )
+        else:
+            events = self._iter_file_events(path_file_name)
+        for event in events:
+            if not isinstance(event, IncludeEvent):
+                # TITLE and CREATEDAT of included files are ignored.
+                if len(include_stack) == 1 or not isinstance(
+                    event, (TitleEvent, CreatedAtEvent)
+                ):
+                    yield event
+                continue
+            yield event
+            include_path = event.include_path
+            real_include = os.path.realpath(include_path)
+            if real_include in include_stack:
+                chain = include_stack[include_stack.index(real_include) :]
+                raise ValueError(
+                    f"{path_file_name} line {event.line}: INCLUDE cycle detected → "
+                    + " -> ".join(chain + [real_include])
+                )
+            if real_include in included:
+                logger.debug(f"Skipping {include_path}: already included")
+                continue
+            if not os.path.isfile(include_path):
+                raise ValueError(
+                    f"{path_file_name} line {event.line}: "
+                    f"INCLUDE file not found → {include_path}"
+                )
+            yield from self._iter_events(
+                include_path, include_stack, included, use_cache
+            )
+
+        include_stack.pop()
+
+    def _parse_dsl_file(
+        self, path_file_name: str, included: Optional[Set[str]] = None
+    ) -> Tuple[
         Dict[str, List[Tuple[str, str]]],
         Dict[str, List[Dict[str, str]]],
         Dict[str, Tuple[int, int]],
         str,
         str,
     ]:
-        tables: Dict[str, List[Tuple[str, str]]] = defaultdict(list)
+        tables: Dict[str, List[Tuple[str, str]]] = {}
         references: Dict[str, List[Dict[str, str]]] = defaultdict(list)
         positions: Dict[str, Tuple[int, int]] = {}
-        title: str = ""
-        created_at: str = ""
+        title = ""
+        created_at = ""
+        # (file, line number, table, column) of every REFERENCE endpoint,
+        # resolved once all TABLE blocks are known so references may precede
+        # tables, including tables defined in INCLUDEd files.
+        pending: List[Tuple[str, int, str, str]] = []
+
+        if included is None:
+            included = set()
+        for event in self._iter_events(path_file_name, [], included, use_cache=True):
+            if isinstance(event, ColumnEvent):
+                tables[event.table].append((event.column, event.key))
+            elif isinstance(event, TableEvent):
+                tables.setdefault(event.table, [])
+            elif isinstance(event, ReferenceEvent):
+                references[event.table].append(event.reference())
+                pending.append((event.path, event.line, event.table, event.column))
+                pending.append(
+                    (
+                        event.path,
+                        event.line,
+                        event.table_reference,
+                        event.column_reference,
+                    )
+                )
+            elif isinstance(event, ArrangeEvent):
+                positions[event.name] = (event.x, event.y)
+            elif isinstance(event, TitleEvent):
+                title = event.title
+            elif isinstance(event, CreatedAtEvent):
+                created_at = event.created_at
+        # Remove keys with empty lists
+        keys_to_remove = [key for key, value in tables.items() if not value]
+        for key in keys_to_remove:
+            del tables[key]
+            logger.warning(f"Removed Table {keys_to_remove} because without columns")
+        self._resolve_references(pending, tables)
+        return tables, references, positions, title, created_at
+
+    def _parse_dsl_statements(self, path_file_name: str) -> List[DslStatement]:
+        """Parses one DSL file, without following INCLUDEs, into events."""
+        return list(self._iter_file_events(path_file_name))
 
+    def _iter_file_events(self, path_file_name: str) -> Iterator[DslEvent]:
+        """Yields one file's events, leaving INCLUDEs to the caller."""
         current_table: Optional[str] = None
 
         with open(path_file_name) as file:
-            for line in file:
+            for line_no, line in enumerate(file, start=1):
                 line = line.strip()
                 line = re.sub(r"\s+", " ", line)
                 if not line or line.startswith("#"):
                     continue
 
-                if self._is_reference_line(line):
-                    self._parse_reference_line(line, tables, references)
+                if self._is_include_line(line):
+                    yield IncludeEvent(
+                        path_file_name,
+                        line_no,
+                        os.path.join(
+                            os.path.dirname(path_file_name),
+                            self._parse_include_line(line),
+                        ),
+                    )
+                elif self._is_reference_line(line):
+                    src_table, ref = self._parse_reference_line(line)
+                    yield ReferenceEvent(
+                        path_file_name,
+                        line_no,
+                        src_table,
+                        ref["column_name"],
+                        ref["table_reference"],
+                        ref["column_reference"],
+                        ref["start_arrow"],
+                        ref["end_arrow"],
+                    )
                 elif self._is_position_line(line):
-                    self._parse_positions(line, positions)
+                    name, (x, y) = self._parse_positions(line)
+                    yield ArrangeEvent(path_file_name, line_no, name, x, y)
                 elif self._is_title_line(line):
-                    title = self._parse_title(line)
+                    yield TitleEvent(path_file_name, line_no, self._parse_title(line))
                 elif self._is_create_date(line):
-                    created_at = self._parse_create_date(line)
+                    yield CreatedAtEvent(
+                        path_file_name, line_no, self._parse_create_date(line)
+                    )
                 elif self._is_table_line(line):
                     current_table = self._parse_table_line(line)
+                    yield TableEvent(path_file_name, line_no, current_table)
 
-                elif current_table:
-                    self._parse_column_line(line, current_table, tables)
-        # Remove keys with empty lists
-        keys_to_remove = [key for key, value in tables.items() if not value]
-        for key in keys_to_remove:
-            del tables[key]
-            logger.warning(f"Removed Table {keys_to_remove} because without columns")
-        return tables, references, positions, title, created_at
+                elif current_table is not None:
+                    column = parse_column_line(line)
+                    if column:
+                        yield ColumnEvent(
+                            path_file_name, line_no, current_table, *column
+                        )
 
     def _is_title_line(self, line: str) -> bool:
         return line.startswith("TITLE")
@@ -103,6 +519,9 @@ class DrawioGenerator:
     def _is_position_line(self, line: str) -> bool:
         return line.startswith("ARRANGE")
 
+    def _is_include_line(self, line: str) -> bool:
+        return line.startswith("INCLUDE ")
+
     def _parse_title(self, line: str) -> str:
         match = re.match(r"TITLE\s+(.*)", line)
         if match:
@@ -121,115 +540,95 @@ class DrawioGenerator:
             logger.warning("No CREATEDAT found in line")
             return ""
 
+    def _parse_include_line(self, line: str) -> str:
+        match = re.match(r"^INCLUDE (\S+)$", line)
+        if match:
+            return match.group(1)
+        else:
+            raise ValueError(f"line could not be parsed → {line}")
+
     def _parse_table_line(self, line: str) -> str:
-        match = re.match(r"^TABLE (\w+)(?:\s*)?", line)
+        match = re.match(rf"^TABLE ({TABLE_NAME})(?:\s*)?", line)
         if match:
             table_name = match.group(1)
             return table_name
         else:
             raise ValueError(f"No TABLE found in line: {line}")
 
-    def _parse_column_line(
-        self,
-        line: str,
-        current_table: str,
-        tables: Dict[str, List[Tuple[str, str]]],
-    ) -> None:
-        if m := re.match(r"^(\w+)\s*\*$", line):
-            self._add_primary_key(m, current_table, tables)
-        elif m := re.match(r"^(\w+)\s*\+$", line):
-            self._add_foreign_key(m, current_table, tables)
-        elif m := re.match(r"^(\w+)$", line):
-            self._add_regular_column(m, current_table, tables)
-
-    def _add_primary_key(
-        self, match: Match, table: str, tables: Dict[str, List[Tuple[str, str]]]
-    ) -> None:
-        col = match.group(1)
-        tables[table].append((col, "PK"))
-
-    def _add_foreign_key(
-        self, match: Match, table: str, tables: Dict[str, List[Tuple[str, str]]]
-    ) -> None:
-        col = match.group(1)
-        tables[table].append((col, "FK"))
-
-    def _add_regular_column(
-        self, match: Match, table: str, tables: Dict[str, List[Tuple[str, str]]]
-    ) -> None:
-        col = match.group(1)
-        tables[table].append((col, ""))
-
-    def _parse_reference_line(
-        self,
-        line: str,
-        tables: Dict[str, List[Tuple[str, str]]],
-        references: Dict[str, List[Dict[str, str]]],
-    ) -> None:
+    def _parse_reference_line(self, line: str) -> Tuple[str, Dict[str, str]]:
         # Compile regex
         reference_re = re.compile(
-            r"^REFERENCE (\w+)\.(\w+)\s*->\s*(\w+)\.(\w+)(?:\s*\[(\w+),\s*(\w+)\])?$"
+            rf"^REFERENCE ({TABLE_NAME})\.(\w+)\s*->\s*({TABLE_NAME})\.(\w+)"
+            r"(?:\s*\[(\w+),\s*(\w+)\])?$"
         )
         match = reference_re.match(line)
         if match:
             src_table, src_col, tgt_table, tgt_col, start_arrow, end_arrow = (
                 match.groups()
             )
-            references[src_table].append(
-                {
-                    "column_name": src_col,
-                    "table_reference": tgt_table,
-                    "column_reference": tgt_col,
-                    "start_arrow": start_arrow or "",
-                    "end_arrow": end_arrow or "",
-                }
-            )
-            self._add_reference_foreign_key(src_table, src_col, tables)
-            self._add_reference_foreign_key(tgt_table, tgt_col, tables)
+            return src_table, {
+                "column_name": src_col,
+                "table_reference": tgt_table,
+                "column_reference": tgt_col,
+                "start_arrow": start_arrow or "",
+                "end_arrow": end_arrow or "",
+            }
         else:
             raise ValueError(f"line could not be parsed → {line}")
 
-    def _add_reference_foreign_key(
+    def _resolve_references(
         self,
-        table_name: str,
-        column_name: str,
+        pending: List[Tuple[str, int, str, str]],
         tables: Dict[str, List[Tuple[str, str]]],
     ) -> None:
-        # Check if OPPORTUNITY_ID exists in reference_list
-
-        has_column = any(col == column_name for col, _ in tables[table_name])
+        """Marks referenced columns as FK, reporting every unresolved endpoint."""
+        column_index: Dict[str, Dict[str, int]] = {}
+        for table_name, columns in tables.items():
+            index: Dict[str, int] = {}
+            for position, (col, _) in enumerate(columns):
+                index.setdefault(col, position)
+            column_index[table_name] = index
+
+        errors: List[str] = []
+        for path_file_name, line_no, table_name, column_name in pending:
+            idx = column_index.get(table_name, {}).get(column_name)
+            if idx is None:
+                errors.append(
+                    f"{path_file_name} line {line_no}: Column '{column_name}' "
+                    f"not found in table '{table_name} or {table_name} doesn't exist'."
+                )
+                continue
+            col, key = tables[table_name][idx]
+            if key != "PK":
+                tables[table_name][idx] = (col, "FK")
 
-        if has_column:
-            # Update OPPORTUNITY_ID in source_list to FK
-            updated_list = [
-                (col, "FK" if col == column_name and key != "PK" else key)
-                for col, key in tables[table_name]
-            ]
-            tables[table_name] = updated_list
-        else:
+        if errors:
             raise ValueError(
-                f"Column '{column_name}' not found in table "
-                f"'{table_name} or {table_name} doesn't exist'."
+                f"{len(errors)} unresolved reference(s):\n" + "\n".join(errors)
             )
 
-    def _parse_positions(
-        self, line: str, positions: Dict[str, Tuple[int, int]]
-    ) -> None:
-        positions_re = re.compile(r"^ARRANGE (\w+)\s*\(\s*(-?\d+),\s*(-?\d+)\s*\)$")
+    def _parse_positions(self, line: str) -> Tuple[str, Tuple[int, int]]:
+        positions_re = re.compile(
+            rf"^ARRANGE ({TABLE_NAME})\s*\(\s*(-?\d+),\s*(-?\d+)\s*\)$"
+        )
         match = positions_re.match(line)
         if match:
             src_table, x, y = match.groups()
             if x and y:
-                positions[src_table] = (int(x), int(y))
+                return src_table, (int(x), int(y))
             else:
                 raise ValueError(f"Warning: line could not be parsed → {line}")
         else:
             raise ValueError(f"Warning: line could not be parsed → {line}")
 
     # Create XML
-    def _create_id(self) -> str:
-        """Generates a unique ID."""
-        return uuid.uuid4().hex
+    def _edge_id(self, used: Dict[str, int], source_id: str, target_id: str) -> str:
+        """Returns an id derived from the edge ends, stable across runs."""
+        edge_id = f"edge-{source_id}-{target_id}"
+        used[edge_id] = used.get(edge_id, 0) + 1
+        if used[edge_id] > 1:
+            edge_id = f"{edge_id}-{used[edge_id]}"
+        return edge_id
 
     def _create_root(self) -> ET.Element:
         """Creates the root mxCell elements."""
@@ -238,6 +637,7 @@ class DrawioGenerator:
         ET.SubElement(root, "mxCell", attrib={"id": "1", "parent": "0"})
         return root
 
+    @overload
     def _create_mxcell(
         self,
         root: ET.Element,
@@ -247,8 +647,34 @@ class DrawioGenerator:
         parent: str,
         vertex: str,
         geom_attrs: dict,
-    ) -> None:
-        """Helper to create mxCell with geometry."""
+    ) -> ET.Element: ...
+
+    @overload
+    def _create_mxcell(
+        self,
+        root: TemplateRoot,
+        id: str,
+        value: str,
+        style: str,
+        parent: str,
+        vertex: str,
+        geom_attrs: dict,
+    ) -> None: ...
+
+    def _create_mxcell(
+        self,
+        root: Union[ET.Element, TemplateRoot],
+        id: str,
+        value: str,
+        style: str,
+        parent: str,
+        vertex: str,
+        geom_attrs: dict,
+    ) -> Optional[ET.Element]:
+        """Helper to create mxCell with geometry; templates return None."""
+        if isinstance(root, TemplateRoot):
+            root.add_vertex(id, value, style, parent, vertex, geom_attrs)
+            return None
         cell = ET.SubElement(
             root,
             "mxCell",
@@ -261,74 +687,454 @@ class DrawioGenerator:
             },
         )
         ET.SubElement(cell, "mxGeometry", geom_attrs)
+        return cell
 
-    def _create_erd_xml(self, root: ET.Element) -> ET.Element:
+    def _create_erd_xml(
+        self,
+        root: CellRoot,
+        layout: Optional[Dict[str, Tuple[int, int, int, int]]] = None,
+    ) -> CellRoot:
         """Generates the ERD XML structure from tables."""
-        x_offset = 1
+        if layout is None:
+            layout = self._compute_layout()
+        self._report_overlaps(layout)
+        schema_boxes = self._schema_boxes(layout)
+        for schema, box in schema_boxes.items():
+            self._create_schema_xml(root, schema, box)
         for table_name, columns in self.tables.items():
+            x, y = self._cell_position(table_name, layout, schema_boxes)
+            root, _ = self._create_table_xml(root, table_name, columns, x, y)
+            self._check_memory("tables")
+        return root
+
+    def _create_schema_xml(
+        self, root: CellRoot, schema: str, box: Tuple[int, int, int, int]
+    ) -> None:
+        """Adds the swimlane container holding the tables of one schema."""
+        x, y, width, height = box
+        self._create_mxcell(
+            root,
+            id=self._schema_id(schema),
+            value=schema,
+            style=self._dict_to_style_string(SCHEMA_STYLE),
+            parent=str(1),
+            vertex=str(1),
+            geom_attrs={
+                "x": str(x),
+                "y": str(y),
+                "width": str(width),
+                "height": str(height),
+                "as": "geometry",
+            },
+        )
+
+    def _schema_of(self, table_name: str) -> Optional[str]:
+        """Returns the schema of a schema-qualified table name."""
+        schema, dot, _ = table_name.partition(".")
+        return schema if dot else None
+
+    def _schema_id(self, schema: str) -> str:
+        # "-" never appears in table names, so this cannot clash with them.
+        return f"schema-{schema}"
+
+    def _schema_boxes(
+        self, layout: Dict[str, Tuple[int, int, int, int]]
+    ) -> Dict[str, Tuple[int, int, int, int]]:
+        """Returns the box of every schema container around its tables."""
+        extents: Dict[str, List[int]] = {}
+        for table_name, (x, y, width, height) in layout.items():
+            schema = self._schema_of(table_name)
+            if schema is None:
+                continue
+            extent = extents.setdefault(schema, [x, y, x + width, y + height])
+            extent[0] = min(extent[0], x)
+            extent[1] = min(extent[1], y)
+            extent[2] = max(extent[2], x + width)
+            extent[3] = max(extent[3], y + height)
+        return {
+            schema: (
+                left - SCHEMA_PADDING,
+                top - SCHEMA_HEADER - SCHEMA_PADDING,
+                right - left + 2 * SCHEMA_PADDING,
+                bottom - top + SCHEMA_HEADER + 2 * SCHEMA_PADDING,
+            )
+            for schema, (left, top, right, bottom) in extents.items()
+        }
+
+    def _cell_position(
+        self,
+        table_name: str,
+        layout: Dict[str, Tuple[int, int, int, int]],
+        schema_boxes: Dict[str, Tuple[int, int, int, int]],
+    ) -> Tuple[int, int]:
+        """Returns a table's position relative to its parent cell."""
+        x, y, _, _ = layout[table_name]
+        schema = self._schema_of(table_name)
+        if schema is None:
+            return x, y
+        schema_x, schema_y, _, _ = schema_boxes[schema]
+        return x - schema_x, y - schema_y
+
+    def _report_overlaps(self, layout: Dict[str, Tuple[int, int, int, int]]) -> None:
+        """Logs the tables that still overlap."""
+        for first, second in find_overlaps(layout):
+            logger.warning(f"Tables {first} and {second} overlap")
+
+    def _compute_layout(
+        self, base_width: int = 170, height: int = ROW_HEIGHT
+    ) -> Dict[str, Tuple[int, int, int, int]]:
+        """Computes the absolute x, y, width and height of every table.
+
+        Tables of each schema are laid out on their own, relative to their
+        schema container, and the containers are then placed below the
+        unqualified tables.
+        """
+        unqualified: List[str] = []
+        groups: Dict[str, List[str]] = {}
+        for table_name in self.tables:
+            schema = self._schema_of(table_name)
+            if schema is None:
+                unqualified.append(table_name)
+            else:
+                groups.setdefault(schema, []).append(table_name)
+
+        layout = self._layout_tables(unqualified, 1, 100, base_width, height)
+        if groups:
+            local_layouts = {
+                schema: self._layout_schema(names, base_width, height)
+                for schema, names in groups.items()
+            }
+            layout.update(self._place_schemas(local_layouts, layout))
+        return {table_name: layout[table_name] for table_name in self.tables}
+
+    def _layout_tables(
+        self,
+        table_names: List[str],
+        x_start: int,
+        y_start: int,
+        base_width: int = 170,
+        height: int = ROW_HEIGHT,
+    ) -> Dict[str, Tuple[int, int, int, int]]:
+        """Places tables in a row unless ARRANGE'd, then clears overlaps."""
+        layout: Dict[str, Tuple[int, int, int, int]] = {}
+        x_offset = x_start
+        for table_name in table_names:
+            columns = self.tables[table_name]
+            width = self._table_width(table_name, columns, base_width)
+            table_height = height * (self._display_row_count(table_name, columns) + 1)
             if table_name in self.positions:
                 x, y = self.positions[table_name]
-                root, x_offset = self._create_table_xml(root, table_name, columns, x, y)
+                x_offset = width
             else:
-                root, width = self._create_table_xml(
-                    root, table_name, columns, x_offset
-                )
+                x, y = x_offset, y_start
                 x_offset += width + 10
-        return root
+            layout[table_name] = (x, y, width, table_height)
+        if self.nudge_overlaps:
+            nudged = resolve_overlaps(layout)
+            # Compared before schema tables are shifted into their
+            # container, so only real nudges are reported, in the
+            # coordinates ARRANGE uses.
+            for table_name, (x, y, _, _) in nudged.items():
+                position = layout[table_name][:2]
+                if table_name in self.positions and position != (x, y):
+                    logger.info(
+                        f"Moved {table_name} from {position} to ({x}, {y}) "
+                        f"to clear an overlap"
+                    )
+            layout = nudged
+        return layout
+
+    def _layout_schema(
+        self, table_names: List[str], base_width: int = 170, height: int = ROW_HEIGHT
+    ) -> Dict[str, Tuple[int, int, int, int]]:
+        """Lays out one schema's tables relative to its container.
+
+        Positions only depend on the schema's own tables. They are shifted
+        so the topmost and leftmost tables sit just inside the container.
+        """
+        layout = self._layout_tables(
+            table_names,
+            SCHEMA_PADDING,
+            SCHEMA_HEADER + SCHEMA_PADDING,
+            base_width,
+            height,
+        )
+        dx = SCHEMA_PADDING - min(x for x, _, _, _ in layout.values())
+        dy = SCHEMA_HEADER + SCHEMA_PADDING - min(y for _, y, _, _ in layout.values())
+        return {
+            name: (x + dx, y + dy, width, table_height)
+            for name, (x, y, width, table_height) in layout.items()
+        }
+
+    def _place_schemas(
+        self,
+        local_layouts: Dict[str, Dict[str, Tuple[int, int, int, int]]],
+        layout: Dict[str, Tuple[int, int, int, int]],
+    ) -> Dict[str, Tuple[int, int, int, int]]:
+        """Returns the absolute boxes of schema tables once containers are placed.
+
+        ARRANGE'd schemas keep their position; the others fill rows below
+        the unqualified tables, about twice as wide as they are tall.
+        """
+        sizes = {
+            schema: (
+                max(x + width for x, _, width, _ in local.values()) + SCHEMA_PADDING,
+                max(y + height for _, y, _, height in local.values()) + SCHEMA_PADDING,
+            )
+            for schema, local in local_layouts.items()
+        }
+        area = sum(width * height for width, height in sizes.values())
+        row_width = max(
+            max(width for width, _ in sizes.values()), int(math.sqrt(2 * area))
+        )
+
+        top = max(
+            (y + height for _, y, _, height in layout.values()),
+            default=100 - SCHEMA_GAP,
+        )
+        x_offset, y_offset, row_height = 1, top + SCHEMA_GAP, 0
+        placed: Dict[str, Tuple[int, int, int, int]] = {}
+        for schema, local in local_layouts.items():
+            width, height = sizes[schema]
+            if schema in self.positions:
+                origin = self.positions[schema]
+            else:
+                if x_offset > 1 and x_offset + width > row_width:
+                    x_offset, y_offset = 1, y_offset + row_height + SCHEMA_GAP
+                    row_height = 0
+                origin = (x_offset, y_offset)
+                x_offset += width + SCHEMA_GAP
+                row_height = max(row_height, height)
+            for table_name, (x, y, table_width, table_height) in local.items():
+                placed[table_name] = (
+                    origin[0] + x,
+                    origin[1] + y,
+                    table_width,
+                    table_height,
+                )
+        return placed
+
+    def _table_width(
+        self, table_name: str, columns: List[Tuple[str, str]], base_width: int = 170
+    ) -> int:
+        max_col_len = max(len(name) for name, _ in columns)
+        return max(base_width, 30 + max_col_len * 9, 30 + len(table_name) * 8)
+
+    def _is_wide(self, columns: List[Tuple[str, str]]) -> bool:
+        if self.wide_table_threshold is None:
+            return False
+        if self.wide_table_policy not in WIDE_TABLE_POLICIES:
+            raise ValueError(
+                f"Invalid wide_table_policy '{self.wide_table_policy}'. "
+                f"Allowed: {WIDE_TABLE_POLICIES}."
+            )
+        return len(columns) > self.wide_table_threshold
+
+    def _displayed_columns(
+        self, table_name: str, columns: List[Tuple[str, str]]
+    ) -> List[Tuple[int, str, str]]:
+        """Returns (1-based column index, name, key) of every drawn column row."""
+        indexed = [(idx, name, key) for idx, (name, key) in enumerate(columns, start=1)]
+        if not self._is_wide(columns):
+            return indexed
+        # Columns used by a REFERENCE stay visible so edges keep their rows.
+        referenced = self._referenced_columns().get(table_name, set())
+        return [
+            (idx, name, key)
+            for idx, name, key in indexed
+            if key in ("PK", "FK") or name in referenced
+        ]
+
+    def _referenced_columns(self) -> Dict[str, Set[str]]:
+        """Columns of each table used by either end of a REFERENCE.
+
+        Built once per model: every edge endpoint looks its table up here.
+        """
+        if self._referenced_index is None:
+            index: Dict[str, Set[str]] = defaultdict(set)
+            for table, refs in self.references.items():
+                for ref in refs:
+                    index[table].add(ref["column_name"])
+                    index[ref["table_reference"]].add(ref["column_reference"])
+            self._referenced_index = index
+        return self._referenced_index
+
+    def _display_row_count(
+        self, table_name: str, columns: List[Tuple[str, str]]
+    ) -> int:
+        """Number of drawn rows below the header, "+N more" row included."""
+        shown = len(self._displayed_columns(table_name, columns))
+        return shown if shown == len(columns) else shown + 1
+
+    def _display_row(self, table_name: str, column_name: str) -> int:
+        """Returns the 1-based drawn row of a column, the "+N more" row if hidden."""
+        displayed = self._displayed_columns(table_name, self.tables[table_name])
+        for position, (_, name, _) in enumerate(displayed, start=1):
+            if name == column_name:
+                return position
+        self._row_index(self.tables, table_name, column_name)
+        return len(displayed) + 1
+
+    def _columns_metadata(self, columns: List[Tuple[str, str]]) -> str:
+        """Returns the columns as the lines of their DSL TABLE block."""
+        return "\n".join(name + KEY_SUFFIXES.get(key, "") for name, key in columns)
+
+    def _table_fill_color(self, table_name: str) -> str:
+        if table_name in self.table_fill_overrides:
+            return self.table_fill_overrides[table_name]
+        rule_fill = self._table_rule_style(table_name).get("fillColor")
+        if rule_fill:
+            return rule_fill
+        return "#F4AC9F" if table_name.startswith("FACT") else "#9CD6EF"
+
+    def _table_rule_style(self, table_name: str) -> Mapping[str, str]:
+        if self.style_rules is None:
+            return {}
+        return self.style_rules.table_style(table_name)
+
+    def _column_rule_style(self, column_name: str) -> Mapping[str, str]:
+        if self.style_rules is None:
+            return {}
+        return self.style_rules.column_style(column_name)
 
     def _create_table_xml(
         self,
-        root: ET.Element,
+        root: CellRoot,
         table_name: str,
         columns: List[Tuple[str, str]],
         x: int = 0,
         y: int = 100,
         base_width: int = 170,
-        height: int = 30,
-    ) -> Tuple[ET.Element, int]:
+        height: int = ROW_HEIGHT,
+    ) -> Tuple[CellRoot, int]:
         table_id = table_name
-        max_col_len = max(len(name) for name, _ in columns)
-        width = max(base_width, 30 + max_col_len * 9, 30 + len(table_name) * 8)
-
-        table_style = TABLE_STYLE.copy()
-        if table_name.startswith("FACT"):
-            table_style["fillColor"] = "#F4AC9F"
-        else:
-            table_style["fillColor"] = "#9CD6EF"
-
-        self._create_mxcell(
-            root,
-            id=table_id,
-            value=table_name,
-            style=self._dict_to_style_string(table_style),
-            parent=str(1),
-            vertex=str(1),
-            geom_attrs={
+        width = self._table_width(table_name, columns, base_width)
+        html = self._html_tables()
+
+        table_style = (HTML_TABLE_STYLE if html else TABLE_STYLE).copy()
+        table_style.update(self._table_rule_style(table_name))
+        table_style["fillColor"] = self._table_fill_color(table_name)
+        label = self._html_table_label(table_name, columns) if html else table_name
+
+        wide = self._is_wide(columns)
+        full_height = height * (self._display_row_count(table_name, columns) + 1)
+        # HTML tables are plain cells and cannot be collapsed.
+        collapsed = not html and (
+            table_name in self.collapsed_tables
+            or (wide and self.wide_table_policy == "collapsed")
+        )
+        metadata = None
+        if wide or html:
+            metadata = {"label": label, "table": table_name}
+            # Keeps the full column list, which the label may not show.
+            metadata["columns"] = self._columns_metadata(columns)
+            metadata["id"] = table_id
+        schema = self._schema_of(table_name)
+        style = self._dict_to_style_string(table_style)
+        parent = str(1) if schema is None else self._schema_id(schema)
+        geom_attrs = {
+            "x": str(x),
+            "y": str(y),
+            "width": str(width),
+            "height": str(height if collapsed else full_height),
+            "as": "geometry",
+        }
+        # Collapsed containers show only their header; draw.io restores
+        # the alternate bounds when the table is expanded.
+        alternate_bounds = None
+        if collapsed:
+            alternate_bounds = {
                 "x": str(x),
                 "y": str(y),
                 "width": str(width),
-                "height": str(height * (len(columns) + 1)),
-                "as": "geometry",
-            },
-        )
-        self.table_sizes[table_name] = (width, height * (len(columns) + 1))
-        self._add_columns(root, table_id, columns, width, height)
+                "height": str(full_height),
+                "as": "alternateBounds",
+            }
+        if isinstance(root, TemplateRoot):
+            root.add_table(
+                table_id, label, style, parent, geom_attrs, metadata, alternate_bounds
+            )
+        else:
+            container = root
+            if metadata is not None:
+                container = ET.SubElement(root, "UserObject", metadata)
+            cell = self._create_mxcell(
+                container,
+                id=table_id,
+                value=label,
+                style=style,
+                parent=parent,
+                vertex=str(1),
+                geom_attrs=geom_attrs,
+            )
+            if metadata is not None:
+                # draw.io reads the id and label from the wrapping UserObject.
+                del cell.attrib["id"]
+                del cell.attrib["value"]
+            if alternate_bounds is not None:
+                cell.set("collapsed", "1")
+                ET.SubElement(cell[0], "mxRectangle", alternate_bounds)
+        self.table_sizes[table_name] = (width, full_height)
+        if not html:
+            self._add_columns(root, table_id, columns, width, height)
         return root, width
 
+    def _html_tables(self) -> bool:
+        if self.table_rendering not in TABLE_RENDERINGS:
+            raise ValueError(
+                f"Invalid table_rendering '{self.table_rendering}'. "
+                f"Allowed: {TABLE_RENDERINGS}."
+            )
+        return self.table_rendering == "html"
+
+    def _html_table_label(
+        self, table_name: str, columns: List[Tuple[str, str]], height: int = ROW_HEIGHT
+    ) -> str:
+        """Returns an HTML table drawing the header and rows of a table."""
+        rows = [
+            (name, key) for _, name, key in self._displayed_columns(table_name, columns)
+        ]
+        if len(rows) < len(columns):
+            rows.append((f"+{len(columns) - len(rows)} more", ""))
+
+        html = [
+            '<table style="width:100%;height:100%;border-collapse:collapse;">',
+            f'<tr style="height:{height}px;"><td colspan="2" '
+            f'style="text-align:center;">{escape(table_name)}</td></tr>',
+        ]
+        for position, (col_name, key) in enumerate(rows, start=1):
+            fill_color = "#f0f0f0" if position % 2 == 0 else "#ffffff"
+            border = "border-bottom:1px solid;" if key == "PK" else ""
+            icon = f"<b>{key}</b>" if key == "PK" else key
+            name = escape(col_name)
+            if key == "PK":
+                name = f"<b><u>{name}</u></b>"
+            font_color = self._column_rule_style(col_name).get("fontColor")
+            color = f"color:{font_color};" if font_color else ""
+            html.append(
+                f'<tr style="height:{height}px;background:{fill_color};{border}">'
+                f'<td style="width:30px;text-align:center;">{icon}</td>'
+                f'<td style="padding-left:6px;{color}">{name}</td></tr>'
+            )
+        html.append("</table>")
+        return "".join(html)
+
     def _add_columns(
         self,
-        root: ET.Element,
+        root: CellRoot,
         table_id: str,
         columns: List[Tuple[str, str]],
         width: int,
         height: int,
     ) -> None:
         y_offset = 30
-        for idx, (col_name, key) in enumerate(columns, start=1):
+        displayed = self._displayed_columns(table_id, columns)
+        # Rows keep the column's index in the table so edge ids stay stable.
+        for position, (idx, col_name, key) in enumerate(displayed, start=1):
             row_id = f"{table_id}-{idx}"
             icon_id = f"{table_id}-icon-{idx}"
             col_id = f"{table_id}-col-{idx}"
-            fill_color = "#f0f0f0" if idx % 2 == 0 else "#ffffff"
+            fill_color = "#f0f0f0" if position % 2 == 0 else "#ffffff"
 
             self._create_row(
                 root, row_id, table_id, fill_color, key, width, height, y_offset
@@ -338,9 +1144,27 @@ class DrawioGenerator:
 
             y_offset += height
 
+        hidden = len(columns) - len(displayed)
+        if hidden:
+            row_id = f"{table_id}-more"
+            fill_color = "#f0f0f0" if (len(displayed) + 1) % 2 == 0 else "#ffffff"
+            self._create_row(
+                root, row_id, table_id, fill_color, "", width, height, y_offset
+            )
+            self._create_icon_cell(root, f"{table_id}-icon-more", row_id, "", height)
+            self._create_column_cell(
+                root,
+                f"{table_id}-col-more",
+                row_id,
+                f"+{hidden} more",
+                "",
+                width,
+                height,
+            )
+
     def _create_row(
         self,
-        root: ET.Element,
+        root: CellRoot,
         row_id: str,
         parent_id: str,
         fill_color: str,
@@ -374,7 +1198,7 @@ class DrawioGenerator:
         )
 
     def _create_icon_cell(
-        self, root: ET.Element, icon_id: str, parent_id: str, key: str, height: int
+        self, root: CellRoot, icon_id: str, parent_id: str, key: str, height: int
     ) -> None:
 
         icon_cell_style = ICON_CELL_STYLE.copy()
@@ -392,7 +1216,7 @@ class DrawioGenerator:
 
     def _create_column_cell(
         self,
-        root: ET.Element,
+        root: CellRoot,
         col_id: str,
         parent_id: str,
         col_name: str,
@@ -402,6 +1226,7 @@ class DrawioGenerator:
     ) -> None:
         column_cell_style = COLUMN_CEL_STYLE.copy()
         column_cell_style["fontStyle"] = "5" if key == "PK" else ""
+        column_cell_style.update(self._column_rule_style(col_name))
 
         self._create_mxcell(
             root,
@@ -419,27 +1244,36 @@ class DrawioGenerator:
         )
 
     def _dict_to_style_string(self, style_dict: Dict[str, str]) -> str:
-        def camel_case(s: str) -> str:
-            parts = s.split("_")
-            return parts[0] + "".join(p.capitalize() for p in parts[1:])
-
-        return ";".join(f"{camel_case(k)}={v}" for k, v in style_dict.items()) + ";"
+        return ";".join(f"{_camel_case(k)}={v}" for k, v in style_dict.items()) + ";"
 
     # ADD EDGE
     def _add_edge(
         self,
-        root: ET.Element,
+        root: CellRoot,
         edge_id: str,
         source_id: str,
         target_id: str,
         start_arrow: str,
         end_arrow: str,
-    ) -> ET.Element:
-        """Adds an edge between two columns."""
+        value: str = "",
+        style_overrides: Optional[Dict[str, str]] = None,
+        anchors: Optional[Tuple[Tuple[int, int], Tuple[int, int]]] = None,
+        waypoints: Optional[List[Tuple[int, int]]] = None,
+    ) -> CellRoot:
+        """Adds an edge between two columns.
+
+        ``anchors`` are the points where the edge leaves and enters its
+        terminals; with ``waypoints`` the edge is stored fully routed.
+        """
 
         edge_style = EDGE_STYLE.copy()
         edge_style["endArrow"] = end_arrow
         edge_style["startArrow"] = start_arrow
+        if waypoints:
+            # The ER edge style ignores waypoints; orthogonal routing keeps them.
+            edge_style["edgeStyle"] = "orthogonalEdgeStyle"
+        if style_overrides:
+            edge_style.update(style_overrides)
 
         if start_arrow and start_arrow not in EDGES:
             raise ValueError(
@@ -448,13 +1282,27 @@ class DrawioGenerator:
         if end_arrow and end_arrow not in EDGES:
             raise ValueError(f"Invalid end_arrow '{end_arrow}'.")
 
+        style = self._dict_to_style_string(edge_style)
+        (sx, sy), (tx, ty) = anchors or ((310, 98), (420, 230))
+        if isinstance(root, TemplateRoot):
+            root.add_edge(
+                edge_id,
+                value,
+                style,
+                source_id,
+                target_id,
+                ((sx, sy), (tx, ty)),
+                waypoints,
+            )
+            return root
+
         edge = ET.SubElement(
             root,
             "mxCell",
             {
                 "id": edge_id,
-                "value": "",
-                "style": self._dict_to_style_string(edge_style),
+                "value": value,
+                "style": style,
                 "edge": "1",
                 "parent": "1",
                 "source": source_id,
@@ -467,10 +1315,16 @@ class DrawioGenerator:
             "mxGeometry",
             {"width": "100", "height": "100", "relative": "1", "as": "geometry"},
         )
-        ET.SubElement(geometry, "mxPoint", {"x": "310", "y": "98", "as": "sourcePoint"})
         ET.SubElement(
-            geometry, "mxPoint", {"x": "420", "y": "230", "as": "targetPoint"}
+            geometry, "mxPoint", {"x": str(sx), "y": str(sy), "as": "sourcePoint"}
         )
+        ET.SubElement(
+            geometry, "mxPoint", {"x": str(tx), "y": str(ty), "as": "targetPoint"}
+        )
+        if waypoints:
+            points = ET.SubElement(geometry, "Array", {"as": "points"})
+            for x, y in waypoints:
+                ET.SubElement(points, "mxPoint", {"x": str(x), "y": str(y)})
 
         return root
 
@@ -481,24 +1335,145 @@ class DrawioGenerator:
         column_name: str,
     ) -> str:
         """Generates the row ID for a given column."""
+        idx = self._row_index(tables, table_name, column_name)
+        return f"{table_name}-{idx}"
+
+    def _row_index(
+        self,
+        tables: Dict[str, List[Tuple[str, str]]],
+        table_name: str,
+        column_name: str,
+    ) -> int:
+        """Returns the 1-based row of a column inside its table."""
         try:
-            idx = [col for col, _ in tables[table_name]].index(column_name) + 1
-            return f"{table_name}-{idx}"
+            return [col for col, _ in tables[table_name]].index(column_name) + 1
         except ValueError as err:
             raise ValueError(
                 f"Column '{column_name}' not found in table "
                 f"'{table_name} or {table_name} doesn't exist'."
             ) from err
 
-    def _create_edges(self, root: ET.Element) -> ET.Element:
+    def _edge_anchors(
+        self,
+        layout: Dict[str, Tuple[int, int, int, int]],
+        source_table: str,
+        source_row: int,
+        target_table: str,
+        target_row: int,
+        height: int = ROW_HEIGHT,
+    ) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """Returns the points where an edge leaves and enters its rows.
+
+        Edges use the facing sides of the two tables; a reference inside one
+        table leaves and enters on its right side.
+        """
+        sx, sy, sw, _ = layout[source_table]
+        tx, ty, tw, _ = layout[target_table]
+        source_y = sy + height * source_row + height // 2
+        target_y = ty + height * target_row + height // 2
+        if source_table == target_table:
+            return (sx + sw, source_y), (tx + tw, target_y)
+        if 2 * sx + sw <= 2 * tx + tw:
+            return (sx + sw, source_y), (tx, target_y)
+        return (sx, source_y), (tx + tw, target_y)
+
+    def _orthogonal_waypoints(
+        self, source_point: Tuple[int, int], target_point: Tuple[int, int]
+    ) -> List[Tuple[int, int]]:
+        """Returns the bends of an orthogonal route between two anchors."""
+        (sx, sy), (tx, ty) = source_point, target_point
+        if sx == tx:
+            # Both anchors on the same side: loop out by a fixed margin.
+            mid_x = sx + 20
+        else:
+            mid_x = (sx + tx) // 2
+        return [(mid_x, sy), (mid_x, ty)]
+
+    def _edge_terminals(
+        self,
+        layout: Dict[str, Tuple[int, int, int, int]],
+        source_table: str,
+        source_column: str,
+        target_table: str,
+        target_column: str,
+    ) -> Tuple[str, str, Dict[str, str], Tuple[Tuple[int, int], Tuple[int, int]]]:
+        """Returns the ids, pinning style and anchors of a row-to-row edge."""
+        source_id = self._create_row_id(self.tables, source_table, source_column)
+        target_id = self._create_row_id(self.tables, target_table, target_column)
+        source_row = self._display_row(source_table, source_column)
+        target_row = self._display_row(target_table, target_column)
+        anchors = self._edge_anchors(
+            layout, source_table, source_row, target_table, target_row
+        )
+
+        if self._html_tables():
+            # HTML tables have no row cells: attach to the table at the row.
+            terminals = [
+                (source_table, layout[source_table]),
+                (target_table, layout[target_table]),
+            ]
+        elif self.edge_waypoints:
+            # Pin the side of the row the waypoints were computed for.
+            terminals = [
+                (source_id, self._row_box(layout, source_table, source_row)),
+                (target_id, self._row_box(layout, target_table, target_row)),
+            ]
+        else:
+            return source_id, target_id, {}, anchors
+
+        style: Dict[str, str] = {}
+        for prefix, (_, (x, y, width, height)), (px, py) in zip(
+            ("exit", "entry"), terminals, anchors, strict=True
+        ):
+            style[f"{prefix}X"] = f"{(px - x) / width:g}"
+            style[f"{prefix}Y"] = f"{(py - y) / height:g}"
+            style[f"{prefix}Perimeter"] = "0"
+        return terminals[0][0], terminals[1][0], style, anchors
+
+    def _row_box(
+        self,
+        layout: Dict[str, Tuple[int, int, int, int]],
+        table_name: str,
+        row: int,
+        height: int = ROW_HEIGHT,
+    ) -> Tuple[int, int, int, int]:
+        x, y, width, _ = layout[table_name]
+        return x, y + height * row, width, height
+
+    def _waypoints_for(
+        self, anchors: Tuple[Tuple[int, int], Tuple[int, int]]
+    ) -> Optional[List[Tuple[int, int]]]:
+        if not self.edge_waypoints:
+            return None
+        return self._orthogonal_waypoints(*anchors)
+
+    def _create_edges(
+        self,
+        root: CellRoot,
+        layout: Optional[Dict[str, Tuple[int, int, int, int]]] = None,
+    ) -> CellRoot:
         """Creates edges between referenced columns."""
+        if self.edge_aggregation not in EDGE_AGGREGATIONS:
+            raise ValueError(
+                f"Invalid edge_aggregation '{self.edge_aggregation}'. "
+                f"Allowed: {EDGE_AGGREGATIONS}."
+            )
+        if layout is None:
+            layout = self._compute_layout()
+        if self.edge_aggregation != "none":
+            return self._create_aggregated_edges(root, layout)
+
+        used_ids: Dict[str, int] = {}
         for table, refs in self.references.items():
             for ref in refs:
-                source_id = self._create_row_id(self.tables, table, ref["column_name"])
-                target_id = self._create_row_id(
-                    self.tables, ref["table_reference"], ref["column_reference"]
+                source_id, target_id, style_overrides, anchors = self._edge_terminals(
+                    layout,
+                    table,
+                    ref["column_name"],
+                    ref["table_reference"],
+                    ref["column_reference"],
                 )
-                edge_id = self._create_id()
+                edge_id = self._edge_id(used_ids, source_id, target_id)
                 root = self._add_edge(
                     root,
                     edge_id,
@@ -506,12 +1481,86 @@ class DrawioGenerator:
                     target_id,
                     ref["start_arrow"],
                     ref["end_arrow"],
+                    style_overrides=style_overrides or None,
+                    anchors=anchors,
+                    waypoints=self._waypoints_for(anchors),
+                )
+            self._check_memory("edges")
+        return root
+
+    def _create_aggregated_edges(
+        self,
+        root: CellRoot,
+        layout: Dict[str, Tuple[int, int, int, int]],
+    ) -> CellRoot:
+        """Creates one labelled edge per pair of related tables."""
+        bundles: Dict[Tuple[str, str], List[Dict[str, str]]] = {}
+        for table, refs in self.references.items():
+            for ref in refs:
+                bundles.setdefault((table, ref["table_reference"]), []).append(ref)
+
+        fan_in = self.edge_aggregation == "target"
+        used_ids: Dict[str, int] = {}
+        for (source_table, target_table), refs in bundles.items():
+            style_overrides: Dict[str, str] = {}
+            if len(refs) == 1 and not fan_in:
+                ref = refs[0]
+                source_id, target_id, style_overrides, anchors = self._edge_terminals(
+                    layout,
+                    source_table,
+                    ref["column_name"],
+                    target_table,
+                    ref["column_reference"],
+                )
+                value = ""
+            else:
+                source_id = source_table
+                target_id = target_table
+                value = "<br>".join(
+                    f"{ref['column_name']} → {ref['column_reference']}" for ref in refs
                 )
+                # Both ends must exist even though the edge joins whole tables.
+                for ref in refs:
+                    self._create_row_id(self.tables, source_table, ref["column_name"])
+                    self._create_row_id(
+                        self.tables, target_table, ref["column_reference"]
+                    )
+                # Bundled edges join the table headers.
+                anchors = self._edge_anchors(layout, source_table, 0, target_table, 0)
+                if fan_in:
+                    style_overrides = {
+                        "entryX": "0",
+                        "entryY": "0",
+                        "entryDy": "15",
+                        "entryPerimeter": "0",
+                    }
+                    tx, ty, _, _ = layout[target_table]
+                    anchors = (anchors[0], (tx, ty + 15))
+
+            arrows = {(ref["start_arrow"], ref["end_arrow"]) for ref in refs}
+            start_arrow, end_arrow = arrows.pop() if len(arrows) == 1 else ("", "")
+            root = self._add_edge(
+                root,
+                self._edge_id(used_ids, source_id, target_id),
+                source_id,
+                target_id,
+                start_arrow,
+                end_arrow,
+                value=value,
+                style_overrides=style_overrides or None,
+                anchors=anchors,
+                waypoints=self._waypoints_for(anchors),
+            )
+
+        logger.info(
+            f"Aggregated {sum(len(refs) for refs in bundles.values())} references "
+            f"into {len(bundles)} edges"
+        )
         return root
 
     # ADD TITLE
 
-    def _add_title(self, root: ET.Element) -> ET.Element:
+    def _add_title(self, root: CellRoot) -> CellRoot:
 
         self._create_mxcell(
             root,
@@ -531,7 +1580,7 @@ class DrawioGenerator:
         return root
 
     # ADD Date
-    def _add_date(self, root: ET.Element) -> ET.Element:
+    def _add_date(self, root: CellRoot) -> CellRoot:
         self._create_mxcell(
             root,
             id="table-date",
@@ -594,38 +1643,199 @@ class DrawioGenerator:
 
         return root
 
-    def write_mxgraph(self, file_name: str = "output.drawio") -> None:
-        """Writes the XML tree to a file."""
-        graph_model = ET.Element(
-            "mxGraphModel",
-            {
-                "dx": "3247",
-                "dy": "533",
-                "grid": "0",
-                "gridSize": "10",
-                "guides": "1",
-                "tooltips": "1",
-                "connect": "1",
-                "arrows": "1",
-                "fold": "1",
-                "page": "1",
-                "pageScale": "1",
-                "pageWidth": "850",
-                "pageHeight": "1100",
-                "math": "0",
-                "shadow": "0",
-            },
-        )
+    def write_svg(
+        self, file_name: str = "output.svg", edge_style: str = "orthogonal"
+    ) -> None:
+        """Writes a static SVG preview of the diagram."""
         os.makedirs(self.output_dir, exist_ok=True)
         path_file_name = os.path.join(self.output_dir, file_name)
-        root = self._create_root()
-        root = self._create_edges(root)
-        root = self._create_erd_xml(root)
+        write_if_changed(path_file_name, render_svg(self, edge_style).encode("utf-8"))
+
+    def write_outputs(
+        self,
+        base_name: str,
+        formats: Sequence[str] = ("drawio",),
+        compact: bool = False,
+    ) -> List[str]:
+        """Writes the model once per registered emitter, sharing one layout.
+
+        Returns the paths written, e.g. ``output/<base_name>.mmd`` for the
+        ``mermaid`` emitter. The ``drawio`` format follows the serializer
+        and ``compact`` like write_mxgraph, and a render over the memory
+        budget is retried in the same way.
+        """
+        unknown = [name for name in formats if name not in EMITTERS]
+        if unknown:
+            raise ValueError(
+                f"Unknown output format(s) {unknown}. Allowed: {list(EMITTERS)}."
+            )
+        os.makedirs(self.output_dir, exist_ok=True)
+        options = self.render_options()
+        try:
+            return self._write_formats(base_name, formats, options, compact)
+        except MemoryBudgetExceeded as e:
+            if not self._can_fall_back(options):
+                raise
+            logger.warning(f"{e}\nRetrying with table_rendering 'html'")
+        options = dataclasses.replace(options, table_rendering="html")
+        return self._write_formats(base_name, formats, options, compact)
+
+    def _write_formats(
+        self,
+        base_name: str,
+        formats: Sequence[str],
+        options: RenderOptions,
+        compact: bool,
+    ) -> List[str]:
+        worker = self._render_worker(self.model(), options, self.should_cancel)
+        layout = worker._compute_layout()
+        paths = []
+        for name in formats:
+            emitter = EMITTERS[name]
+            path_file_name = os.path.join(
+                self.output_dir, f"{base_name}.{emitter.extension}"
+            )
+            if name == "drawio":
+                data = worker._document_bytes(layout, compact)
+            else:
+                data = emitter.emit(worker, layout).encode("utf-8")
+            write_if_changed(path_file_name, data)
+            paths.append(path_file_name)
+        self.table_sizes = defaultdict(lambda: (0, 0), worker.table_sizes)
+        return paths
+
+    def _document_bytes(
+        self, layout: Dict[str, Tuple[int, int, int, int]], compact: bool = False
+    ) -> bytes:
+        """Returns the .drawio document for a layout, using the serializer."""
+        if self.serializer not in SERIALIZERS:
+            raise ValueError(
+                f"Invalid serializer '{self.serializer}'. Allowed: {SERIALIZERS}."
+            )
+        buffer = io.BytesIO()
+        if self.serializer == "template" and not compact:
+            root = self._add_cells(TemplateRoot(), layout)
+            with self._memory_phase("serialize"):
+                buffer.write(root.to_bytes(GRAPH_MODEL_ATTRIBUTES))
+        else:
+            graph_model = self._build_graph_model(layout)
+            with self._memory_phase("serialize"):
+                self._write_graph_model(graph_model, buffer, compact)
+        return buffer.getvalue()
+
+    def _build_graph_model(
+        self, layout: Optional[Dict[str, Tuple[int, int, int, int]]] = None
+    ) -> ET.Element:
+        """Builds the complete mxGraphModel element."""
+        graph_model = ET.Element("mxGraphModel", GRAPH_MODEL_ATTRIBUTES)
+        graph_model.append(self._add_cells(self._create_root(), layout))
+        return graph_model
+
+    def _add_cells(
+        self,
+        root: CellRoot,
+        layout: Optional[Dict[str, Tuple[int, int, int, int]]] = None,
+    ) -> CellRoot:
+        """Adds the edges, tables, title and date cells to root."""
+        if layout is None:
+            layout = self._compute_layout()
+        with self._memory_phase("edges"):
+            root = self._create_edges(root, layout)
+        self._check_cancelled("edges")
+        with self._memory_phase("tables"):
+            root = self._create_erd_xml(root, layout)
+        self._check_cancelled("tables")
         if self.title:
             root = self._add_title(root)
         if self.created_at_string:
             root = self._add_date(root)
-        graph_model.append(root)
-        ET.ElementTree(graph_model).write(
-            path_file_name, encoding="utf-8", xml_declaration=True
+        return root
+
+    def write_mxgraph(
+        self, file_name: str = "output.drawio", compact: bool = False
+    ) -> bool:
+        """Writes the XML tree to a file.
+
+        With ``compact`` the diagram is serialized in its smallest form:
+        default attributes and style keys are dropped and ids shortened.
+        The file is replaced atomically and left untouched when its content
+        is already up to date; returns whether it was written.
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        path_file_name = os.path.join(self.output_dir, file_name)
+        return write_if_changed(path_file_name, self.mxgraph_bytes(compact))
+
+    def write_mxgraph_stream(self, stream: BinaryIO, compact: bool = False) -> None:
+        """Writes the .drawio document to a binary file-like object.
+
+        With a memory monitor whose strategy is ``html``, a render going over
+        budget is retried once with one HTML cell per table instead of one
+        cell per column.
+        """
+        if self.serializer not in SERIALIZERS:
+            raise ValueError(
+                f"Invalid serializer '{self.serializer}'. Allowed: {SERIALIZERS}."
+            )
+        # Compacting rewrites the tree, so it needs ElementTree.
+        templates = self.serializer == "template" and not compact
+        options = self.render_options()
+        document: Union[ET.Element, TemplateRoot, None] = None
+        try:
+            document = self._render_document(options, templates)
+        except MemoryBudgetExceeded as e:
+            if not self._can_fall_back(options):
+                raise
+            logger.warning(f"{e}\nRetrying with table_rendering 'html'")
+            options = dataclasses.replace(options, table_rendering="html")
+        if document is None:
+            # Retried outside the except block so the failed tree is freed.
+            document = self._render_document(options, templates)
+        with self._memory_phase("serialize"):
+            if isinstance(document, TemplateRoot):
+                stream.write(document.to_bytes(GRAPH_MODEL_ATTRIBUTES))
+            else:
+                self._write_graph_model(document, stream, compact)
+
+    def _render_document(
+        self, options: RenderOptions, templates: bool
+    ) -> Union[ET.Element, TemplateRoot]:
+        """Renders the current model as an mxGraphModel or a TemplateRoot."""
+        if not templates:
+            result = self.render(self.model(), options, self.should_cancel)
+            self.table_sizes = defaultdict(lambda: (0, 0), result.table_sizes)
+            return result.graph_model
+        worker = self._render_worker(self.model(), options, self.should_cancel)
+        root = worker._add_cells(TemplateRoot())
+        self.table_sizes = defaultdict(lambda: (0, 0), worker.table_sizes)
+        return root
+
+    def _can_fall_back(self, options: RenderOptions) -> bool:
+        return (
+            self.memory_monitor is not None
+            and self.memory_monitor.strategy == "html"
+            and options.table_rendering != "html"
         )
+
+    def _write_graph_model(
+        self, graph_model: ET.Element, stream: BinaryIO, compact: bool
+    ) -> None:
+        if compact:
+            full_size = len(ET.tostring(graph_model, encoding="utf-8"))
+            compact_graph_model(graph_model)
+            data = ET.tostring(graph_model, encoding="utf-8")
+            logger.info(
+                f"Compact output: {len(data)} bytes instead of {full_size} "
+                f"({100 - 100 * len(data) / full_size:.1f}% smaller)"
+            )
+            stream.write(data)
+            return
+        write_graph_model(graph_model, stream)
+
+    def mxgraph_bytes(self, compact: bool = False) -> bytes:
+        """Returns the .drawio document, e.g. for an HTTP response."""
+        buffer = io.BytesIO()
+        self.write_mxgraph_stream(buffer, compact)
+        return buffer.getvalue()
+
+    def mxgraph_string(self, compact: bool = False) -> str:
+        return self.mxgraph_bytes(compact).decode("utf-8")
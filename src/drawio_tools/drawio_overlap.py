@@ -0,0 +1,170 @@
+import heapq
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+# (x, y, width, height) of a table, as returned by _compute_layout
+Box = Tuple[int, int, int, int]
+
+DEFAULT_CELL_SIZE = 256
+
+
+class SpatialGrid:
+    """Uniform grid indexing boxes by the grid cells they cover.
+
+    Tables are of similar size, so each box covers a handful of cells and
+    a query only compares against the boxes sharing those cells.
+    """
+
+    def __init__(self, cell_size: int = DEFAULT_CELL_SIZE) -> None:
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[str]] = defaultdict(set)
+        self._boxes: Dict[str, Box] = {}
+
+    def insert(self, name: str, box: Box) -> None:
+        self._boxes[name] = box
+        for cell in self._covered_cells(box):
+            self._cells[cell].add(name)
+
+    def remove(self, name: str) -> None:
+        for cell in self._covered_cells(self._boxes.pop(name)):
+            self._cells[cell].discard(name)
+
+    def box(self, name: str) -> Box:
+        return self._boxes[name]
+
+    def query(self, box: Box, margin: int = 0) -> List[str]:
+        """Returns the names of indexed boxes closer than ``margin`` to box."""
+        x, y, width, height = box
+        grown = (x - margin, y - margin, width + 2 * margin, height + 2 * margin)
+        candidates: Set[str] = set()
+        for cell in self._covered_cells(grown):
+            candidates.update(self._cells.get(cell, ()))
+        return [name for name in candidates if _intersects(grown, self._boxes[name])]
+
+    def _covered_cells(self, box: Box) -> Iterator[Tuple[int, int]]:
+        x, y, width, height = box
+        size = self.cell_size
+        for cx in range(x // size, (x + width - 1) // size + 1):
+            for cy in range(y // size, (y + height - 1) // size + 1):
+                yield cx, cy
+
+
+def _intersects(a: Box, b: Box) -> bool:
+    """True when the boxes share a positive area; touching edges is fine."""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    return ax < bx + bw and bx < ax + aw and ay < by + bh and by < ay + ah
+
+
+def find_overlaps(
+    boxes: Dict[str, Box], cell_size: int = DEFAULT_CELL_SIZE
+) -> List[Tuple[str, str]]:
+    """Returns every pair of overlapping boxes, in the order of ``boxes``."""
+    order = {name: index for index, name in enumerate(boxes)}
+    grid = SpatialGrid(cell_size)
+    for name, box in boxes.items():
+        grid.insert(name, box)
+
+    overlaps = []
+    for name, box in boxes.items():
+        for other in grid.query(box):
+            if order[other] > order[name]:
+                overlaps.append((name, other))
+    return sorted(overlaps, key=lambda pair: (order[pair[0]], order[pair[1]]))
+
+
+def _push_options(box: Box, obstacle: Box, margin: int) -> List[Box]:
+    """Returns box moved just clear of the obstacle on each of its 4 sides."""
+    x, y, width, height = box
+    ox, oy, ow, oh = obstacle
+    return [
+        (ox + ow + margin, y, width, height),
+        (ox - margin - width, y, width, height),
+        (x, oy + oh + margin, width, height),
+        (x, oy - margin - height, width, height),
+    ]
+
+
+def _displacement(a: Box, b: Box) -> int:
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def resolve_overlaps(
+    boxes: Dict[str, Box],
+    margin: int = 10,
+    cell_size: int = DEFAULT_CELL_SIZE,
+    max_steps: int = 100,
+) -> Dict[str, Box]:
+    """Returns the boxes nudged apart with minimal displacements.
+
+    Boxes are placed in order; each one keeps its position unless it
+    overlaps a box placed before it. It then moves to the free position
+    closest to where it was, searched best-first among the positions just
+    clear of the boxes in the way, keeping ``margin`` from them. Boxes not
+    placed yet count as obstacles too, so a move never pushes a box onto
+    another and nothing cascades. A box with no free position within
+    ``max_steps`` candidates, as in a packed grid of tables that grew,
+    is shelved instead: such boxes are lined up in rows below all the
+    others, as wide as the original layout.
+    """
+    grid = SpatialGrid(cell_size)
+    # Boxes still at their original position, waiting to be placed
+    pending = SpatialGrid(cell_size)
+    for name, box in boxes.items():
+        pending.insert(name, box)
+    left = min((x for x, _, _, _ in boxes.values()), default=0)
+    right = max((x + width for x, _, width, _ in boxes.values()), default=0)
+    bottom = max((y + height for _, y, _, height in boxes.values()), default=0)
+    # Next free spot of the current shelf row and the row's height; bottom
+    # then also covers the boxes placed so far.
+    shelf_x, shelf_y, shelf_height = left, bottom + margin, 0
+    placed: Dict[str, Box] = {}
+    for name, box in boxes.items():
+        pending.remove(name)
+        # The margin is only kept from boxes that really overlap, so tables
+        # deliberately placed close together stay untouched.
+        if grid.query(box):
+            free = _nearest_free(grid, pending, box, margin, max_steps)
+            if free is not None:
+                box = free
+            else:
+                _, _, width, height = box
+                box = (shelf_x, shelf_y, width, height)
+                # Nudged boxes may have been pushed into the row meanwhile.
+                if (shelf_x > left and shelf_x + width > right) or grid.query(box):
+                    shelf_x, shelf_y = (
+                        left,
+                        max(shelf_y + shelf_height, bottom) + margin,
+                    )
+                    shelf_height = 0
+                    box = (shelf_x, shelf_y, width, height)
+                shelf_x += width + margin
+                shelf_height = max(shelf_height, height)
+        bottom = max(bottom, box[1] + box[3])
+        grid.insert(name, box)
+        placed[name] = box
+    return placed
+
+
+def _nearest_free(
+    grid: SpatialGrid, pending: SpatialGrid, box: Box, margin: int, max_steps: int
+) -> Optional[Box]:
+    heap = [(0, box)]
+    seen = {box}
+    for _ in range(max_steps):
+        if not heap:
+            break
+        _, candidate = heapq.heappop(heap)
+        hits = [
+            obstacle
+            for index in (grid, pending)
+            for obstacle in (index.box(other) for other in index.query(candidate))
+        ]
+        if not hits:
+            return candidate
+        for obstacle in hits:
+            for moved in _push_options(candidate, obstacle, margin):
+                if moved not in seen:
+                    seen.add(moved)
+                    heapq.heappush(heap, (_displacement(box, moved), moved))
+    return None
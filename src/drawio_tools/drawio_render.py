@@ -0,0 +1,104 @@
+import copy
+import io
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import BinaryIO, FrozenSet, Mapping, Optional, Sequence, Tuple
+
+from drawio_tools.drawio_compact import compact_graph_model
+from drawio_tools.style_rules import StyleRules
+
+# (x, y, width, height) of every table
+Layout = Mapping[str, Tuple[int, int, int, int]]
+
+
+@dataclass(frozen=True)
+class ErdModel:
+    """Immutable parsed model: what ``import_file`` reads from a DSL file.
+
+    The containers are frozen on construction, so one model can be
+    rendered by several threads at once.
+    """
+
+    tables: Mapping[str, Sequence[Tuple[str, str]]]
+    references: Mapping[str, Sequence[Mapping[str, str]]]
+    positions: Mapping[str, Tuple[int, int]] = field(default_factory=dict)
+    title: str = ""
+    created_at: str = ""
+
+    def __post_init__(self) -> None:
+        object.__setattr__(
+            self,
+            "tables",
+            MappingProxyType(
+                {name: tuple(columns) for name, columns in self.tables.items()}
+            ),
+        )
+        object.__setattr__(
+            self,
+            "references",
+            MappingProxyType(
+                {
+                    table: tuple(MappingProxyType(dict(ref)) for ref in refs)
+                    for table, refs in self.references.items()
+                }
+            ),
+        )
+        object.__setattr__(self, "positions", MappingProxyType(dict(self.positions)))
+
+
+@dataclass(frozen=True)
+class RenderOptions:
+    """How a model is drawn; mirrors the DrawioGenerator attributes."""
+
+    edge_aggregation: str = "none"
+    wide_table_threshold: Optional[int] = None
+    wide_table_policy: str = "summary"
+    table_rendering: str = "rows"
+    edge_waypoints: bool = False
+    nudge_overlaps: bool = False
+    table_fill_overrides: Mapping[str, str] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    collapsed_tables: FrozenSet[str] = frozenset()
+    style_rules: Optional[StyleRules] = None
+
+
+@dataclass(frozen=True)
+class RenderResult:
+    """Output of one render: the diagram, its layout and the table sizes."""
+
+    graph_model: ET.Element
+    layout: Layout
+    table_sizes: Mapping[str, Tuple[int, int]]
+
+    def write_to(self, stream: BinaryIO, compact: bool = False) -> None:
+        """Writes the .drawio document to a binary file-like object."""
+        graph_model = self.graph_model
+        if compact:
+            # Compaction works in place; keep this result reusable.
+            graph_model = copy.deepcopy(graph_model)
+        write_graph_model(graph_model, stream, compact)
+
+    def to_bytes(self, compact: bool = False) -> bytes:
+        buffer = io.BytesIO()
+        self.write_to(buffer, compact)
+        return buffer.getvalue()
+
+    def to_string(self, compact: bool = False) -> str:
+        return self.to_bytes(compact).decode("utf-8")
+
+
+def write_graph_model(
+    graph_model: ET.Element, stream: BinaryIO, compact: bool = False
+) -> None:
+    """Serializes an mxGraphModel as UTF-8 into a binary stream.
+
+    With ``compact`` the model is first rewritten in place into its
+    smallest form and written without the XML declaration.
+    """
+    if compact:
+        compact_graph_model(graph_model)
+        stream.write(ET.tostring(graph_model, encoding="utf-8"))
+        return
+    ET.ElementTree(graph_model).write(stream, encoding="utf-8", xml_declaration=True)
@@ -0,0 +1,197 @@
+from datetime import date
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from drawio_tools.styles import ROW_HEIGHT
+
+if TYPE_CHECKING:
+    from drawio_tools.drawio_generator import DrawioGenerator
+
+# Allowed edge styles for the SVG preview
+SVG_EDGE_STYLES = ["straight", "orthogonal"]
+
+FONT = 'font-family="Helvetica,Arial,sans-serif" font-size="12"'
+
+# ER notation drawn in a 20x20 box whose right edge touches the table.
+MARKER_PATHS = {
+    "ERone": "M14,4 L14,16",
+    "ERmandOne": "M10,4 L10,16 M14,4 L14,16",
+    "ERmany": "M8,10 L20,4 M8,10 L20,10 M8,10 L20,16",
+    "ERoneToMany": "M4,4 L4,16 M8,10 L20,4 M8,10 L20,10 M8,10 L20,16",
+    "ERzeroToMany": "M8,10 L20,4 M8,10 L20,10 M8,10 L20,16",
+    "ERzeroToOne": "M14,4 L14,16",
+}
+MARKER_CIRCLES = {"ERzeroToMany": 4, "ERzeroToOne": 6}
+
+
+def render_svg(
+    generator: "DrawioGenerator",
+    edge_style: str = "orthogonal",
+    layout: Optional[Dict[str, Tuple[int, int, int, int]]] = None,
+) -> str:
+    """Renders the imported model as a standalone SVG document.
+
+    Table geometry and positions come from the generator's layout, so the
+    preview matches the .drawio output. Every reference is drawn as its own
+    edge between the two rows.
+    """
+    if edge_style not in SVG_EDGE_STYLES:
+        raise ValueError(
+            f"Invalid edge_style '{edge_style}'. Allowed: {SVG_EDGE_STYLES}."
+        )
+
+    if layout is None:
+        layout = generator._compute_layout()
+    parts: List[str] = []
+    schema_boxes = generator._schema_boxes(layout)
+    for schema, box in schema_boxes.items():
+        _add_schema(parts, schema, box)
+    _add_edges(parts, generator, layout, edge_style)
+    for table_name, columns in generator.tables.items():
+        _add_table(parts, generator, table_name, columns, layout[table_name])
+
+    # Title and date blocks use the same fixed positions as the .drawio output.
+    boxes = list(layout.values()) + list(schema_boxes.values())
+    if generator.title:
+        parts.append(
+            f'<text x="186" y="30" dominant-baseline="middle" font-size="24" '
+            f'font-weight="bold">{escape(generator.title)}</text>'
+        )
+        boxes.append((186, 10, 125, 40))
+    if generator.created_at_string:
+        for row, (label, value) in enumerate(
+            [
+                ("CreatedAt:", generator.created_at_string),
+                ("UpdatedAt:", date.today().isoformat()),
+            ]
+        ):
+            text_y = 6 + 24 * row + 12
+            parts.append(
+                f'<text x="80" y="{text_y}" text-anchor="end" '
+                f'dominant-baseline="middle">{label}</text>'
+                f'<text x="85" y="{text_y}" dominant-baseline="middle">'
+                f"{escape(value)}</text>"
+            )
+        boxes.append((1, 6, 176, 48))
+
+    min_x = min((x for x, _, _, _ in boxes), default=0) - 10
+    min_y = min((y for _, y, _, _ in boxes), default=0) - 10
+    max_x = max((x + w for x, _, w, _ in boxes), default=0) + 10
+    max_y = max((y + h for _, y, _, h in boxes), default=0) + 10
+    width, height = max_x - min_x, max_y - min_y
+
+    header = (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" '
+        f'height="{height}" viewBox="{min_x} {min_y} {width} {height}" {FONT}>'
+        f"<defs>{_marker_defs()}</defs>"
+    )
+    return header + "".join(parts) + "</svg>\n"
+
+
+def _marker_defs() -> str:
+    defs = []
+    for name, path in MARKER_PATHS.items():
+        circle = ""
+        if name in MARKER_CIRCLES:
+            circle = (
+                f'<circle cx="{MARKER_CIRCLES[name]}" cy="10" r="3" '
+                f'fill="white" stroke="black"/>'
+            )
+        defs.append(
+            f'<marker id="{name}" viewBox="0 0 20 20" refX="20" refY="10" '
+            f'markerWidth="20" markerHeight="20" markerUnits="userSpaceOnUse" '
+            f'orient="auto-start-reverse"><path d="{path}" fill="none" '
+            f'stroke="black"/>{circle}</marker>'
+        )
+    return "".join(defs)
+
+
+def _add_edges(
+    parts: List[str],
+    generator: "DrawioGenerator",
+    layout: Dict[str, Tuple[int, int, int, int]],
+    edge_style: str,
+) -> None:
+    for table, refs in generator.references.items():
+        for ref in refs:
+            source_row = generator._display_row(table, ref["column_name"])
+            target_row = generator._display_row(
+                ref["table_reference"], ref["column_reference"]
+            )
+            source_point, target_point = generator._edge_anchors(
+                layout, table, source_row, ref["table_reference"], target_row
+            )
+            points = [source_point]
+            if edge_style == "orthogonal":
+                points += generator._orthogonal_waypoints(source_point, target_point)
+            points.append(target_point)
+
+            markers = ""
+            if ref["start_arrow"]:
+                markers += f' marker-start="url(#{ref["start_arrow"]})"'
+            if ref["end_arrow"]:
+                markers += f' marker-end="url(#{ref["end_arrow"]})"'
+            parts.append(
+                '<polyline points="'
+                + " ".join(f"{x},{y}" for x, y in points)
+                + f'" fill="none" stroke="black" stroke-opacity="0.3"{markers}/>'
+            )
+
+
+def _add_schema(parts: List[str], schema: str, box: Tuple[int, int, int, int]) -> None:
+    x, y, width, height = box
+    parts.append(
+        f'<g><rect x="{x}" y="{y}" width="{width}" height="{height}" rx="6" '
+        f'fill="none" stroke="#999999"/>'
+        f'<rect x="{x}" y="{y}" width="{width}" height="{ROW_HEIGHT}" rx="6" '
+        f'fill="#EEEEEE" stroke="#999999"/>'
+        f'<text x="{x + width / 2}" y="{y + ROW_HEIGHT / 2}" text-anchor="middle" '
+        f'dominant-baseline="middle" font-weight="bold">{escape(schema)}</text></g>'
+    )
+
+
+def _add_table(
+    parts: List[str],
+    generator: "DrawioGenerator",
+    table_name: str,
+    columns: List[Tuple[str, str]],
+    box: Tuple[int, int, int, int],
+) -> None:
+    x, y, width, height = box
+    parts.append(
+        f'<g><rect x="{x}" y="{y}" width="{width}" height="{height}" rx="6" '
+        f'fill="{generator._table_fill_color(table_name)}" stroke="black"/>'
+        f'<text x="{x + width / 2}" y="{y + ROW_HEIGHT / 2}" text-anchor="middle" '
+        f'dominant-baseline="middle">{escape(table_name)}</text>'
+    )
+    rows = [
+        (col_name, key)
+        for _, col_name, key in generator._displayed_columns(table_name, columns)
+    ]
+    if len(rows) < len(columns):
+        rows.append((f"+{len(columns) - len(rows)} more", ""))
+    for idx, (col_name, key) in enumerate(rows, start=1):
+        row_y = y + ROW_HEIGHT * idx
+        text_y = row_y + ROW_HEIGHT / 2
+        fill_color = "#f0f0f0" if idx % 2 == 0 else "#ffffff"
+        parts.append(
+            f'<rect x="{x}" y="{row_y}" width="{width}" height="{ROW_HEIGHT}" '
+            f'fill="{fill_color}"/>'
+        )
+        if key == "PK":
+            parts.append(
+                f'<line x1="{x}" y1="{row_y + ROW_HEIGHT}" x2="{x + width}" '
+                f'y2="{row_y + ROW_HEIGHT}" stroke="black"/>'
+            )
+        weight = ' font-weight="bold"' if key == "PK" else ""
+        underline = ' text-decoration="underline"' if key == "PK" else ""
+        parts.append(
+            f'<text x="{x + 15}" y="{text_y}" text-anchor="middle" '
+            f'dominant-baseline="middle"{weight}>{key}</text>'
+            f'<text x="{x + 36}" y="{text_y}" dominant-baseline="middle"'
+            f"{weight}{underline}>{escape(col_name)}</text>"
+        )
+    parts.append(
+        f'<rect x="{x}" y="{y}" width="{width}" height="{height}" rx="6" '
+        f'fill="none" stroke="black"/></g>'
+    )
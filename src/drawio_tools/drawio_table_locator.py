@@ -1,6 +1,8 @@
 import os
 import xml.etree.ElementTree as ET
-from typing import Dict, Tuple  # ✅ needed for the type hints
+from typing import BinaryIO, Dict, Tuple  # ✅ needed for the type hints
+
+from drawio_tools.drawio_compact import METADATA_WRAPPERS
 
 EXCLUDE_TABLES = ["table-date", "title"]
 
@@ -16,15 +18,33 @@ class DrawioTableLocator:
             xml_content = f.read()
             self.positions = self._extract_table_positions(xml_content)  # 🚨 typo here
 
+    def read_bytes(self, data: bytes) -> None:
+        """Reads table positions from the content of a .drawio file."""
+        self.positions = self._positions_from_root(ET.fromstring(data))
+
+    def read_stream(self, stream: BinaryIO) -> None:
+        """Reads table positions from a binary file-like object."""
+        self.positions = self._positions_from_root(ET.parse(stream).getroot())
+
     def _extract_table_positions(self, xml_content: str) -> Dict[str, Tuple[int, int]]:
         """Parses Drawio XML content and extracts table names with x, y positions."""
-        root = ET.fromstring(xml_content)
+        return self._positions_from_root(ET.fromstring(xml_content))
+
+    def _positions_from_root(self, root: ET.Element) -> Dict[str, Tuple[int, int]]:
         positions = {}
 
-        for cell in root.iter("mxCell"):
-            value = cell.attrib.get("value")
+        for cell in root.iter():
+            if cell.tag in METADATA_WRAPPERS:
+                # Tables with metadata keep their name on the wrapper; the
+                # label of HTML tables is markup, so prefer "table".
+                value = cell.attrib.get("table") or cell.attrib.get("label")
+                geometry = cell.find("mxCell/mxGeometry")
+            elif cell.tag == "mxCell":
+                value = cell.attrib.get("value")
+                geometry = cell.find("mxGeometry")
+            else:
+                continue
             id = cell.attrib.get("id")
-            geometry = cell.find("mxGeometry")
             if value and geometry is not None:
                 x = geometry.attrib.get("x")
                 y = geometry.attrib.get("y")
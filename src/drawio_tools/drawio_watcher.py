@@ -0,0 +1,193 @@
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Set
+
+from drawio_tools.drawio_generator import DrawioGenerator, RenderCancelled
+from drawio_tools.dsl_events import IncludeEvent
+from drawio_tools.dsl_parse_cache import DslParseCache
+from drawio_tools.model_cache import ModelCache
+
+logger = logging.getLogger(__name__)
+
+
+def output_path_for(
+    input_path: str, input_dir: str = "input", output_dir: str = "output"
+) -> str:
+    """Maps ``input/x.dsl`` to ``output/x.drawio``, keeping sub-folders."""
+    relative = os.path.relpath(input_path, input_dir)
+    return os.path.join(output_dir, os.path.splitext(relative)[0] + ".drawio")
+
+
+def regenerate(
+    input_path: str,
+    output_path: str,
+    parse_cache: Optional[DslParseCache] = None,
+    should_cancel: Optional[Callable[[], bool]] = None,
+    model_cache: Optional[ModelCache] = None,
+) -> bool:
+    """Regenerates one .drawio file from its DSL file.
+
+    ``should_cancel`` is polled between phases; once it returns True the
+    run stops with RenderCancelled before anything is written. Returns
+    False when the existing file was already up to date.
+    """
+    generator = DrawioGenerator(parse_cache=parse_cache, model_cache=model_cache)
+    generator.should_cancel = should_cancel
+    generator.output_dir = os.path.dirname(output_path) or "."
+    generator.import_file(input_path)
+    return generator.write_mxgraph(os.path.basename(output_path))
+
+
+class RegenerationScheduler:
+    """Runs regenerations on a bounded worker pool, one job per file at a time.
+
+    The latest save wins: a change to a file whose regeneration is running
+    cancels that run at its next phase boundary and starts a new one from
+    the file's current content as soon as the worker is free. A change to
+    an INCLUDEd file also regenerates every model that includes it.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        input_dir: str = "input",
+        output_dir: str = "output",
+        regenerate: Callable[..., Optional[bool]] = regenerate,
+    ) -> None:
+        self.input_dir = input_dir
+        self.output_dir = output_dir
+        self.parse_cache = DslParseCache()
+        self.cancelled = 0
+        self._regenerate = regenerate
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+        self._rerun: Set[str] = set()
+        # Bumped on every change; a run is stale once its generation is old.
+        self._generations: Dict[str, int] = {}
+        # Real path of every INCLUDEd file -> models including it, directly
+        # or not; seeded by scan_includes, then read from the parse cache
+        # after each run.
+        self._includers: Dict[str, Set[str]] = {}
+
+    def submit(self, input_path: str) -> None:
+        """Schedules the regeneration of the output mapped to ``input_path``.
+
+        Models that INCLUDE the file are scheduled too.
+        """
+        input_path = os.path.normpath(input_path)
+        with self._lock:
+            includers = self._includers.get(os.path.realpath(input_path), set())
+            for path in [input_path, *sorted(includers - {input_path})]:
+                self._submit(path)
+
+    def _submit(self, input_path: str) -> None:
+        self._generations[input_path] = self._generations.get(input_path, 0) + 1
+        if input_path in self._in_flight:
+            self._rerun.add(input_path)
+            return
+        self._start(input_path)
+
+    def _start(self, input_path: str) -> None:
+        generation = self._generations[input_path]
+        self._in_flight[input_path] = self._executor.submit(
+            self._run, input_path, generation
+        )
+
+    def _run(self, input_path: str, generation: int) -> None:
+        output_path = output_path_for(input_path, self.input_dir, self.output_dir)
+
+        def is_stale() -> bool:
+            return self._generations[input_path] != generation
+
+        try:
+            logger.info(f"Regenerating {output_path} from {input_path}")
+            written = self._regenerate(
+                input_path, output_path, self.parse_cache, is_stale
+            )
+            if written is False:
+                logger.info(f"Already up to date: {output_path}")
+            else:
+                logger.info(f"Successfully generated: {output_path}")
+            self._record_includes(input_path)
+        except RenderCancelled:
+            with self._lock:
+                self.cancelled += 1
+            logger.info(f"Discarded stale regeneration of {output_path}")
+        except Exception as e:
+            if self._is_included(input_path):
+                # Fragments often use tables of the models including them,
+                # so they need not build on their own.
+                logger.info(f"Skipped {output_path}, included by other models: {e}")
+            else:
+                logger.exception(
+                    f"An error occurred while generating {output_path}: {e}"
+                )
+        finally:
+            with self._lock:
+                if input_path in self._rerun:
+                    self._rerun.discard(input_path)
+                    self._start(input_path)
+                else:
+                    del self._in_flight[input_path]
+
+    def scan_includes(self) -> None:
+        """Reads the INCLUDEs of every model in input_dir.
+
+        Run at startup, so that editing an INCLUDEd file regenerates the
+        models including it before any of them has been regenerated.
+        """
+        for folder, _, names in os.walk(self.input_dir):
+            for name in sorted(names):
+                if name.endswith(".dsl"):
+                    path = os.path.normpath(os.path.join(folder, name))
+                    self._set_includes(path, self._scan_file(path))
+
+    def _scan_file(self, input_path: str) -> Set[str]:
+        """Returns the real paths a model INCLUDEs, up to any bad line."""
+        included: Set[str] = set()
+        try:
+            for event in DrawioGenerator().iter_events(input_path):
+                if isinstance(event, IncludeEvent):
+                    included.add(os.path.realpath(event.include_path))
+        except (OSError, ValueError) as e:
+            logger.debug(f"Stopped scanning {input_path}: {e}")
+        return included
+
+    def _is_included(self, input_path: str) -> bool:
+        with self._lock:
+            return bool(self._includers.get(os.path.realpath(input_path)))
+
+    def _record_includes(self, input_path: str) -> None:
+        """Remembers the files the model INCLUDEs, following nested ones."""
+        included: Set[str] = set()
+        pending = [input_path]
+        while pending:
+            for include in self.parse_cache.includes(pending.pop()):
+                if include not in included:
+                    included.add(include)
+                    pending.append(include)
+        self._set_includes(input_path, included)
+
+    def _set_includes(self, input_path: str, included: Set[str]) -> None:
+        with self._lock:
+            for includers in self._includers.values():
+                includers.discard(input_path)
+            for include in included:
+                self._includers.setdefault(include, set()).add(input_path)
+
+    def wait(self) -> None:
+        """Blocks until no regeneration is running or queued."""
+        while True:
+            with self._lock:
+                futures = list(self._in_flight.values())
+            if not futures:
+                return
+            for future in futures:
+                future.result()
+
+    def shutdown(self) -> None:
+        self.wait()
+        self._executor.shutdown()
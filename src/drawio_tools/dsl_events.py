@@ -0,0 +1,80 @@
+from typing import Dict, NamedTuple, Union
+
+# Events yielded by DrawioGenerator.iter_events, one per DSL statement or
+# column line. Each carries the file and line number it was read from.
+
+
+class TitleEvent(NamedTuple):
+    path: str
+    line: int
+    title: str
+
+
+class CreatedAtEvent(NamedTuple):
+    path: str
+    line: int
+    created_at: str
+
+
+class TableEvent(NamedTuple):
+    path: str
+    line: int
+    table: str
+
+
+class ColumnEvent(NamedTuple):
+    path: str
+    line: int
+    table: str
+    column: str
+    # "PK", "FK" or "" as declared; referenced columns become FK only once
+    # the whole model is resolved.
+    key: str
+
+
+class ReferenceEvent(NamedTuple):
+    path: str
+    line: int
+    table: str
+    column: str
+    table_reference: str
+    column_reference: str
+    start_arrow: str
+    end_arrow: str
+
+    def reference(self) -> Dict[str, str]:
+        """Returns the reference in the layout of ErdModel.references."""
+        return {
+            "column_name": self.column,
+            "table_reference": self.table_reference,
+            "column_reference": self.column_reference,
+            "start_arrow": self.start_arrow,
+            "end_arrow": self.end_arrow,
+        }
+
+
+class ArrangeEvent(NamedTuple):
+    path: str
+    line: int
+    name: str
+    x: int
+    y: int
+
+
+class IncludeEvent(NamedTuple):
+    path: str
+    line: int
+    # Path of the included file, relative to the working directory; its
+    # events follow unless it was already included.
+    include_path: str
+
+
+DslEvent = Union[
+    TitleEvent,
+    CreatedAtEvent,
+    TableEvent,
+    ColumnEvent,
+    ReferenceEvent,
+    ArrangeEvent,
+    IncludeEvent,
+]
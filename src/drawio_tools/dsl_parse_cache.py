@@ -0,0 +1,116 @@
+import hashlib
+import logging
+import os
+import pickle
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from drawio_tools.atomic_write import write_atomic
+from drawio_tools.dsl_events import DslEvent, IncludeEvent
+
+logger = logging.getLogger(__name__)
+
+# Parse events of one file, produced by DrawioGenerator._parse_dsl_statements
+DslStatement = DslEvent
+
+# Bump when the statement layout changes so stale disk entries are ignored.
+CACHE_FORMAT_VERSION = 2
+
+
+class DslParseCache:
+    """Caches the parsed statements of DSL files.
+
+    Entries are kept in memory keyed by real path plus mtime and size. When
+    ``cache_dir`` is set, statements are also pickled to disk keyed by the
+    SHA-256 of the real path and file content, so other processes can reuse
+    them.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None) -> None:
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Tuple[Tuple[int, int], List[DslStatement]]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_parse(
+        self, path_file_name: str, parse: Callable[[str], List[DslStatement]]
+    ) -> List[DslStatement]:
+        """Returns cached statements for the file, parsing it on a miss."""
+        real_path = os.path.realpath(path_file_name)
+        stat = os.stat(real_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(real_path)
+        if entry is not None and entry[0] == stamp:
+            self.hits += 1
+            return entry[1]
+
+        statements = None
+        disk_path = None
+        if self.cache_dir:
+            disk_path = self._disk_path(real_path)
+            statements = self._load(disk_path)
+
+        if statements is None:
+            self.misses += 1
+            statements = parse(path_file_name)
+            if disk_path:
+                self._store(disk_path, statements)
+        else:
+            self.hits += 1
+
+        with self._lock:
+            self._entries[real_path] = (stamp, statements)
+        return statements
+
+    def includes(self, path_file_name: str) -> List[str]:
+        """Returns the real paths a cached file INCLUDEs directly."""
+        with self._lock:
+            entry = self._entries.get(os.path.realpath(path_file_name))
+        if entry is None:
+            return []
+        return [
+            os.path.realpath(event.include_path)
+            for event in entry[1]
+            if isinstance(event, IncludeEvent)
+        ]
+
+    def clear(self) -> None:
+        """Drops every in-memory entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def _disk_path(self, real_path: str) -> str:
+        # Events hold their file's path and resolved INCLUDE paths, so the
+        # same content elsewhere must not share the entry.
+        digest_of = hashlib.sha256(f"{real_path}\0".encode())
+        with open(real_path, "rb") as f:
+            digest_of.update(f.read())
+        digest = digest_of.hexdigest()
+        assert self.cache_dir is not None
+        return os.path.join(
+            self.cache_dir, f"dsl-v{CACHE_FORMAT_VERSION}-{digest}.pickle"
+        )
+
+    def _load(self, disk_path: str) -> Optional[List[DslStatement]]:
+        try:
+            with open(disk_path, "rb") as f:
+                statements: List[DslStatement] = pickle.load(f)
+                return statements
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError) as err:
+            logger.warning(f"Ignoring unreadable cache entry {disk_path}: {err}")
+            return None
+
+    def _store(self, disk_path: str, statements: List[DslStatement]) -> None:
+        """Writes the entry atomically so concurrent readers never see halves."""
+        assert self.cache_dir is not None
+        os.makedirs(self.cache_dir, exist_ok=True)
+        data = pickle.dumps(statements, protocol=pickle.HIGHEST_PROTOCOL)
+        try:
+            write_atomic(disk_path, data, sync=False)
+        except OSError as err:
+            logger.warning(f"Could not write cache entry {disk_path}: {err}")
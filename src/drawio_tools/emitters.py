@@ -0,0 +1,179 @@
+import json
+import re
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Dict, Tuple
+
+from drawio_tools.drawio_svg import render_svg
+
+if TYPE_CHECKING:
+    from drawio_tools.drawio_generator import DrawioGenerator
+
+Layout = Dict[str, Tuple[int, int, int, int]]
+
+# Crow's foot notation of each draw.io arrow, seen from the left and right
+# side of a Mermaid relationship.
+MERMAID_LEFT = {
+    "ERmandOne": "||",
+    "ERmany": "}o",
+    "ERone": "||",
+    "ERoneToMany": "}|",
+    "ERzeroToMany": "}o",
+    "ERzeroToOne": "|o",
+    "": "}o",
+}
+MERMAID_RIGHT = {
+    "ERmandOne": "||",
+    "ERmany": "o{",
+    "ERone": "||",
+    "ERoneToMany": "|{",
+    "ERzeroToMany": "o{",
+    "ERzeroToOne": "o|",
+    "": "||",
+}
+
+
+# Entity names Mermaid accepts unquoted; others, such as schema-qualified
+# names, must be quoted.
+MERMAID_NAME = re.compile(r"[A-Za-z_][A-Za-z0-9_-]*")
+
+
+def mermaid_entity(name: str) -> str:
+    if MERMAID_NAME.fullmatch(name):
+        return name
+    return '"' + name.replace('"', "#quot;") + '"'
+
+
+class Emitter(ABC):
+    """Backend turning an imported model and its layout into one format."""
+
+    name: str
+    extension: str
+
+    @abstractmethod
+    def emit(self, generator: "DrawioGenerator", layout: Layout) -> str:
+        """Returns the document for the generator's imported model."""
+
+
+EMITTERS: Dict[str, Emitter] = {}
+
+
+def register_emitter(emitter: Emitter) -> Emitter:
+    """Makes an emitter available to DrawioGenerator.write_outputs."""
+    EMITTERS[emitter.name] = emitter
+    return emitter
+
+
+class DrawioEmitter(Emitter):
+    name = "drawio"
+    extension = "drawio"
+
+    def emit(self, generator: "DrawioGenerator", layout: Layout) -> str:
+        return generator._document_bytes(layout).decode("utf-8")
+
+
+class SvgEmitter(Emitter):
+    name = "svg"
+    extension = "svg"
+
+    def emit(self, generator: "DrawioGenerator", layout: Layout) -> str:
+        return render_svg(generator, layout=layout)
+
+
+class MermaidEmitter(Emitter):
+    name = "mermaid"
+    extension = "mmd"
+
+    def emit(self, generator: "DrawioGenerator", layout: Layout) -> str:
+        lines = ["erDiagram"]
+        if generator.title:
+            lines.insert(0, f"---\ntitle: {generator.title}\n---")
+        for table_name, columns in generator.tables.items():
+            lines.append(f"    {mermaid_entity(table_name)} {{")
+            for col_name, key in columns:
+                lines.append(f"        column {col_name}{' ' + key if key else ''}")
+            lines.append("    }")
+        for table, refs in generator.references.items():
+            for ref in refs:
+                left = MERMAID_LEFT.get(ref["start_arrow"], "}o")
+                right = MERMAID_RIGHT.get(ref["end_arrow"], "||")
+                lines.append(
+                    f"    {mermaid_entity(table)} {left}--{right} "
+                    f"{mermaid_entity(ref['table_reference'])} : "
+                    f'"{ref["column_name"]} → {ref["column_reference"]}"'
+                )
+        return "\n".join(lines) + "\n"
+
+
+class DotEmitter(Emitter):
+    name = "dot"
+    extension = "dot"
+
+    def emit(self, generator: "DrawioGenerator", layout: Layout) -> str:
+        lines = [
+            f"digraph {json.dumps(generator.title or 'ERD')} {{",
+            "    graph [rankdir=LR];",
+            "    node [shape=plaintext];",
+        ]
+        for table_name, columns in generator.tables.items():
+            x, y, _, _ = layout[table_name]
+            rows = "".join(
+                f'<tr><td port="{col_name}" align="left">'
+                f"{'<b>' + key + '</b> ' if key == 'PK' else key + ' ' if key else ''}"
+                f"{col_name}</td></tr>"
+                for col_name, key in columns
+            )
+            fill_color = generator._table_fill_color(table_name)
+            # draw.io's y axis points down, Graphviz's points up.
+            lines.append(
+                f'    "{table_name}" [pos="{x},{-y}!", label=<<table border="1" '
+                f'cellborder="0" cellspacing="0"><tr><td bgcolor="{fill_color}">'
+                f"{table_name}</td></tr>{rows}</table>>];"
+            )
+        for table, refs in generator.references.items():
+            for ref in refs:
+                lines.append(
+                    f'    "{table}":"{ref["column_name"]}" -> '
+                    f'"{ref["table_reference"]}":"{ref["column_reference"]}";'
+                )
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+
+class JsonEmitter(Emitter):
+    name = "json"
+    extension = "json"
+
+    def emit(self, generator: "DrawioGenerator", layout: Layout) -> str:
+        document = {
+            "title": generator.title,
+            "created_at": generator.created_at_string,
+            "tables": [
+                {
+                    "name": table_name,
+                    "columns": [
+                        {"name": col_name, "key": key} for col_name, key in columns
+                    ],
+                    "x": layout[table_name][0],
+                    "y": layout[table_name][1],
+                    "width": layout[table_name][2],
+                    "height": layout[table_name][3],
+                }
+                for table_name, columns in generator.tables.items()
+            ],
+            "references": [
+                {"table": table, **ref}
+                for table, refs in generator.references.items()
+                for ref in refs
+            ],
+        }
+        return json.dumps(document, indent=2) + "\n"
+
+
+for _emitter in (
+    DrawioEmitter(),
+    SvgEmitter(),
+    MermaidEmitter(),
+    DotEmitter(),
+    JsonEmitter(),
+):
+    register_emitter(_emitter)
@@ -0,0 +1,167 @@
+import logging
+import re
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+# What to do when a render goes over budget:
+#   fail - raise MemoryBudgetExceeded with the report
+#   html - retry with table_rendering="html", one cell per table
+MEMORY_STRATEGIES = ["fail", "html"]
+
+SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+# Allocation sites listed when the budget trips without per-phase sites
+BUDGET_TOP_SITES = 5
+
+
+class MemoryBudgetExceeded(Exception):
+    """Raised when traced memory goes over the budget; carries the report."""
+
+    def __init__(self, phase: str, report: str) -> None:
+        super().__init__(f"Memory budget exceeded during {phase}\n{report}")
+        self.phase = phase
+        self.report = report
+
+
+class PhaseStats(NamedTuple):
+    phase: str
+    # Highest traced memory during the phase, in bytes
+    peak: int
+    # Traced memory at the end minus at the start, in bytes
+    net: int
+    # "file:line  size" lines of the sites that grew most during the phase,
+    # or that held most memory when the budget tripped
+    top_sites: List[str]
+
+
+def parse_size(text: str) -> int:
+    """Parses a size such as ``1073741824``, ``800M`` or ``1G`` into bytes."""
+    match = re.fullmatch(r"\s*(\d+)\s*([KMG]?)I?B?\s*", text.upper())
+    if not match:
+        raise ValueError(f"Invalid size '{text}'. Allowed: e.g. 512M, 1G.")
+    return int(match.group(1)) * SIZE_UNITS[match.group(2)]
+
+
+def format_size(size: int) -> str:
+    return f"{size / 1024**2:.1f} MiB"
+
+
+class MemoryMonitor:
+    """Records peak and net traced memory per phase, against a budget.
+
+    Memory is measured with tracemalloc, which only sees allocations made
+    while tracing and costs memory of its own, so start the monitor early
+    and leave some headroom below the container limit. Tracing is process
+    wide: with concurrent renders the budget covers all of them.
+
+    Peaks come from ``tracemalloc.get_traced_memory``, which is cheap.
+    Snapshots are not: ``top`` lists the sites that grew most in every
+    phase at the cost of two snapshots per phase, and is off by default.
+    Otherwise a single snapshot is taken, only when the budget trips.
+    """
+
+    def __init__(
+        self,
+        budget: Optional[int] = None,
+        top: int = 0,
+        strategy: str = "fail",
+    ) -> None:
+        if strategy not in MEMORY_STRATEGIES:
+            raise ValueError(
+                f"Invalid strategy '{strategy}'. Allowed: {MEMORY_STRATEGIES}."
+            )
+        self.budget = budget
+        self.top = top
+        self.strategy = strategy
+        self.phases: List[PhaseStats] = []
+        self._started = False
+        self._snapshot: Optional[tracemalloc.Snapshot] = None
+
+    def start(self) -> None:
+        if not tracemalloc.is_tracing():
+            # One frame per trace keeps tracing and snapshots cheap.
+            tracemalloc.start(1)
+            self._started = True
+
+    def stop(self) -> None:
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Measures the enclosed block, failing once it ends over budget."""
+        self.start()
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        snapshot = self._snapshot = self._take_snapshot()
+        try:
+            yield
+        finally:
+            self._snapshot = None
+        current, peak = tracemalloc.get_traced_memory()
+        top_sites = self._top_sites(snapshot)
+        over_budget = self.budget is not None and peak > self.budget
+        if over_budget and not top_sites:
+            top_sites = self._largest_sites()
+        self.phases.append(PhaseStats(name, peak, current - before, top_sites))
+        logger.debug(
+            f"Memory after {name}: peak {format_size(peak)}, "
+            f"net {format_size(current - before)}"
+        )
+        if over_budget:
+            raise MemoryBudgetExceeded(name, self.report())
+
+    def check(self, name: str) -> None:
+        """Fails fast when the memory traced right now is over budget."""
+        if self.budget is None or not tracemalloc.is_tracing():
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        if current > self.budget:
+            top_sites = self._top_sites(self._snapshot) or self._largest_sites()
+            report = self.report(
+                PhaseStats(f"{name} (interrupted)", peak, 0, top_sites)
+            )
+            raise MemoryBudgetExceeded(name, report)
+
+    def _take_snapshot(self) -> Optional[tracemalloc.Snapshot]:
+        return tracemalloc.take_snapshot() if self.top else None
+
+    def _top_sites(self, before: Optional[tracemalloc.Snapshot]) -> List[str]:
+        if before is None:
+            return []
+        stats = tracemalloc.take_snapshot().compare_to(before, "lineno")
+        return [
+            f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}  "
+            f"{format_size(stat.size_diff)} ({stat.count_diff:+d} blocks)"
+            for stat in stats[: self.top]
+            if stat.size_diff > 0
+        ]
+
+    def _largest_sites(self) -> List[str]:
+        """Lists the sites holding most memory, from one snapshot."""
+        stats = tracemalloc.take_snapshot().statistics("lineno")
+        return [
+            f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}  "
+            f"{format_size(stat.size)} ({stat.count} blocks)"
+            for stat in stats[: self.top or BUDGET_TOP_SITES]
+        ]
+
+    def report(self, current: Optional[PhaseStats] = None) -> str:
+        """Returns the per-phase table followed by the top allocation sites."""
+        phases = self.phases + ([current] if current else [])
+        budget = format_size(self.budget) if self.budget is not None else "none"
+        lines = [f"Memory by phase (budget {budget}):"]
+        for stats in phases:
+            lines.append(
+                f"  {stats.phase:<24} peak {format_size(stats.peak):>12}  "
+                f"net {format_size(stats.net):>12}"
+            )
+        for stats in phases:
+            if stats.top_sites:
+                lines.append(f"Top allocation sites of {stats.phase}:")
+                lines.extend(f"  {site}" for site in stats.top_sites)
+        return "\n".join(lines)
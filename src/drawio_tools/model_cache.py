@@ -0,0 +1,161 @@
+import hashlib
+import logging
+import os
+import pickle
+import zlib
+from importlib import metadata
+from typing import Any, Dict, List, Optional, Tuple
+
+from drawio_tools.atomic_write import write_atomic
+
+logger = logging.getLogger(__name__)
+
+# Bump when the cached model layout changes so stale entries are ignored.
+MODEL_CACHE_FORMAT_VERSION = 2
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# (tables, references, positions, title, created at) as set by import_file
+ParsedModel = Tuple[
+    Dict[str, List[Tuple[str, str]]],
+    Dict[str, List[Dict[str, str]]],
+    Dict[str, Tuple[int, int]],
+    str,
+    str,
+]
+
+
+def tool_version() -> str:
+    """Installed version of the package, part of every cache key."""
+    try:
+        return metadata.version("create-drawio")
+    except metadata.PackageNotFoundError:
+        return "dev"
+
+
+def file_digest(path_file_name: str) -> str:
+    with open(path_file_name, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class ModelCache:
+    """Persists fully parsed models so unchanged DSL files skip parsing.
+
+    Entries are keyed by the SHA-256 of the DSL file content and the tool
+    version, and also record the digest of every INCLUDEd file relative to
+    the DSL file, so an entry is only reused while the include tree seen
+    from the requesting file is unchanged. Entries are
+    zlib-compressed pickles written atomically, which makes the directory
+    safe to share between concurrent batch workers. Once the directory
+    grows past ``max_bytes`` the least recently used entries are removed.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._version = tool_version()
+
+    def get(self, path_file_name: str) -> Optional[ParsedModel]:
+        """Returns the cached model of the file, or None on a miss."""
+        entry_path = self._entry_path(path_file_name)
+        entry = self._load(entry_path)
+        if entry is None or not self._dependencies_unchanged(
+            path_file_name, entry["dependencies"]
+        ):
+            self.misses += 1
+            return None
+        self.hits += 1
+        try:
+            # The modification time is the recency used by the LRU eviction.
+            os.utime(entry_path)
+        except OSError:
+            pass
+        model: ParsedModel = entry["model"]
+        return model
+
+    def put(
+        self, path_file_name: str, model: ParsedModel, dependencies: List[str]
+    ) -> None:
+        """Stores the model parsed from the file and the files it INCLUDEs."""
+        folder = self._folder(path_file_name)
+        entry = {
+            # Relative to the file, so a copy elsewhere checks its own INCLUDEs.
+            "dependencies": [
+                (os.path.relpath(path, folder), file_digest(path))
+                for path in dependencies
+            ],
+            "model": model,
+        }
+        data = zlib.compress(pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+        self._store(self._entry_path(path_file_name), data)
+        self._evict()
+
+    def _entry_path(self, path_file_name: str) -> str:
+        key = hashlib.sha256(
+            f"{self._version}\0{file_digest(path_file_name)}".encode()
+        ).hexdigest()
+        return os.path.join(
+            self.cache_dir, f"model-v{MODEL_CACHE_FORMAT_VERSION}-{key}.bin"
+        )
+
+    def _folder(self, path_file_name: str) -> str:
+        return os.path.dirname(os.path.realpath(path_file_name))
+
+    def _dependencies_unchanged(
+        self, path_file_name: str, dependencies: List[Tuple[str, str]]
+    ) -> bool:
+        folder = self._folder(path_file_name)
+        for path, digest in dependencies:
+            try:
+                if file_digest(os.path.join(folder, path)) != digest:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _load(self, entry_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(entry_path, "rb") as f:
+                entry: Dict[str, Any] = pickle.loads(zlib.decompress(f.read()))
+                return entry
+        except FileNotFoundError:
+            return None
+        except (OSError, zlib.error, pickle.UnpicklingError, EOFError) as err:
+            logger.warning(f"Ignoring unreadable model cache entry {entry_path}: {err}")
+            return None
+
+    def _store(self, entry_path: str, data: bytes) -> None:
+        """Writes the entry atomically so concurrent readers never see halves."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        try:
+            write_atomic(entry_path, data, sync=False)
+        except OSError as err:
+            logger.warning(f"Could not write model cache entry {entry_path}: {err}")
+
+    def _evict(self) -> None:
+        """Removes least recently used entries until the size limit holds."""
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for item in it:
+                if not (item.name.startswith("model-") and item.name.endswith(".bin")):
+                    continue
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, item.path))
+                total += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Another worker evicted it first.
+                pass
+            total -= size
+            logger.debug(f"Evicted model cache entry {path}")
@@ -0,0 +1,183 @@
+from array import array
+from collections import Counter
+from itertools import accumulate, chain
+from operator import itemgetter
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+from drawio_tools.drawio_render import ErdModel
+
+
+class SchemaGraph:
+    """Table graph of a model, with one directed edge per REFERENCE.
+
+    An edge runs from the table holding the foreign key to the table it
+    references. Adjacency is stored CSR-style: the neighbours of node ``i``
+    are ``targets[offsets[i]:offsets[i + 1]]``, in flat integer arrays built
+    once, so every query is a linear scan without per-table lists.
+    """
+
+    def __init__(
+        self,
+        tables: Sequence[str],
+        references: Mapping[str, Sequence[Mapping[str, str]]],
+    ) -> None:
+        self.names: List[str] = list(tables)
+        self.index: Dict[str, int] = {name: i for i, name in enumerate(self.names)}
+        index = self.index
+        target_of = itemgetter("table_reference")
+        referenced = set(map(target_of, chain.from_iterable(references.values())))
+        for name in [*references, *sorted(referenced)]:
+            # References to undeclared tables still get a node.
+            if name not in index:
+                index[name] = len(self.names)
+                self.names.append(name)
+        sources: List[int] = []
+        targets: List[int] = []
+        for source, refs in references.items():
+            sources.extend([index[source]] * len(refs))
+            targets.extend(map(index.__getitem__, map(target_of, refs)))
+        self.edge_count = len(sources)
+        self.out_offsets, self.out_targets = self._csr(sources, targets)
+        self.in_offsets, self.in_sources = self._csr(targets, sources)
+
+    @classmethod
+    def from_model(cls, model: ErdModel) -> "SchemaGraph":
+        return cls(list(model.tables), model.references)
+
+    def _csr(self, sources: List[int], targets: List[int]) -> Tuple[array, array]:
+        """Sorts the edges by source into offsets and neighbours arrays."""
+        counts = Counter(sources)
+        sizes = map(counts.__getitem__, range(len(self.names)))
+        offsets = array("l", accumulate(sizes, initial=0))
+        order = sorted(range(len(sources)), key=sources.__getitem__)
+        return offsets, array("l", map(targets.__getitem__, order))
+
+    def out_degree(self, name: str) -> int:
+        i = self.index[name]
+        return self.out_offsets[i + 1] - self.out_offsets[i]
+
+    def in_degree(self, name: str) -> int:
+        i = self.index[name]
+        return self.in_offsets[i + 1] - self.in_offsets[i]
+
+    def orphans(self) -> List[str]:
+        """Tables neither referencing nor referenced by any table."""
+        return [
+            name
+            for i, name in enumerate(self.names)
+            if self.out_offsets[i] == self.out_offsets[i + 1]
+            and self.in_offsets[i] == self.in_offsets[i + 1]
+        ]
+
+    def top_fan_in(self, count: int = 10) -> List[Tuple[str, int]]:
+        """Most referenced tables with their number of incoming references."""
+        degrees = [
+            (name, self.in_offsets[i + 1] - self.in_offsets[i])
+            for i, name in enumerate(self.names)
+        ]
+        degrees.sort(key=lambda item: -item[1])
+        return [item for item in degrees[:count] if item[1]]
+
+    def components(self) -> List[List[str]]:
+        """Connected subject areas, ignoring edge direction, largest first."""
+        component = array("l", [-1]) * len(self.names)
+        groups: List[List[str]] = []
+        for start in range(len(self.names)):
+            if component[start] != -1:
+                continue
+            component[start] = len(groups)
+            members = [start]
+            stack = [start]
+            while stack:
+                node = stack.pop()
+                for offsets, neighbours in (
+                    (self.out_offsets, self.out_targets),
+                    (self.in_offsets, self.in_sources),
+                ):
+                    for j in range(offsets[node], offsets[node + 1]):
+                        other = neighbours[j]
+                        if component[other] == -1:
+                            component[other] = len(groups)
+                            members.append(other)
+                            stack.append(other)
+            groups.append([self.names[i] for i in sorted(members)])
+        groups.sort(key=len, reverse=True)
+        return groups
+
+    def cycles(self) -> List[List[str]]:
+        """Groups of tables referencing each other in a loop (Tarjan's SCC).
+
+        Each group is a strongly connected component with more than one
+        table, or a single table referencing itself.
+        """
+        size = len(self.names)
+        order = array("l", [-1]) * size
+        low = array("l", [0]) * size
+        on_stack = bytearray(size)
+        stack: List[int] = []
+        result: List[List[str]] = []
+        counter = 0
+
+        for root in range(size):
+            if order[root] != -1:
+                continue
+            # Iterative DFS: (node, next edge position) frames.
+            frames = [(root, self.out_offsets[root])]
+            order[root] = low[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack[root] = 1
+            while frames:
+                node, position = frames[-1]
+                if position < self.out_offsets[node + 1]:
+                    frames[-1] = (node, position + 1)
+                    child = self.out_targets[position]
+                    if order[child] == -1:
+                        order[child] = low[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack[child] = 1
+                        frames.append((child, self.out_offsets[child]))
+                    elif on_stack[child]:
+                        low[node] = min(low[node], order[child])
+                    continue
+                frames.pop()
+                if frames:
+                    parent = frames[-1][0]
+                    low[parent] = min(low[parent], low[node])
+                if low[node] == order[node]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = 0
+                        members.append(member)
+                        if member == node:
+                            break
+                    if len(members) > 1 or self._has_self_loop(node):
+                        result.append(sorted(self.names[i] for i in members))
+        return result
+
+    def _has_self_loop(self, node: int) -> bool:
+        return any(
+            self.out_targets[j] == node
+            for j in range(self.out_offsets[node], self.out_offsets[node + 1])
+        )
+
+    def print_report(self, top: int = 10) -> None:
+        components = self.components()
+        print(f"Tables: {len(self.names)}")
+        print(f"References: {self.edge_count}")
+        print(f"Subject areas: {len(components)}")
+        for number, members in enumerate(components[:top], start=1):
+            print(f"    {number}. {len(members)} tables: {', '.join(members[:5])}")
+        orphans = self.orphans()
+        print(f"Orphan tables: {len(orphans)}")
+        for name in orphans[:top]:
+            print(f"    {name}")
+        print("Highest fan-in:")
+        for name, degree in self.top_fan_in(top):
+            print(f"    {name}: {degree}")
+        cycles = self.cycles()
+        print(f"Reference cycles: {len(cycles)}")
+        for members in cycles[:top]:
+            print(f"    {' -> '.join(members)}")
@@ -0,0 +1,178 @@
+import json
+import re
+import threading
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Pattern, Tuple
+
+# Ways a rule can match a table or column name
+RULE_KINDS = ["prefix", "suffix", "regex"]
+
+# Sections of a rules file and what their names are matched against
+RULE_TARGETS = ["tables", "columns"]
+
+# Marks the trie node where a prefix or suffix ends
+_END = ""
+
+Style = Mapping[str, str]
+
+
+class RuleMatcher:
+    """All rules of one section compiled into a single matcher.
+
+    Prefixes and suffixes live in two character tries, and every regex is
+    one optional lookahead of a single combined pattern (regexes match from
+    the start of the name, like ``re.match``), so matching a name
+    costs one walk of each trie plus one regex match however many rules
+    there are. Regexes with groups or global flags are matched on their
+    own. Results are memoized by name, since column names repeat across
+    tables.
+    """
+
+    def __init__(self, rules: List[Tuple[str, str, Style]]) -> None:
+        self._styles = [MappingProxyType(dict(style)) for _, _, style in rules]
+        self._prefixes: Dict[str, Any] = {}
+        self._suffixes: Dict[str, Any] = {}
+        lookaheads = []
+        # Regexes that cannot share the combined pattern: groups would be
+        # renumbered (breaking backreferences) or clash by name, and global
+        # inline flags such as (?i) are only allowed at its very start.
+        self._separate: List[Tuple[int, Pattern[str]]] = []
+        for index, (kind, pattern, _) in enumerate(rules):
+            if kind == "prefix":
+                self._insert(self._prefixes, pattern, index)
+            elif kind == "suffix":
+                self._insert(self._suffixes, pattern[::-1], index)
+            elif kind == "regex":
+                try:
+                    compiled = re.compile(pattern)
+                except re.error as e:
+                    raise ValueError(f"Invalid regex '{pattern}': {e}.") from e
+                if compiled.groups or compiled.flags & ~re.UNICODE:
+                    self._separate.append((index, compiled))
+                else:
+                    lookaheads.append(f"(?:(?=(?:{pattern}))(?P<r{index}>))?")
+            else:
+                raise ValueError(f"Invalid rule kind '{kind}'. Allowed: {RULE_KINDS}.")
+        self._regex: Optional[Pattern[str]] = None
+        if lookaheads:
+            try:
+                self._regex = re.compile("".join(lookaheads))
+            except re.error:
+                # Each regex compiled alone; fall back to matching them so.
+                self._separate = sorted(
+                    self._separate
+                    + [
+                        (index, re.compile(pattern))
+                        for index, (kind, pattern, _) in enumerate(rules)
+                        if kind == "regex"
+                        and all(index != other for other, _ in self._separate)
+                    ]
+                )
+        self._cache: Dict[str, Style] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _insert(trie: Dict[str, Any], key: str, index: int) -> None:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node.setdefault(_END, []).append(index)
+
+    @staticmethod
+    def _walk(trie: Dict[str, Any], key: str, matched: List[int]) -> None:
+        node = trie
+        for char in key:
+            if _END in node:
+                matched.extend(node[_END])
+            child = node.get(char)
+            if child is None:
+                return
+            node = child
+        if _END in node:
+            matched.extend(node[_END])
+
+    def style_for(self, name: str) -> Style:
+        """Returns the merged style of every rule matching name.
+
+        Rules apply in file order, so later rules override earlier ones.
+        """
+        style = self._cache.get(name)
+        if style is not None:
+            return style
+
+        matched: List[int] = []
+        self._walk(self._prefixes, name, matched)
+        self._walk(self._suffixes, name[::-1], matched)
+        if self._regex is not None:
+            match = self._regex.match(name)
+            # Groups only capture when at least one regex matched.
+            if match is not None and match.lastindex is not None:
+                matched.extend(
+                    int(group[1:])
+                    for group, value in match.groupdict().items()
+                    if value is not None
+                )
+        matched.extend(
+            index for index, regex in self._separate if regex.match(name) is not None
+        )
+
+        merged: Dict[str, str] = {}
+        for index in sorted(matched):
+            merged.update(self._styles[index])
+        style = MappingProxyType(merged)
+        with self._lock:
+            self._cache[name] = style
+        return style
+
+
+class StyleRules:
+    """Style overrides for tables and columns, applied over styles.py."""
+
+    def __init__(
+        self,
+        tables: Optional[List[Tuple[str, str, Style]]] = None,
+        columns: Optional[List[Tuple[str, str, Style]]] = None,
+    ) -> None:
+        self.tables = RuleMatcher(tables or [])
+        self.columns = RuleMatcher(columns or [])
+
+    @classmethod
+    def from_dict(cls, document: Mapping[str, Any]) -> "StyleRules":
+        """Builds the rules from a parsed rules file.
+
+        Each section lists rules such as
+        ``{"prefix": "BRIDGE_", "style": {"fillColor": "#C5E1A5"}}`` with
+        exactly one of ``prefix``, ``suffix`` or ``regex``.
+        """
+        sections: Dict[str, List[Tuple[str, str, Style]]] = {}
+        for target, rules in document.items():
+            if target not in RULE_TARGETS:
+                raise ValueError(
+                    f"Invalid rules section '{target}'. Allowed: {RULE_TARGETS}."
+                )
+            sections[target] = [cls._parse_rule(rule) for rule in rules]
+        return cls(sections.get("tables"), sections.get("columns"))
+
+    @staticmethod
+    def _parse_rule(rule: Mapping[str, Any]) -> Tuple[str, str, Style]:
+        kinds = [kind for kind in RULE_KINDS if kind in rule]
+        if len(kinds) != 1:
+            raise ValueError(
+                f"Invalid rule {dict(rule)}: needs exactly one of {RULE_KINDS}."
+            )
+        style = rule.get("style")
+        if not isinstance(style, dict):
+            raise ValueError(f"Invalid rule {dict(rule)}: 'style' must be an object.")
+        return kinds[0], str(rule[kinds[0]]), {k: str(v) for k, v in style.items()}
+
+    def table_style(self, table_name: str) -> Style:
+        return self.tables.style_for(table_name)
+
+    def column_style(self, column_name: str) -> Style:
+        return self.columns.style_for(column_name)
+
+
+def load_style_rules(path_file_name: str) -> StyleRules:
+    """Reads a JSON rules file into compiled StyleRules."""
+    with open(path_file_name, "r", encoding="utf-8") as f:
+        return StyleRules.from_dict(json.load(f))
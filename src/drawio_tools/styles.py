@@ -1,3 +1,6 @@
+# Height of a table's header and of each of its rows, in pixels
+ROW_HEIGHT = 30
+
 TABLE_STYLE = {
     "shape": "table",
     "startSize": "30",
@@ -56,6 +59,31 @@ COLUMN_CEL_STYLE = {
     "spacingLeft": "6",
 }
 
+HTML_TABLE_STYLE = {
+    "html": "1",
+    "whiteSpace": "wrap",
+    "overflow": "fill",
+    "verticalAlign": "top",
+    "align": "left",
+    "spacing": "0",
+    "rounded": "1",
+    "arcSize": "6",
+    "strokeColor": "default",
+}
+
+SCHEMA_STYLE = {
+    "shape": "swimlane",
+    "startSize": "30",
+    "container": "1",
+    "collapsible": "1",
+    "rounded": "1",
+    "arcSize": "2",
+    "fontStyle": "1",
+    "fillColor": "#EEEEEE",
+    "swimlaneFillColor": "none",
+    "strokeColor": "#999999",
+}
+
 EDGE_STYLE = {
     "edgeStyle": "entityRelationEdgeStyle",
     "fontSize": "12",
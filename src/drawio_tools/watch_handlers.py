@@ -0,0 +1,57 @@
+import logging
+import os
+
+from watchdog.events import FileSystemEvent, PatternMatchingEventHandler
+
+from drawio_tools.drawio_table_locator import DrawioTableLocator
+from drawio_tools.drawio_watcher import RegenerationScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class DslEventHandler(PatternMatchingEventHandler):
+    """Regenerates output/x.drawio whenever input/x.dsl changes."""
+
+    def __init__(self, scheduler: RegenerationScheduler) -> None:
+        super().__init__(patterns=["*.dsl"], ignore_directories=True)
+        self.scheduler = scheduler
+
+    def on_modified(self, event: FileSystemEvent) -> None:
+        self.scheduler.submit(str(event.src_path))
+
+    def on_created(self, event: FileSystemEvent) -> None:
+        self.scheduler.submit(str(event.src_path))
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        # Editors that save through a temporary file end with a rename.
+        if str(event.dest_path).endswith(".dsl"):
+            self.scheduler.submit(str(event.dest_path))
+
+
+class DrawioEventHandler(PatternMatchingEventHandler):
+    """Prints the ARRANGE lines of the .drawio file that changed."""
+
+    def __init__(self) -> None:
+        super().__init__(patterns=["*.drawio"], ignore_directories=True)
+
+    def on_modified(self, event: FileSystemEvent) -> None:
+        self._print_positions(str(event.src_path))
+
+    def on_created(self, event: FileSystemEvent) -> None:
+        self._print_positions(str(event.src_path))
+
+    def on_moved(self, event: FileSystemEvent) -> None:
+        # Outputs are written to a temporary file and renamed into place.
+        if str(event.dest_path).endswith(".drawio"):
+            self._print_positions(str(event.dest_path))
+
+    def _print_positions(self, path: str) -> None:
+        locator = DrawioTableLocator()
+        locator.output_dir = os.path.dirname(path)
+        try:
+            locator.read_file(os.path.basename(path))
+        except Exception as e:
+            logger.warning(f"Could not read {path}: {e}")
+            return
+        print(f"\n{path}")
+        locator.print_positions()
@@ -0,0 +1,73 @@
+import os
+import pathlib
+
+import pytest
+
+from drawio_tools.atomic_write import write_if_changed
+
+
+def test_write_if_changed_creates_and_replaces_file(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    path = tmp_path / "model.drawio"
+
+    # Act
+    created = write_if_changed(str(path), b"first")
+    replaced = write_if_changed(str(path), b"second")
+
+    # Assert
+    assert (created, replaced) == (True, True)
+    assert path.read_bytes() == b"second"
+    assert os.listdir(tmp_path) == ["model.drawio"]
+
+
+def test_write_if_changed_skips_identical_content(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    path = tmp_path / "model.drawio"
+    write_if_changed(str(path), b"same")
+    os.utime(path, ns=(0, 0))
+
+    # Act
+    written = write_if_changed(str(path), b"same")
+
+    # Assert
+    assert written is False
+    assert os.stat(path).st_mtime_ns == 0
+
+
+def test_write_if_changed_keeps_old_file_when_write_fails(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Arrange
+    path = tmp_path / "model.drawio"
+    write_if_changed(str(path), b"old")
+
+    def fail(*args: object) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "fsync", fail)
+
+    # Act
+    with pytest.raises(OSError, match="disk full"):
+        write_if_changed(str(path), b"new")
+
+    # Assert
+    assert path.read_bytes() == b"old"
+    assert os.listdir(tmp_path) == ["model.drawio"]
+
+
+def test_write_if_changed_keeps_usual_file_mode(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    created_path = tmp_path / "new.drawio"
+    existing_path = tmp_path / "existing.drawio"
+    existing_path.write_bytes(b"old")
+    existing_path.chmod(0o640)
+    umask = os.umask(0)
+    os.umask(umask)
+
+    # Act
+    write_if_changed(str(created_path), b"data")
+    write_if_changed(str(existing_path), b"new")
+
+    # Assert
+    assert created_path.stat().st_mode & 0o777 == 0o666 & ~umask
+    assert existing_path.stat().st_mode & 0o777 == 0o640
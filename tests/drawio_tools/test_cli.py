@@ -0,0 +1,294 @@
+import io
+import os
+import pathlib
+import subprocess
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+from watchdog.events import FileModifiedEvent, FileMovedEvent
+
+from drawio_tools import drawio_generator
+from drawio_tools.cli import main
+from drawio_tools.watch_handlers import DrawioEventHandler, DslEventHandler
+
+# Upper bound for `import drawio_tools.cli`, in microseconds.
+IMPORT_TIME_BUDGET_US = 200_000
+
+DSL_CONTENT = """
+TABLE FACT_SALES {
+    SALE_ID *
+    CUSTOMER_ID
+}
+TABLE DIM_CUSTOMER {
+    CUSTOMER_ID *
+}
+REFERENCE FACT_SALES.CUSTOMER_ID -> DIM_CUSTOMER.CUSTOMER_ID
+ARRANGE DIM_CUSTOMER (400, 120)
+"""
+
+
+@pytest.fixture
+def workdir(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> pathlib.Path:
+    """Runs the test inside an empty project folder with an input/ model."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("INPUT_FILE_NAME_PATH", raising=False)
+    monkeypatch.delenv("OUTPUT_FILE_NAME", raising=False)
+    (tmp_path / "input").mkdir()
+    (tmp_path / "input" / "sales.dsl").write_text(DSL_CONTENT)
+    return tmp_path
+
+
+def test_generate_from_argument(workdir: pathlib.Path) -> None:
+    # Act
+    code = main(["generate", "input/sales.dsl", "--compact", "--format", "svg"])
+
+    # Assert
+    assert code == 0
+    assert (workdir / "output" / "sales.drawio").exists()
+    assert (workdir / "output" / "sales.svg").exists()
+
+
+def test_generate_formats_share_one_layout_and_keep_compact(
+    workdir: pathlib.Path,
+) -> None:
+    # Arrange
+    args = ["generate", "input/sales.dsl", "--compact", "--nudge-overlaps"]
+    args += ["--format", "drawio", "--format", "mermaid"]
+
+    # Act
+    with patch(
+        "drawio_tools.drawio_generator.resolve_overlaps",
+        wraps=drawio_generator.resolve_overlaps,
+    ) as resolve:
+        code = main(args)
+
+    # Assert
+    assert code == 0
+    assert resolve.call_count == 1
+    drawio = (workdir / "output" / "sales.drawio").read_text()
+    assert 'dx="' not in drawio
+    assert (workdir / "output" / "sales.mmd").exists()
+
+
+def test_generate_to_stdout_and_locate_from_stdin(
+    workdir: pathlib.Path,
+    capsysbinary: pytest.CaptureFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # Act
+    code = main(["generate", "input/sales.dsl", "-o", "-"])
+    data = capsysbinary.readouterr().out
+    monkeypatch.setattr("sys.stdin", io.TextIOWrapper(io.BytesIO(data)))
+    located = main(["locate", "-"])
+
+    # Assert
+    assert (code, located) == (0, 0)
+    assert data.startswith(b"<?xml")
+    assert not (workdir / "output").exists()
+    assert b"ARRANGE DIM_CUSTOMER (400, 120)" in capsysbinary.readouterr().out
+
+
+def test_generate_from_environment(
+    workdir: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Arrange
+    monkeypatch.setenv("INPUT_FILE_NAME_PATH", "sales.dsl")
+    monkeypatch.setenv("OUTPUT_FILE_NAME", "orders.drawio")
+
+    # Act
+    code = main(["generate"])
+
+    # Assert
+    assert code == 0
+    assert (workdir / "output" / "orders.drawio").exists()
+
+
+def test_generate_without_input_fails(workdir: pathlib.Path) -> None:
+    assert main(["generate"]) == 1
+
+
+def test_generate_reports_parse_errors(workdir: pathlib.Path) -> None:
+    (workdir / "input" / "broken.dsl").write_text("REFERENCE A.B -> C.D\n")
+
+    assert main(["generate", "input/broken.dsl"]) == 1
+
+
+def test_locate_prints_positions(
+    workdir: pathlib.Path, capsys: pytest.CaptureFixture
+) -> None:
+    # Arrange
+    main(["generate", "input/sales.dsl"])
+
+    # Act
+    code = main(["locate", "sales.drawio"])
+
+    # Assert
+    assert code == 0
+    assert "ARRANGE DIM_CUSTOMER (400, 120)" in capsys.readouterr().out
+
+
+def test_locate_without_file_fails(workdir: pathlib.Path) -> None:
+    assert main(["locate"]) == 1
+    assert main(["locate", "missing.drawio"]) == 1
+
+
+def test_batch_generates_every_model_in_a_folder(workdir: pathlib.Path) -> None:
+    # Arrange
+    (workdir / "input" / "domain").mkdir()
+    (workdir / "input" / "domain" / "returns.dsl").write_text(DSL_CONTENT)
+
+    # Act
+    code = main(["batch", "input", "--workers", "2"])
+
+    # Assert
+    assert code == 0
+    assert (workdir / "output" / "sales.drawio").exists()
+    assert (workdir / "output" / "domain" / "returns.drawio").exists()
+
+
+def test_batch_reuses_cached_models(
+    workdir: pathlib.Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    # Arrange
+    main(["batch", "input", "--cache-dir", ".cache"])
+
+    # Act
+    with caplog.at_level("INFO"):
+        code = main(["batch", "input", "--cache-dir", ".cache"])
+
+    # Assert
+    assert code == 0
+    assert "Reused 1 cached models" in caplog.text
+
+
+def test_batch_reports_failures(workdir: pathlib.Path) -> None:
+    (workdir / "input" / "broken.dsl").write_text("REFERENCE A.B -> C.D\n")
+
+    assert main(["batch", "input/sales.dsl", "input/broken.dsl"]) == 1
+    assert (workdir / "output" / "sales.drawio").exists()
+
+
+def test_diff_exit_code_and_output(
+    workdir: pathlib.Path, capsys: pytest.CaptureFixture
+) -> None:
+    # Arrange
+    (workdir / "input" / "new.dsl").write_text(
+        DSL_CONTENT + "TABLE DIM_DATE {\n DATE_ID *\n}\n"
+    )
+
+    # Act
+    unchanged = main(["diff", "input/sales.dsl", "input/sales.dsl"])
+    changed = main(["diff", "input/sales.dsl", "input/new.dsl", "-o", "diff.drawio"])
+
+    # Assert
+    assert (unchanged, changed) == (0, 1)
+    assert "+ TABLE DIM_DATE" in capsys.readouterr().out
+    assert (workdir / "output" / "diff.drawio").exists()
+
+
+def test_dsl_event_handler_submits_changed_file() -> None:
+    # Arrange
+    scheduler = Mock()
+    handler = DslEventHandler(scheduler)
+
+    # Act
+    handler.on_modified(FileModifiedEvent("input/sales.dsl"))
+    handler.on_created(FileModifiedEvent("input/new.dsl"))
+    handler.on_moved(FileMovedEvent("input/.sales.dsl.swp", "input/sales.dsl"))
+    handler.on_moved(FileMovedEvent("input/sales.dsl", "input/sales.bak"))
+
+    # Assert
+    assert [call.args[0] for call in scheduler.submit.call_args_list] == [
+        "input/sales.dsl",
+        "input/new.dsl",
+        "input/sales.dsl",
+    ]
+
+
+def test_drawio_event_handler_prints_positions(
+    workdir: pathlib.Path, capsys: pytest.CaptureFixture
+) -> None:
+    # Arrange
+    main(["generate", "input/sales.dsl"])
+    handler = DrawioEventHandler()
+
+    # Act
+    handler.on_modified(FileModifiedEvent("output/sales.drawio"))
+    handler.on_created(FileModifiedEvent("output/missing.drawio"))
+    handler.on_moved(FileMovedEvent("output/.sales.tmp", "output/sales.drawio"))
+
+    # Assert
+    assert capsys.readouterr().out.count("ARRANGE DIM_CUSTOMER (400, 120)") == 2
+
+
+def test_cli_import_is_lazy_and_within_budget() -> None:
+    # Act
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import drawio_tools.cli"],
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+        check=True,
+    )
+
+    # Assert: "import time: self [us] | cumulative | imported package"
+    timings = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            _, cumulative, name = line.split("|")
+            if cumulative.strip().isdigit():
+                timings[name.strip()] = int(cumulative)
+    for heavy in ("watchdog", "dotenv", "xml.etree.ElementTree"):
+        assert heavy not in timings, f"{heavy} imported at startup"
+    assert "drawio_tools.drawio_generator" not in timings
+    assert timings["drawio_tools.cli"] < IMPORT_TIME_BUDGET_US
+
+
+def test_stats_prints_graph_report(
+    workdir: pathlib.Path, capsys: pytest.CaptureFixture
+) -> None:
+    # Act
+    code = main(["stats", "input/sales.dsl"])
+
+    # Assert
+    out = capsys.readouterr().out
+    assert code == 0
+    assert "Tables: 2" in out
+    assert "DIM_CUSTOMER: 1" in out
+    assert "Reference cycles: 0" in out
+
+
+def test_reverse_rebuilds_dsl_of_generated_file(
+    workdir: pathlib.Path, capsys: pytest.CaptureFixture
+) -> None:
+    # Arrange
+    main(["generate", "input/sales.dsl", "--compact"])
+
+    # Act
+    to_stdout = main(["reverse", "sales.drawio"])
+    out = capsys.readouterr().out
+    to_file = main(["reverse", "sales.drawio", "-o", "input/copy.dsl"])
+
+    # Assert
+    assert (to_stdout, to_file) == (0, 0)
+    assert "REFERENCE FACT_SALES.CUSTOMER_ID -> DIM_CUSTOMER.CUSTOMER_ID" in out
+    assert "ARRANGE DIM_CUSTOMER (400, 120)" in out
+    assert (workdir / "input" / "copy.dsl").read_text() == out
+    assert main(["reverse", "missing.drawio"]) == 1
+
+
+def test_generate_with_memory_budget_and_report(
+    workdir: pathlib.Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    # Act
+    with caplog.at_level("INFO"):
+        reported = main(["generate", "input/sales.dsl", "--memory-report"])
+    over_budget = main(["generate", "input/sales.dsl", "--memory-budget", "1K"])
+
+    # Assert
+    assert (reported, over_budget) == (0, 1)
+    assert "Memory by phase (budget none):" in caplog.text
+    assert "Memory budget exceeded during" in caplog.text
+    with pytest.raises(SystemExit):
+        main(["generate", "input/sales.dsl", "--memory-budget", "lots"])
@@ -0,0 +1,130 @@
+import pathlib
+import xml.etree.ElementTree as ET
+
+from drawio_tools.drawio_compact import (
+    IdShortener,
+    compact_graph_model,
+    compact_style,
+)
+from drawio_tools.drawio_generator import DrawioGenerator
+from drawio_tools.drawio_table_locator import DrawioTableLocator
+
+DSL_CONTENT = """
+TABLE FACT_SALES {
+    SALE_ID *
+    CUSTOMER_ID
+}
+TABLE DIM_CUSTOMER {
+    CUSTOMER_ID *
+}
+REFERENCE FACT_SALES.CUSTOMER_ID -> DIM_CUSTOMER.CUSTOMER_ID
+ARRANGE FACT_SALES (0, 0)
+ARRANGE DIM_CUSTOMER (400, 0)
+"""
+
+
+def import_model(tmp_path: pathlib.Path) -> DrawioGenerator:
+    """Helper to import a model with an arrowless reference at the origin."""
+    dsl_file = tmp_path / "sales.dsl"
+    dsl_file.write_text(DSL_CONTENT)
+    generator = DrawioGenerator()
+    generator.import_file(str(dsl_file))
+    return generator
+
+
+def test_compact_style_drops_empty_and_default_keys() -> None:
+    style = "shape=table;fontStyle=0;align=center;fillColor=#9CD6EF;fontStyle=;"
+
+    assert compact_style(style) == "shape=table;fillColor=#9CD6EF"
+
+
+def test_compact_style_keeps_missing_end_arrow_as_none() -> None:
+    assert compact_style("html=1;endArrow=;startArrow=;") == "html=1;endArrow=none"
+
+
+def test_compact_render_keeps_arrowless_edges_and_positions(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    generator = import_model(tmp_path)
+    locator = DrawioTableLocator()
+    full = DrawioTableLocator()
+
+    # Act
+    data = generator.mxgraph_bytes(compact=True)
+    locator.read_bytes(data)
+    full.read_bytes(generator.mxgraph_bytes())
+
+    # Assert
+    edges = [
+        cell.attrib["style"]
+        for cell in ET.fromstring(data).iter("mxCell")
+        if cell.attrib.get("edge") == "1"
+    ]
+    assert edges and all("endArrow=none" in style for style in edges)
+    assert locator.positions["FACT_SALES"] == (0, 0)
+    assert locator.positions == full.positions
+
+
+def test_id_shortener_is_deterministic_and_keeps_reserved_ids() -> None:
+    # Arrange
+    first = IdShortener()
+    second = IdShortener()
+
+    # Act
+    ids = [first(cell_id) for cell_id in ["0", "1", "a-long-id", "b", "a-long-id"]]
+
+    # Assert
+    assert ids == ["0", "1", "2", "3", "2"]
+    assert second("something-else") == "2"
+    assert first("title") == "title"
+
+
+def test_id_shortener_skips_reserved_short_ids() -> None:
+    shorten = IdShortener()
+
+    generated = {shorten(f"cell-{n}") for n in range(2000)}
+
+    assert len(generated) == 2000
+    assert not generated & {"0", "1"}
+
+
+def test_compact_graph_model_rewrites_references_consistently() -> None:
+    # Arrange
+    graph_model = ET.fromstring(
+        '<mxGraphModel dx="1" dy="2" grid="0" gridSize="10" pageWidth="850">'
+        "<root>"
+        '<mxCell id="0" /><mxCell id="1" parent="0" />'
+        '<mxCell id="edge-uuid" value="" style="html=1;fontSize=12;" edge="1" '
+        'parent="1" source="T-1" target="T">'
+        '<mxGeometry width="100" height="100" relative="1" as="geometry" />'
+        "</mxCell>"
+        '<mxCell id="T" value="T" style="shape=table;" vertex="1" parent="1">'
+        '<mxGeometry x="0" y="10" width="170" height="60" as="geometry" />'
+        "</mxCell>"
+        '<mxCell id="T-1" value="" style="shape=tableRow;" vertex="1" parent="T">'
+        '<mxGeometry y="30" width="170" height="30" as="geometry" />'
+        "</mxCell>"
+        "</root></mxGraphModel>"
+    )
+
+    # Act
+    compact_graph_model(graph_model)
+
+    # Assert
+    assert graph_model.attrib == {"grid": "0", "pageWidth": "850"}
+    edge, table, row = graph_model.findall("./root/mxCell")[2:]
+    assert (edge.attrib["id"], edge.attrib["source"], edge.attrib["target"]) == (
+        "2",
+        "3",
+        "4",
+    )
+    assert "value" not in edge.attrib
+    assert edge.attrib["style"] == "html=1"
+    assert edge.find("mxGeometry").attrib == {"relative": "1", "as": "geometry"}
+    assert table.attrib["id"] == "4"
+    # Kept so the table locator still finds the table.
+    assert table.find("mxGeometry").attrib["x"] == "0"
+    assert row.find("mxGeometry").attrib.get("x") is None
+    assert row.attrib["id"] == "3"
+    assert row.attrib["parent"] == "4"
@@ -0,0 +1,169 @@
+import pathlib
+import time
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from drawio_tools.drawio_diff import (
+    ADDED_FILL,
+    CHANGED_FILL,
+    REMOVED_FILL,
+    DrawioDiff,
+)
+from drawio_tools.drawio_generator import DrawioGenerator
+
+OLD_DSL = """
+TABLE FACT_SALES {
+    SALE_ID *
+    CUSTOMER_ID
+    AMOUNT
+}
+TABLE DIM_CUSTOMER {
+    CUSTOMER_ID *
+}
+TABLE DIM_LEGACY {
+    LEGACY_ID *
+}
+REFERENCE FACT_SALES.CUSTOMER_ID -> DIM_CUSTOMER.CUSTOMER_ID [ERmany, ERone]
+ARRANGE DIM_LEGACY (600, 100)
+"""
+
+NEW_DSL = """
+TABLE FACT_SALES {
+    SALE_ID *
+    CUSTOMER_ID
+    PRODUCT_ID
+}
+TABLE DIM_CUSTOMER {
+    CUSTOMER_ID *
+}
+TABLE DIM_PRODUCT {
+    PRODUCT_ID *
+}
+REFERENCE FACT_SALES.CUSTOMER_ID -> DIM_CUSTOMER.CUSTOMER_ID [ERmany, ERmandOne]
+REFERENCE FACT_SALES.PRODUCT_ID -> DIM_PRODUCT.PRODUCT_ID
+"""
+
+
+def import_dsl(tmp_path: pathlib.Path, name: str, content: str) -> DrawioGenerator:
+    """Helper to import a DSL string into a generator writing to tmp_path."""
+    dsl_file = tmp_path / name
+    dsl_file.write_text(content)
+    generator = DrawioGenerator()
+    generator.output_dir = str(tmp_path)
+    generator.import_file(str(dsl_file))
+    return generator
+
+
+@pytest.fixture
+def diff(tmp_path: pathlib.Path) -> DrawioDiff:
+    return DrawioDiff(
+        import_dsl(tmp_path, "old.dsl", OLD_DSL),
+        import_dsl(tmp_path, "new.dsl", NEW_DSL),
+    )
+
+
+def test_diff_reports_tables_columns_and_references(diff: DrawioDiff) -> None:
+    assert diff.has_changes()
+    assert diff.added_tables == ["DIM_PRODUCT"]
+    assert diff.removed_tables == ["DIM_LEGACY"]
+    assert diff.changed_tables == ["FACT_SALES"]
+    assert diff.column_changes["FACT_SALES"] == {
+        "added": ["PRODUCT_ID"],
+        "removed": ["AMOUNT"],
+        "changed": [],
+    }
+    assert diff.added_references == [
+        ("FACT_SALES", "PRODUCT_ID", "DIM_PRODUCT", "PRODUCT_ID")
+    ]
+    assert diff.changed_references == [
+        ("FACT_SALES", "CUSTOMER_ID", "DIM_CUSTOMER", "CUSTOMER_ID")
+    ]
+    assert diff.removed_references == []
+
+
+def test_diff_without_changes(tmp_path: pathlib.Path) -> None:
+    diff = DrawioDiff(
+        import_dsl(tmp_path, "old.dsl", OLD_DSL),
+        import_dsl(tmp_path, "same.dsl", OLD_DSL),
+    )
+
+    assert not diff.has_changes()
+
+
+def test_print_report(diff: DrawioDiff, capsys: pytest.CaptureFixture) -> None:
+    diff.print_report()
+
+    out = capsys.readouterr().out
+    assert "+ TABLE DIM_PRODUCT" in out
+    assert "- TABLE DIM_LEGACY" in out
+    assert "~ TABLE FACT_SALES\n    + PRODUCT_ID\n    - AMOUNT" in out
+    assert "+ REFERENCE FACT_SALES.PRODUCT_ID -> DIM_PRODUCT.PRODUCT_ID" in out
+
+
+def test_write_mxgraph_highlights_and_collapses(
+    diff: DrawioDiff, tmp_path: pathlib.Path
+) -> None:
+    # Act
+    diff.write_mxgraph("diff.drawio", collapse_unchanged=True)
+
+    # Assert
+    root = ET.parse(tmp_path / "diff.drawio").getroot()
+    tables = {
+        cell.attrib["id"]: cell
+        for cell in root.iter("mxCell")
+        if cell.attrib.get("style", "").startswith("shape=table;")
+    }
+    assert f"fillColor={ADDED_FILL}" in tables["DIM_PRODUCT"].attrib["style"]
+    assert f"fillColor={CHANGED_FILL}" in tables["FACT_SALES"].attrib["style"]
+    assert f"fillColor={REMOVED_FILL}" in tables["DIM_LEGACY"].attrib["style"]
+    assert tables["DIM_LEGACY"].find("mxGeometry").attrib["x"] == "600"
+
+    unchanged = tables["DIM_CUSTOMER"]
+    assert unchanged.attrib["collapsed"] == "1"
+    assert unchanged.find("mxGeometry").attrib["height"] == "30"
+    bounds = unchanged.find("mxGeometry/mxRectangle")
+    assert bounds.attrib == {
+        "x": bounds.attrib["x"],
+        "y": "100",
+        "width": "170",
+        "height": "60",
+        "as": "alternateBounds",
+    }
+    assert "collapsed" not in tables["FACT_SALES"].attrib
+
+
+def test_write_mxgraph_keeps_render_options(
+    diff: DrawioDiff, tmp_path: pathlib.Path
+) -> None:
+    # Arrange
+    diff.new.table_rendering = "html"
+    diff.new.edge_waypoints = True
+
+    # Act
+    diff.write_mxgraph("diff.drawio")
+
+    # Assert
+    content = (tmp_path / "diff.drawio").read_text()
+    assert "&lt;table" in content
+    assert "shape=table;" not in content
+    assert '<Array as="points">' in content
+
+
+def test_diff_is_linear_on_large_models() -> None:
+    # Arrange
+    old = DrawioGenerator()
+    new = DrawioGenerator()
+    old.tables = {f"T{i}": [("ID", "PK"), ("NAME", "")] for i in range(10_000)}
+    new.tables = dict(old.tables)
+    new.tables["T5"] = [("ID", "PK")]
+    old.references = new.references = {}
+
+    # Act
+    start = time.perf_counter()
+    diff = DrawioDiff(old, new)
+    elapsed = time.perf_counter() - start
+
+    # Assert
+    assert diff.changed_tables == ["T5"]
+    assert elapsed < 1
@@ -0,0 +1,210 @@
+import base64
+import io
+import pathlib
+import tracemalloc
+import zlib
+from typing import List, Tuple
+from urllib.parse import quote
+
+import pytest
+
+from drawio_tools.drawio_dsl_extractor import DrawioDslExtractor, model_to_dsl
+from drawio_tools.drawio_generator import DrawioGenerator
+from drawio_tools.drawio_render import ErdModel
+
+DSL_CONTENT = """
+TITLE Sales ERD
+CREATEDAT 2024-01-01
+TABLE FACT_SALES {
+    SALE_ID *
+    CUSTOMER_ID
+    DATE_ID
+    SHIP_DATE_ID
+    AMOUNT
+}
+TABLE DIM_CUSTOMER {
+    CUSTOMER_ID *
+    NAME
+}
+TABLE crm.DIM_DATE {
+    DATE_ID *
+    DAY
+}
+REFERENCE FACT_SALES.CUSTOMER_ID -> DIM_CUSTOMER.CUSTOMER_ID [ERmany, ERone]
+REFERENCE FACT_SALES.DATE_ID -> crm.DIM_DATE.DATE_ID
+REFERENCE FACT_SALES.SHIP_DATE_ID -> crm.DIM_DATE.DATE_ID [ERzeroToMany, ERone]
+ARRANGE DIM_CUSTOMER (400, 120)
+"""
+
+
+def reference_list(model: ErdModel, arrows: bool = True) -> List[Tuple[str, ...]]:
+    """Returns the references of a model as sorted tuples."""
+    return sorted(
+        (table, *list(ref.values())[: None if arrows else 3])
+        for table, refs in model.references.items()
+        for ref in refs
+    )
+
+
+def generate(tmp_path: pathlib.Path, generator: DrawioGenerator) -> bytes:
+    """Helper to render DSL_CONTENT with the generator's options."""
+    dsl_file = tmp_path / "model.dsl"
+    dsl_file.write_text(DSL_CONTENT)
+    generator.import_file(str(dsl_file))
+    return generator.mxgraph_bytes()
+
+
+def extract(data: bytes) -> ErdModel:
+    """Helper to extract the model of a .drawio document."""
+    extractor = DrawioDslExtractor()
+    extractor.read_stream(io.BytesIO(data))
+    return extractor.model
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"table_rendering": "html"},
+        {"wide_table_threshold": 3},
+        {"table_rendering": "html", "wide_table_threshold": 3},
+        {"edge_aggregation": "pair", "edge_waypoints": True},
+        {"edge_aggregation": "target"},
+    ],
+)
+def test_extracted_model_matches_source_model(
+    tmp_path: pathlib.Path, options: dict
+) -> None:
+    # Arrange
+    generator = DrawioGenerator(**options)
+    data = generate(tmp_path, generator)
+
+    # Act
+    model = extract(data)
+
+    # Assert
+    # Bundled references only keep their arrows when they all agree.
+    arrows = "edge_aggregation" not in options
+    assert dict(model.tables) == dict(generator.model().tables)
+    assert reference_list(model, arrows) == reference_list(generator.model(), arrows)
+    assert (model.title, model.created_at) == ("Sales ERD", "2024-01-01")
+    assert model.positions["DIM_CUSTOMER"] == (400, 120)
+    assert model.positions["crm.DIM_DATE"] == (20, 50)
+    assert "crm" in model.positions
+
+
+def test_extracted_dsl_parses_back_into_the_same_model(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    generator = DrawioGenerator()
+    extractor = DrawioDslExtractor()
+    extractor.read_stream(io.BytesIO(generate(tmp_path, generator)))
+    dsl_file = tmp_path / "extracted.dsl"
+
+    # Act
+    dsl_file.write_text(extractor.to_dsl())
+    model = DrawioGenerator().parse(str(dsl_file))
+
+    # Assert
+    assert model == extractor.model
+    assert "REFERENCE FACT_SALES.CUSTOMER_ID -> DIM_CUSTOMER.CUSTOMER_ID " in (
+        extractor.to_dsl()
+    )
+
+
+def test_compact_and_compressed_diagrams_are_extracted(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    generator = DrawioGenerator()
+    generate(tmp_path, generator)
+    compact = generator.mxgraph_bytes(compact=True)
+    deflate = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+    body = deflate.compress(quote(compact.decode("utf-8")).encode()) + deflate.flush()
+    compressed = (
+        b'<mxfile><diagram id="d" name="Page-1">'
+        + base64.b64encode(body)
+        + b"</diagram></mxfile>"
+    )
+
+    # Act
+    from_compact = extract(compact)
+    from_compressed = extract(compressed)
+
+    # Assert
+    assert from_compact == from_compressed
+    assert dict(from_compact.tables) == dict(generator.model().tables)
+    assert reference_list(from_compact) == reference_list(generator.model())
+
+
+def test_cells_that_are_not_tables_are_ignored() -> None:
+    # Arrange
+    data = b"""<mxGraphModel><root><mxCell id="0"/><mxCell id="1" parent="0"/>
+    <mxCell id="note" value="A sticky note" style="shape=note;" vertex="1"
+        parent="1"><mxGeometry x="10" y="20" width="80" height="40"
+        as="geometry"/></mxCell>
+    <mxCell id="arrow" style="" edge="1" parent="1" source="note" target="1">
+        <mxGeometry relative="1" as="geometry"/></mxCell>
+    </root></mxGraphModel>"""
+
+    # Act
+    model = extract(data)
+
+    # Assert
+    assert (dict(model.tables), dict(model.references)) == ({}, {})
+    assert dict(model.positions) == {}
+
+
+def test_model_to_dsl_skips_half_specified_arrows() -> None:
+    # Arrange
+    model = ErdModel(
+        tables={"A": [("ID", "PK"), ("B_ID", "FK")], "B": [("ID", "PK")]},
+        references={
+            "A": [
+                {
+                    "column_name": "B_ID",
+                    "table_reference": "B",
+                    "column_reference": "ID",
+                    "start_arrow": "ERmany",
+                    "end_arrow": "",
+                }
+            ]
+        },
+    )
+
+    # Act
+    dsl = model_to_dsl(model)
+
+    # Assert
+    assert dsl.splitlines()[-1] == "REFERENCE A.B_ID -> B.ID"
+    assert "    B_ID +" in dsl
+
+
+def test_large_diagram_is_extracted_without_holding_the_document(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    content = "".join(
+        f"TABLE T{i} {{\n ID *\n" + "".join(f" COLUMN_{c}\n" for c in range(20)) + "}\n"
+        for i in range(200)
+    )
+    content += "".join(
+        f"REFERENCE T{i}.COLUMN_0 -> T{i - 1}.ID\n" for i in range(1, 200)
+    )
+    dsl_file = tmp_path / "large.dsl"
+    dsl_file.write_text(content)
+    generator = DrawioGenerator()
+    generator.import_file(str(dsl_file))
+    data = generator.mxgraph_bytes()
+
+    # Act
+    tracemalloc.start()
+    model = extract(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # Assert
+    assert len(model.tables) == 200
+    assert sum(len(refs) for refs in model.references.values()) == 199
+    assert peak < len(data) / 2
@@ -1,5 +1,10 @@
 import pytest
+from drawio_tools import drawio_generator
 from drawio_tools.drawio_generator import DrawioGenerator, EDGES
+from drawio_tools.dsl_parse_cache import DslParseCache
+from drawio_tools.drawio_table_locator import DrawioTableLocator
+from drawio_tools.drawio_overlap import find_overlaps
+from drawio_tools.style_rules import StyleRules
 from typing import List, Tuple, Dict
 
 import xml.etree.ElementTree as ET
@@ -307,22 +312,6 @@ def test_create_root(mock_generator: DrawioGenerator) -> None:
     assert root.tag == "root"
 
 
-def test_create_id_format_and_uniqueness(mock_generator: DrawioGenerator) -> None:
-
-    id1 = mock_generator._create_id()
-    id2 = mock_generator._create_id()
-
-    # Assert it's a string
-    assert isinstance(id1, str)
-
-    # Assert correct format: 32-character hex
-    assert len(id1) == 32
-    assert all(c in "0123456789abcdef" for c in id1)
-
-    # Assert uniqueness
-    assert id1 != id2
-
-
 def test_add_edge_creates_correct_xml(mock_generator: DrawioGenerator) -> None:
     root = ET.Element("root")
     edge_id = "e1"
@@ -451,8 +440,8 @@ def test_write_mxgraph_creates_file(tmp_path: pathlib.Path) -> None:
     # You may need to stub minimal implementations or mock the following methods
     # if they're not already functional
     generator._create_root = lambda: ET.Element("root")
-    generator._create_edges = lambda root: root
-    generator._create_erd_xml = lambda root: root
+    generator._create_edges = lambda root, layout: root
+    generator._create_erd_xml = lambda root, layout: root
     generator._add_title = lambda root: root
     generator._add_date = lambda root: root
 
@@ -469,3 +458,753 @@ def test_write_mxgraph_creates_file(tmp_path: pathlib.Path) -> None:
     root = tree.getroot()
     assert root.tag == "mxGraphModel"
     assert root.find("root") is not None
+
+
+def test_import_file_resolves_references_declared_before_tables(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    dsl_file_path = write_dsl_file(
+        tmp_path,
+        """
+REFERENCE FACT_SALES.CUSTOMER_ID -> DIM_CUSTOMER.CUSTOMER_ID [ERmany, ERone]
+
+TABLE FACT_SALES {
+    SALE_ID *
+    CUSTOMER_ID
+}
+
+TABLE DIM_CUSTOMER {
+    CUSTOMER_ID *
+}
+""",
+    )
+    generator = DrawioGenerator()
+
+    # Act
+    generator.import_file(dsl_file_path)
+
+    # Assert
+    check_table_content(
+        generator, "FACT_SALES", [("SALE_ID", "PK"), ("CUSTOMER_ID", "FK")]
+    )
+    check_table_content(generator, "DIM_CUSTOMER", [("CUSTOMER_ID", "PK")])
+
+
+def test_import_file_reports_every_unresolved_reference(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    dsl_file_path = write_dsl_file(
+        tmp_path,
+        """
+TABLE FACT_SALES {
+    SALE_ID *
+}
+REFERENCE FACT_SALES.MISSING -> FACT_SALES.SALE_ID
+REFERENCE UNKNOWN.ID -> FACT_SALES.SALE_ID
+""",
+    )
+    generator = DrawioGenerator()
+
+    # Act
+    with pytest.raises(ValueError) as excinfo:
+        generator.import_file(dsl_file_path)
+
+    # Assert
+    message = str(excinfo.value)
+    assert "2 unresolved reference(s)" in message
+    assert "line 5: Column 'MISSING'" in message
+    assert "line 6: Column 'ID' not found in table 'UNKNOWN" in message
+
+
+def test_import_file_merges_included_files(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    (tmp_path / "shared").mkdir()
+    (tmp_path / "shared" / "dims.dsl").write_text("""
+TITLE Ignored Title
+TABLE DIM_DATE {
+    DATE_ID *
+}
+ARRANGE DIM_DATE (5, 6)
+""")
+    dsl_file_path = write_dsl_file(
+        tmp_path,
+        """
+TITLE Sales
+INCLUDE shared/dims.dsl
+TABLE FACT_SALES {
+    SALE_ID *
+    DATE_ID
+}
+REFERENCE FACT_SALES.DATE_ID -> DIM_DATE.DATE_ID
+""",
+    )
+    generator = DrawioGenerator()
+
+    # Act
+    generator.import_file(dsl_file_path)
+
+    # Assert
+    assert list(generator.tables) == ["DIM_DATE", "FACT_SALES"]
+    check_table_content(generator, "FACT_SALES", [("SALE_ID", "PK"), ("DATE_ID", "FK")])
+    check_arrange_content(generator, "DIM_DATE", (5, 6))
+    assert generator.title == "Sales"
+
+
+def test_import_file_includes_each_file_once(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    (tmp_path / "dims.dsl").write_text("TABLE DIM_DATE {\n DATE_ID *\n}\n")
+    (tmp_path / "a.dsl").write_text("INCLUDE dims.dsl\n")
+    (tmp_path / "b.dsl").write_text("INCLUDE dims.dsl\n")
+    dsl_file_path = write_dsl_file(tmp_path, "INCLUDE a.dsl\nINCLUDE b.dsl\n")
+    generator = DrawioGenerator()
+
+    # Act
+    generator.import_file(dsl_file_path)
+
+    # Assert
+    check_table_content(generator, "DIM_DATE", [("DATE_ID", "PK")])
+
+
+def test_import_file_detects_include_cycles(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    (tmp_path / "a.dsl").write_text("INCLUDE test.dsl\n")
+    dsl_file_path = write_dsl_file(tmp_path, "INCLUDE a.dsl\n")
+    generator = DrawioGenerator()
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="INCLUDE cycle detected"):
+        generator.import_file(dsl_file_path)
+
+
+def test_import_file_reports_missing_include(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    dsl_file_path = write_dsl_file(tmp_path, "INCLUDE missing.dsl\n")
+    generator = DrawioGenerator()
+
+    # Act / Assert
+    with pytest.raises(ValueError, match="line 1: INCLUDE file not found"):
+        generator.import_file(dsl_file_path)
+
+
+def test_shared_parse_cache_parses_included_files_once(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    (tmp_path / "dims.dsl").write_text("TABLE DIM_DATE {\n DATE_ID *\n}\n")
+    first = tmp_path / "first.dsl"
+    second = tmp_path / "second.dsl"
+    first.write_text("INCLUDE dims.dsl\n")
+    second.write_text("INCLUDE dims.dsl\n")
+    cache = DslParseCache()
+
+    # Act
+    DrawioGenerator(parse_cache=cache).import_file(str(first))
+    DrawioGenerator(parse_cache=cache).import_file(str(second))
+
+    # Assert: first.dsl, second.dsl and dims.dsl parsed, dims.dsl reused once
+    assert cache.misses == 3
+    assert cache.hits == 1
+
+
+ROLE_PLAYING_DSL = """
+TABLE FACT_ORDERS {
+    ORDER_ID *
+    ORDER_DATE_ID
+    SHIP_DATE_ID
+}
+TABLE FACT_RETURNS {
+    RETURN_ID *
+    RETURN_DATE_ID
+}
+TABLE DIM_DATE {
+    DATE_ID *
+}
+REFERENCE FACT_ORDERS.ORDER_DATE_ID -> DIM_DATE.DATE_ID [ERmany, ERone]
+REFERENCE FACT_ORDERS.SHIP_DATE_ID -> DIM_DATE.DATE_ID [ERmany, ERone]
+REFERENCE FACT_RETURNS.RETURN_DATE_ID -> DIM_DATE.DATE_ID [ERmany, ERone]
+"""
+
+
+def test_create_edges_pair_aggregation_bundles_parallel_references(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    generator = DrawioGenerator(edge_aggregation="pair")
+    generator.import_file(write_dsl_file(tmp_path, ROLE_PLAYING_DSL))
+
+    # Act
+    edges = generator._create_edges(ET.Element("root")).findall("mxCell")
+
+    # Assert: one bundled table edge plus one plain row edge
+    assert len(edges) == 2
+    bundled, single = edges
+    assert bundled.attrib["source"] == "FACT_ORDERS"
+    assert bundled.attrib["target"] == "DIM_DATE"
+    assert bundled.attrib["value"] == (
+        "ORDER_DATE_ID → DATE_ID<br>SHIP_DATE_ID → DATE_ID"
+    )
+    assert "startArrow=ERmany" in bundled.attrib["style"]
+    assert single.attrib["source"] == "FACT_RETURNS-2"
+    assert single.attrib["target"] == "DIM_DATE-1"
+
+
+def test_create_edges_target_aggregation_fans_in_to_table_header(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    generator = DrawioGenerator(edge_aggregation="target")
+    generator.import_file(write_dsl_file(tmp_path, ROLE_PLAYING_DSL))
+
+    # Act
+    edges = generator._create_edges(ET.Element("root")).findall("mxCell")
+
+    # Assert
+    assert [edge.attrib["target"] for edge in edges] == ["DIM_DATE", "DIM_DATE"]
+    assert all("entryY=0;entryDy=15" in edge.attrib["style"] for edge in edges)
+    assert edges[1].attrib["value"] == "RETURN_DATE_ID → DATE_ID"
+
+
+def test_create_edges_rejects_unknown_aggregation(
+    mock_generator: DrawioGenerator,
+) -> None:
+    mock_generator.edge_aggregation = "everything"
+
+    with pytest.raises(ValueError, match="Invalid edge_aggregation"):
+        mock_generator._create_edges(ET.Element("root"))
+
+
+def test_write_mxgraph_compact_output_is_smaller_and_consistent(
+    mock_generator: DrawioGenerator, tmp_path: pathlib.Path
+) -> None:
+    # Arrange
+    mock_generator.output_dir = str(tmp_path)
+
+    # Act
+    mock_generator.write_mxgraph("full.drawio")
+    mock_generator.write_mxgraph("compact.drawio", compact=True)
+
+    # Assert
+    full = (tmp_path / "full.drawio").read_bytes()
+    compact = (tmp_path / "compact.drawio").read_bytes()
+    assert len(compact) < len(full)
+
+    cells = ET.fromstring(compact).findall("./root/mxCell")
+    assert len(cells) == len(ET.fromstring(full).findall("./root/mxCell"))
+    ids = {cell.attrib["id"] for cell in cells}
+    for cell in cells:
+        assert cell.attrib.get("value") != ""
+        for key in ("parent", "source", "target"):
+            if key in cell.attrib:
+                assert cell.attrib[key] in ids
+
+
+def wide_table_generator(policy: str = "summary") -> DrawioGenerator:
+    """Generator with a 40-column fact table referencing one dimension."""
+    generator = DrawioGenerator(wide_table_threshold=10, wide_table_policy=policy)
+    columns = [("SALE_ID", "PK"), ("CUSTOMER_ID", "FK")]
+    columns += [(f"MEASURE_{idx}", "") for idx in range(37)]
+    columns.append(("STORE_ID", ""))
+    generator.tables = {"FACT_SALES": columns, "DIM_STORE": [("STORE_ID", "PK")]}
+    generator.references = {
+        "FACT_SALES": [
+            {
+                "column_name": "STORE_ID",
+                "table_reference": "DIM_STORE",
+                "column_reference": "STORE_ID",
+                "start_arrow": "ERmany",
+                "end_arrow": "ERone",
+            }
+        ]
+    }
+    generator.positions = {}
+    generator.title = ""
+    generator.created_at_string = ""
+    return generator
+
+
+def test_wide_table_summary_keeps_key_and_referenced_rows() -> None:
+    # Arrange
+    generator = wide_table_generator()
+
+    # Act
+    root = generator._build_graph_model().find("root")
+
+    # Assert
+    assert root is not None
+    rows = [
+        cell.attrib["id"]
+        for cell in root.iter("mxCell")
+        if cell.attrib.get("parent") == "FACT_SALES"
+    ]
+    assert rows == ["FACT_SALES-1", "FACT_SALES-2", "FACT_SALES-40", "FACT_SALES-more"]
+    more = root.find("./mxCell[@id='FACT_SALES-col-more']")
+    assert more is not None and more.attrib["value"] == "+37 more"
+    edge = root.find("./mxCell[@edge='1']")
+    assert edge is not None and edge.attrib["source"] == "FACT_SALES-40"
+
+    table = root.find("./UserObject[@id='FACT_SALES']")
+    assert table is not None and table.attrib["label"] == "FACT_SALES"
+    lines = table.attrib["columns"].split("\n")
+    assert lines[:2] == ["SALE_ID *", "CUSTOMER_ID +"] and len(lines) == 40
+    assert table.find("mxCell/mxGeometry").attrib["height"] == "150"
+
+
+class CountingReferences(dict):
+    """References dict counting how often it is scanned as a whole."""
+
+    scans = 0
+
+    def items(self):  # type: ignore[override]
+        self.scans += 1
+        return super().items()
+
+    def values(self):  # type: ignore[override]
+        self.scans += 1
+        return super().values()
+
+
+def test_wide_tables_scan_references_once_per_render() -> None:
+    # Arrange
+    generator = DrawioGenerator(wide_table_threshold=10)
+    generator.tables = {
+        f"T{i}": [("ID", "PK")] + [(f"C{j}", "") for j in range(30)] for i in range(50)
+    }
+    references = CountingReferences(
+        {
+            f"T{i}": [
+                {
+                    "column_name": f"C{k}",
+                    "table_reference": f"T{(i * 7 + k) % 50}",
+                    "column_reference": "ID",
+                    "start_arrow": "",
+                    "end_arrow": "",
+                }
+                for k in range(5)
+            ]
+            for i in range(50)
+        }
+    )
+    generator.references = references
+
+    # Act
+    generator._build_graph_model()
+
+    # Assert: not once per edge endpoint or table
+    assert references.scans < 10
+
+
+def test_wide_table_collapsed_policy_collapses_container() -> None:
+    # Arrange
+    generator = wide_table_generator("collapsed")
+
+    # Act
+    root = generator._build_graph_model().find("root")
+
+    # Assert
+    assert root is not None
+    cell = root.find("./UserObject[@id='FACT_SALES']/mxCell")
+    assert cell is not None and cell.attrib["collapsed"] == "1"
+    assert root.find("./mxCell[@id='DIM_STORE']") is not None
+
+
+def test_wide_table_policy_rejects_unknown_policy() -> None:
+    generator = wide_table_generator("hidden")
+
+    with pytest.raises(ValueError, match="Invalid wide_table_policy"):
+        generator._build_graph_model()
+
+
+def test_wide_table_positions_are_read_back(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    generator = wide_table_generator()
+    generator.positions = {"FACT_SALES": (400, 300)}
+    generator.output_dir = str(tmp_path)
+    generator.write_mxgraph("wide.drawio", compact=True)
+    locator = DrawioTableLocator()
+    locator.output_dir = str(tmp_path)
+
+    # Act
+    locator.read_file("wide.drawio")
+
+    # Assert
+    assert locator.positions["FACT_SALES"] == (400, 300)
+
+
+def test_html_table_rendering_uses_one_cell_per_table(
+    mock_generator: DrawioGenerator,
+) -> None:
+    # Arrange
+    rows_cells = len(list(mock_generator._build_graph_model().iter("mxCell")))
+    mock_generator.table_rendering = "html"
+
+    # Act
+    root = mock_generator._build_graph_model().find("root")
+
+    # Assert
+    assert root is not None
+    assert len(list(root.iter("mxCell"))) < rows_cells / 2
+    table = root.find("./UserObject[@id='TEST_TABLE']")
+    assert table is not None and table.attrib["table"] == "TEST_TABLE"
+    label = table.attrib["label"]
+    assert "<b><u>COLUMN1</u></b>" in label and 'center;">FK</td>' in label
+    assert "background:#f0f0f0;" in label and "border-bottom:1px solid;" in label
+    assert root.find("./mxCell[@parent='TEST_TABLE']") is None
+
+
+def test_html_table_rendering_pins_edges_to_rows(
+    mock_generator: DrawioGenerator,
+) -> None:
+    # Arrange
+    mock_generator.table_rendering = "html"
+    layout = mock_generator._compute_layout()
+
+    # Act
+    edges = mock_generator._create_edges(ET.Element("root"), layout).findall("mxCell")
+
+    # Assert
+    source, target = edges[0].attrib["source"], edges[0].attrib["target"]
+    ref = mock_generator.references[source][0]
+    assert target == ref["table_reference"]
+    style = edges[0].attrib["style"]
+    _, _, _, height = layout[source]
+    row = mock_generator._display_row(source, ref["column_name"])
+    assert f"exitY={(30 * row + 15) / height:g};" in style
+    assert "exitPerimeter=0;" in style and "entryPerimeter=0;" in style
+
+
+def test_html_table_rendering_rejects_unknown_mode(
+    mock_generator: DrawioGenerator,
+) -> None:
+    mock_generator.table_rendering = "canvas"
+
+    with pytest.raises(ValueError, match="Invalid table_rendering"):
+        mock_generator._build_graph_model()
+
+
+def test_html_table_positions_are_read_back(
+    mock_generator: DrawioGenerator, tmp_path: pathlib.Path
+) -> None:
+    # Arrange
+    mock_generator.table_rendering = "html"
+    mock_generator.output_dir = str(tmp_path)
+    mock_generator.write_mxgraph("html.drawio")
+    locator = DrawioTableLocator()
+    locator.output_dir = str(tmp_path)
+
+    # Act
+    locator.read_file("html.drawio")
+
+    # Assert
+    assert set(mock_generator.tables) <= set(locator.positions)
+
+
+def test_create_edges_stores_anchors_from_table_geometry(
+    mock_generator: DrawioGenerator,
+) -> None:
+    # Arrange
+    layout = mock_generator._compute_layout()
+
+    # Act
+    edges = mock_generator._create_edges(ET.Element("root"), layout).findall("mxCell")
+
+    # Assert: TEST_TABLE.COLUMN1 at (10, 10) -> TEST_TABLE2.COLUMN5 to its right
+    geometry = edges[0].find("mxGeometry")
+    assert geometry is not None
+    source = geometry.find("mxPoint[@as='sourcePoint']")
+    target = geometry.find("mxPoint[@as='targetPoint']")
+    assert source is not None and target is not None
+    x, y, width, _ = layout["TEST_TABLE"]
+    assert (source.attrib["x"], source.attrib["y"]) == (str(x + width), str(y + 45))
+    tx, ty, _, _ = layout["TEST_TABLE2"]
+    assert (target.attrib["x"], target.attrib["y"]) == (str(tx), str(ty + 75))
+    assert geometry.find("Array") is None
+
+
+def test_create_edges_with_waypoints_stores_routed_edges(
+    mock_generator: DrawioGenerator,
+) -> None:
+    # Arrange
+    mock_generator.edge_waypoints = True
+
+    # Act
+    edges = mock_generator._create_edges(ET.Element("root")).findall("mxCell")
+
+    # Assert
+    style = edges[0].attrib["style"]
+    assert "edgeStyle=orthogonalEdgeStyle;" in style
+    assert "exitX=1;exitY=0.5;" in style and "entryX=0;entryY=0.5;" in style
+    geometry = edges[0].find("mxGeometry")
+    assert geometry is not None
+    source = geometry.find("mxPoint[@as='sourcePoint']")
+    assert source is not None
+    bends = geometry.findall("Array[@as='points']/mxPoint")
+    assert len(bends) == 2
+    assert bends[0].attrib["y"] == source.attrib["y"]
+    assert bends[0].attrib["x"] == bends[1].attrib["x"]
+
+
+def test_create_edges_target_aggregation_anchors_at_header(
+    mock_generator: DrawioGenerator,
+) -> None:
+    # Arrange
+    mock_generator.edge_aggregation = "target"
+    layout = mock_generator._compute_layout()
+
+    # Act
+    edges = mock_generator._create_edges(ET.Element("root"), layout).findall("mxCell")
+
+    # Assert
+    target = edges[0].find("mxGeometry/mxPoint[@as='targetPoint']")
+    assert target is not None
+    tx, ty, _, _ = layout[edges[0].attrib["target"]]
+    assert (target.attrib["x"], target.attrib["y"]) == (str(tx), str(ty + 15))
+
+
+def test_overlapping_tables_are_reported(
+    mock_generator: DrawioGenerator, caplog: pytest.LogCaptureFixture
+) -> None:
+    # Arrange
+    mock_generator.positions["TEST_TABLE2"] = (50, 40)
+
+    # Act
+    mock_generator._create_erd_xml(ET.Element("root"))
+
+    # Assert
+    assert "Tables TEST_TABLE and TEST_TABLE2 overlap" in caplog.text
+
+
+def test_nudge_overlaps_moves_tables_apart(
+    mock_generator: DrawioGenerator, caplog: pytest.LogCaptureFixture
+) -> None:
+    # Arrange
+    mock_generator.positions["TEST_TABLE2"] = (50, 40)
+    mock_generator.nudge_overlaps = True
+
+    # Act
+    with caplog.at_level("INFO"):
+        layout = mock_generator._compute_layout()
+        mock_generator._create_erd_xml(ET.Element("root"), layout)
+
+    # Assert
+    assert layout["TEST_TABLE"][:2] == (10, 10)
+    assert layout["TEST_TABLE2"][:2] != (50, 40)
+    assert "Tables TEST_TABLE and TEST_TABLE2 overlap" not in caplog.text
+    assert "Moved TEST_TABLE2 from (50, 40)" in caplog.text
+
+
+@pytest.mark.parametrize("nudge_overlaps", [False, True])
+def test_schema_tables_are_not_reported_moved_unless_nudged(
+    caplog: pytest.LogCaptureFixture, nudge_overlaps: bool
+) -> None:
+    # Arrange
+    generator = DrawioGenerator(nudge_overlaps=nudge_overlaps)
+    generator.tables = {"sales.orders": [("ORDER_ID", "PK")]}
+    generator.references = {}
+    generator.positions = {"sales.orders": (500, 500)}
+
+    # Act
+    with caplog.at_level("INFO"):
+        generator.mxgraph_bytes()
+
+    # Assert
+    assert "Moved" not in caplog.text
+
+
+@pytest.mark.parametrize("serializer", ["etree", "template"])
+def test_render_computes_layout_once(
+    mock_generator: DrawioGenerator, serializer: str
+) -> None:
+    # Arrange
+    mock_generator.positions["TEST_TABLE2"] = (50, 40)
+    mock_generator.nudge_overlaps = True
+    mock_generator.serializer = serializer
+
+    # Act
+    with patch(
+        "drawio_tools.drawio_generator.resolve_overlaps",
+        wraps=drawio_generator.resolve_overlaps,
+    ) as resolve:
+        with patch.object(
+            DrawioGenerator,
+            "_compute_layout",
+            autospec=True,
+            side_effect=DrawioGenerator._compute_layout,
+        ) as compute:
+            mock_generator.mxgraph_bytes()
+
+    # Assert
+    assert compute.call_count == 1
+    assert resolve.call_count == 1
+
+
+def test_write_mxgraph_reuses_unchanged_output(
+    mock_generator: DrawioGenerator, tmp_path: pathlib.Path
+) -> None:
+    # Arrange
+    mock_generator.output_dir = str(tmp_path / "out")
+
+    # Act
+    first = mock_generator.write_mxgraph("model.drawio")
+    second = mock_generator.write_mxgraph("model.drawio")
+    mock_generator.title = "Renamed"
+    third = mock_generator.write_mxgraph("model.drawio")
+
+    # Assert
+    assert (first, second, third) == (True, False, True)
+
+
+def test_edge_ids_are_stable_and_unique(mock_generator: DrawioGenerator) -> None:
+    # Arrange
+    ref = mock_generator.references["TEST_TABLE"][0]
+    mock_generator.references["TEST_TABLE"].append(dict(ref))
+
+    # Act
+    first = mock_generator._create_edges(ET.Element("root")).findall("mxCell")
+    second = mock_generator._create_edges(ET.Element("root")).findall("mxCell")
+
+    # Assert
+    ids = [edge.attrib["id"] for edge in first]
+    assert ids == [edge.attrib["id"] for edge in second]
+    assert ids[:2] == [
+        "edge-TEST_TABLE-1-TEST_TABLE2-2",
+        "edge-TEST_TABLE-2-TEST_TABLE3-1",
+    ]
+    assert "edge-TEST_TABLE-1-TEST_TABLE2-2-2" in ids
+
+
+def test_style_rules_override_table_and_column_styles(
+    mock_generator: DrawioGenerator,
+) -> None:
+    # Arrange
+    mock_generator.style_rules = StyleRules.from_dict(
+        {
+            "tables": [{"suffix": "2", "style": {"fillColor": "#C5E1A5"}}],
+            "columns": [{"prefix": "COLUMN5", "style": {"fontColor": "#999999"}}],
+        }
+    )
+    mock_generator.table_fill_overrides["TEST_TABLE3"] = "#FF0000"
+
+    # Act
+    root = mock_generator._build_graph_model().find("root")
+
+    # Assert
+    assert root is not None
+    styles = {cell.get("id"): cell.get("style", "") for cell in root.iter("mxCell")}
+    assert "fillColor=#C5E1A5;" in styles["TEST_TABLE2"]
+    assert "fillColor=#9CD6EF;" in styles["TEST_TABLE"]
+    assert "fillColor=#FF0000;" in styles["TEST_TABLE3"]
+    assert styles["TEST_TABLE2-col-2"].endswith("fontColor=#999999;")
+    assert "fontColor" not in styles["TEST_TABLE2-col-1"]
+
+
+SCHEMA_DSL_CONTENT = """
+TABLE DIM_DATE {
+    DATE_ID *
+}
+TABLE sales.orders {
+    ORDER_ID *
+    CUSTOMER_ID
+    DATE_ID
+}
+TABLE sales.returns {
+    RETURN_ID *
+    ORDER_ID
+}
+TABLE crm.customer {
+    CUSTOMER_ID *
+}
+REFERENCE sales.orders.CUSTOMER_ID -> crm.customer.CUSTOMER_ID [ERmany, ERone]
+REFERENCE sales.orders.DATE_ID -> DIM_DATE.DATE_ID
+REFERENCE sales.returns.ORDER_ID -> sales.orders.ORDER_ID
+ARRANGE crm (900, 400)
+"""
+
+
+def test_schema_qualified_tables_are_parsed(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    generator = DrawioGenerator()
+
+    # Act
+    generator.import_file(write_dsl_file(tmp_path, SCHEMA_DSL_CONTENT))
+
+    # Assert
+    assert list(generator.tables) == [
+        "DIM_DATE",
+        "sales.orders",
+        "sales.returns",
+        "crm.customer",
+    ]
+    assert generator.references["sales.orders"][0]["table_reference"] == (
+        "crm.customer"
+    )
+    assert generator.tables["sales.orders"][1] == ("CUSTOMER_ID", "FK")
+    assert generator.positions == {"crm": (900, 400)}
+
+
+def test_schemas_are_rendered_as_containers(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    generator = DrawioGenerator()
+    generator.import_file(write_dsl_file(tmp_path, SCHEMA_DSL_CONTENT))
+
+    # Act
+    root = generator._build_graph_model().find("root")
+
+    # Assert
+    assert root is not None
+    cells = {cell.get("id"): cell for cell in root.iter("mxCell")}
+    assert cells["schema-sales"].get("style", "").startswith("shape=swimlane;")
+    assert cells["sales.orders"].get("parent") == "schema-sales"
+    assert cells["DIM_DATE"].get("parent") == "1"
+    orders_geometry = cells["sales.orders"].find("mxGeometry")
+    assert orders_geometry is not None
+    assert (orders_geometry.get("x"), orders_geometry.get("y")) == ("20", "50")
+    crm_geometry = cells["schema-crm"].find("mxGeometry")
+    assert crm_geometry is not None
+    assert (crm_geometry.get("x"), crm_geometry.get("y")) == ("900", "400")
+    edge = cells["edge-sales.orders-2-crm.customer-1"]
+    assert edge.get("parent") == "1"
+
+
+def test_schema_positions_are_read_back(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    generator = DrawioGenerator()
+    generator.output_dir = str(tmp_path)
+    generator.import_file(write_dsl_file(tmp_path, SCHEMA_DSL_CONTENT))
+    generator.write_mxgraph("schemas.drawio")
+    locator = DrawioTableLocator()
+    locator.output_dir = str(tmp_path)
+
+    # Act
+    locator.read_file("schemas.drawio")
+
+    # Assert
+    assert locator.positions["crm"] == (900, 400)
+    assert locator.positions["crm.customer"] == (20, 50)
+    assert locator.positions["sales.returns"][1] == 50
+
+
+def test_schema_containers_do_not_overlap(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    content = "TABLE TOP {\n ID *\n}\n"
+    for schema in range(6):
+        for table in range(schema + 1):
+            columns = " COL\n" * table
+            content += f"TABLE s{schema}.t{table} {{\n ID *\n{columns}}}\n"
+    generator = DrawioGenerator()
+    generator.import_file(write_dsl_file(tmp_path, content))
+
+    # Act
+    layout = generator._compute_layout()
+    schema_boxes = generator._schema_boxes(layout)
+
+    # Assert
+    assert len(schema_boxes) == 6
+    assert find_overlaps({**schema_boxes, "TOP": layout["TOP"]}) == []
+    for table_name, (x, y, width, height) in layout.items():
+        schema = generator._schema_of(table_name)
+        if schema is not None:
+            sx, sy, sw, sh = schema_boxes[schema]
+            assert sx < x and x + width < sx + sw
+            assert sy + 30 < y and y + height < sy + sh
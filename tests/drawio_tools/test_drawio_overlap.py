@@ -0,0 +1,97 @@
+import random
+import time
+
+from drawio_tools.drawio_overlap import (
+    SpatialGrid,
+    find_overlaps,
+    resolve_overlaps,
+)
+
+
+def test_spatial_grid_query_returns_only_intersecting_boxes() -> None:
+    # Arrange
+    grid = SpatialGrid(cell_size=100)
+    grid.insert("A", (0, 0, 150, 90))
+    grid.insert("B", (150, 0, 100, 90))
+    grid.insert("C", (1000, 1000, 100, 100))
+
+    # Act
+    hits = grid.query((100, 50, 100, 100))
+
+    # Assert
+    assert sorted(hits) == ["A", "B"]
+    assert grid.query((0, 90, 150, 10)) == []
+    assert grid.query((0, 95, 100, 10), margin=10) == ["A"]
+
+
+def test_find_overlaps_reports_each_pair_once_in_layout_order() -> None:
+    # Arrange
+    boxes = {
+        "FACT_SALES": (0, 0, 200, 300),
+        "DIM_DATE": (100, 200, 170, 90),
+        "DIM_STORE": (200, 0, 170, 60),  # touches FACT_SALES only
+        "DIM_CUSTOMER": (150, 250, 170, 90),
+    }
+
+    # Act
+    overlaps = find_overlaps(boxes, cell_size=64)
+
+    # Assert
+    assert overlaps == [
+        ("FACT_SALES", "DIM_DATE"),
+        ("FACT_SALES", "DIM_CUSTOMER"),
+        ("DIM_DATE", "DIM_CUSTOMER"),
+    ]
+
+
+def test_resolve_overlaps_moves_later_box_by_shortest_step() -> None:
+    # Arrange
+    boxes = {"A": (0, 0, 200, 300), "B": (180, 100, 170, 90)}
+
+    # Act
+    resolved = resolve_overlaps(boxes, margin=10)
+
+    # Assert
+    assert resolved["A"] == (0, 0, 200, 300)
+    assert resolved["B"] == (210, 100, 170, 90)
+
+
+def test_resolve_overlaps_clears_dense_random_layouts() -> None:
+    # Arrange
+    rng = random.Random(7)
+    boxes = {
+        f"T{index}": (rng.randrange(0, 4000), rng.randrange(0, 4000), 170, 120)
+        for index in range(300)
+    }
+
+    # Act
+    resolved = resolve_overlaps(boxes)
+
+    # Assert
+    assert find_overlaps(resolved) == []
+    assert list(resolved) == list(boxes)
+    untouched = [name for name in boxes if resolved[name] == boxes[name]]
+    assert len(untouched) > len(boxes) // 3
+
+
+def test_resolve_overlaps_clears_grown_grids_without_cascading() -> None:
+    # Arrange: ARRANGE'd grid whose tables grew into the row below
+    rng = random.Random(3)
+    boxes = {
+        f"T{i}_{j}": (i * 220, j * 320, 200, rng.choice([300] * 6 + [600, 900]))
+        for i in range(30)
+        for j in range(30)
+    }
+    overlaps = find_overlaps(boxes)
+
+    # Act
+    start = time.perf_counter()
+    resolved = resolve_overlaps(boxes)
+    elapsed = time.perf_counter() - start
+
+    # Assert
+    assert find_overlaps(resolved) == []
+    moved = [name for name in boxes if resolved[name] != boxes[name]]
+    # Only the later table of an overlapping pair ever moves.
+    assert len(moved) <= len({second for _, second in overlaps})
+    assert elapsed < 5
@@ -0,0 +1,177 @@
+import io
+import pathlib
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from drawio_tools.drawio_generator import DrawioGenerator
+from drawio_tools.drawio_render import ErdModel, RenderOptions
+from drawio_tools.drawio_table_locator import DrawioTableLocator
+
+DSL_CONTENT = """
+TITLE Sales
+TABLE FACT_SALES {
+    SALE_ID *
+    CUSTOMER_ID
+}
+TABLE DIM_CUSTOMER {
+    CUSTOMER_ID *
+}
+REFERENCE FACT_SALES.CUSTOMER_ID -> DIM_CUSTOMER.CUSTOMER_ID
+ARRANGE DIM_CUSTOMER (400, 120)
+"""
+
+
+def make_model(table_count: int) -> ErdModel:
+    """Builds a chain of tables each referencing the next one."""
+    tables = {
+        f"T{index}": [("ID", "PK"), ("NEXT_ID", "")] for index in range(table_count)
+    }
+    references = {
+        f"T{index}": [
+            {
+                "column_name": "NEXT_ID",
+                "table_reference": f"T{index + 1}",
+                "column_reference": "ID",
+                "start_arrow": "",
+                "end_arrow": "",
+            }
+        ]
+        for index in range(table_count - 1)
+    }
+    return ErdModel(tables, references)
+
+
+def to_xml(graph_model: ET.Element) -> bytes:
+    """Serializes a graph model with edge ids blanked, as they are random."""
+    for cell in graph_model.iter("mxCell"):
+        if cell.attrib.get("edge") == "1":
+            cell.attrib["id"] = ""
+    return ET.tostring(graph_model)
+
+
+def test_parse_returns_frozen_model_without_touching_generator(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    dsl_file = tmp_path / "sales.dsl"
+    dsl_file.write_text(DSL_CONTENT)
+    generator = DrawioGenerator()
+
+    # Act
+    model = generator.parse(str(dsl_file))
+
+    # Assert
+    assert generator.tables == {}
+    assert model.title == "Sales"
+    assert model.positions["DIM_CUSTOMER"] == (400, 120)
+    assert model.tables["FACT_SALES"] == (("SALE_ID", "PK"), ("CUSTOMER_ID", "FK"))
+    with pytest.raises(TypeError):
+        model.tables["NEW"] = ()  # type: ignore[index]
+    with pytest.raises(TypeError):
+        model.references["FACT_SALES"][0]["column_name"] = "X"  # type: ignore[index]
+
+
+def test_render_leaves_generator_unchanged() -> None:
+    # Arrange
+    generator = DrawioGenerator()
+    options = RenderOptions(edge_aggregation="pair", collapsed_tables=frozenset({"T0"}))
+
+    # Act
+    result = generator.render(make_model(3), options)
+
+    # Assert
+    assert generator.tables == {} and generator.edge_aggregation == "none"
+    assert dict(generator.table_sizes) == {}
+    assert set(result.layout) == set(result.table_sizes) == {"T0", "T1", "T2"}
+    cell = result.graph_model.find("./root/mxCell[@id='T0']")
+    assert cell is not None and cell.attrib["collapsed"] == "1"
+
+
+def test_one_generator_renders_concurrently_like_sequentially() -> None:
+    # Arrange
+    generator = DrawioGenerator()
+    models = [make_model(count) for count in range(2, 12)]
+    options = RenderOptions(edge_waypoints=True)
+    expected = [
+        to_xml(generator.render(model, options).graph_model) for model in models
+    ]
+
+    # Act
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(
+            executor.map(lambda model: generator.render(model, options), models * 4)
+        )
+
+    # Assert
+    assert [to_xml(result.graph_model) for result in results] == expected * 4
+
+
+def test_write_mxgraph_does_not_leak_table_sizes_between_models(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    generator = DrawioGenerator()
+    generator.output_dir = str(tmp_path)
+    generator.tables = {"OLD": [("ID", "PK")]}
+    generator.write_mxgraph("old.drawio")
+
+    # Act
+    generator.tables = {"NEW": [("ID", "PK")]}
+    generator.write_mxgraph("new.drawio")
+
+    # Assert
+    assert set(generator.table_sizes) == {"NEW"}
+
+
+def test_render_result_serializes_to_bytes_string_and_stream() -> None:
+    # Arrange
+    result = DrawioGenerator().render(make_model(3))
+    stream = io.BytesIO()
+
+    # Act
+    full = result.to_bytes()
+    compact = result.to_bytes(compact=True)
+    result.write_to(stream)
+
+    # Assert
+    assert full.startswith(b"<?xml version='1.0' encoding='utf-8'?>")
+    assert stream.getvalue() == full == result.to_string().encode("utf-8")
+    assert len(compact) < len(full)
+    # Compacting works on a copy, so the result can be serialized again.
+    assert result.to_bytes() == full
+
+
+def test_mxgraph_bytes_match_written_file(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    dsl_file = tmp_path / "sales.dsl"
+    dsl_file.write_text(DSL_CONTENT)
+    generator = DrawioGenerator(edge_waypoints=True)
+    generator.output_dir = str(tmp_path)
+    generator.import_file(str(dsl_file))
+
+    # Act
+    generator.write_mxgraph("sales.drawio", compact=True)
+    data = generator.mxgraph_bytes(compact=True)
+
+    # Assert
+    assert data == (tmp_path / "sales.drawio").read_bytes()
+    assert generator.mxgraph_string() == generator.mxgraph_bytes().decode("utf-8")
+
+
+def test_table_locator_reads_bytes_and_streams() -> None:
+    # Arrange
+    generator = DrawioGenerator()
+    generator.tables = {"DIM_DATE": [("DATE_ID", "PK")]}
+    generator.positions = {"DIM_DATE": (40, 80)}
+    data = generator.mxgraph_bytes()
+    from_bytes = DrawioTableLocator()
+    from_stream = DrawioTableLocator()
+
+    # Act
+    from_bytes.read_bytes(data)
+    from_stream.read_stream(io.BytesIO(data))
+
+    # Assert
+    assert from_bytes.positions == from_stream.positions == {"DIM_DATE": (40, 80)}
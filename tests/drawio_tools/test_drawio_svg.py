@@ -0,0 +1,112 @@
+import pathlib
+import xml.etree.ElementTree as ET
+
+import pytest
+
+from drawio_tools.drawio_generator import DrawioGenerator
+from drawio_tools.drawio_svg import render_svg
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+DSL_CONTENT = """
+TITLE Sales & Returns
+CREATEDAT 2024-01-01
+TABLE FACT_SALES {
+    SALE_ID *
+    CUSTOMER_ID
+}
+TABLE DIM_CUSTOMER {
+    CUSTOMER_ID *
+    NAME
+}
+REFERENCE FACT_SALES.CUSTOMER_ID -> DIM_CUSTOMER.CUSTOMER_ID [ERmany, ERone]
+ARRANGE DIM_CUSTOMER (400, 100)
+"""
+
+
+@pytest.fixture
+def generator(tmp_path: pathlib.Path) -> DrawioGenerator:
+    dsl_file = tmp_path / "test.dsl"
+    dsl_file.write_text(DSL_CONTENT)
+    generator = DrawioGenerator()
+    generator.output_dir = str(tmp_path)
+    generator.import_file(str(dsl_file))
+    return generator
+
+
+def test_render_svg_draws_tables_rows_and_edges(generator: DrawioGenerator) -> None:
+    # Act
+    svg = ET.fromstring(render_svg(generator))
+
+    # Assert
+    texts = [text.text for text in svg.iter(f"{SVG_NS}text")]
+    assert "FACT_SALES" in texts
+    assert "CUSTOMER_ID" in texts
+    assert "Sales & Returns" in texts
+    table_fills = [
+        rect.attrib["fill"]
+        for rect in svg.iter(f"{SVG_NS}rect")
+        if rect.attrib.get("rx") == "6" and rect.attrib["fill"] != "none"
+    ]
+    assert table_fills == ["#F4AC9F", "#9CD6EF"]
+
+    (edge,) = list(svg.iter(f"{SVG_NS}polyline"))
+    # FACT_SALES sits at x=1 with width 170: leaves its right side on row 2
+    # and enters DIM_CUSTOMER's left side on row 1.
+    points = edge.attrib["points"].split()
+    assert points[0] == "171,175"
+    assert points[-1] == "400,145"
+    assert len(points) == 4
+    assert edge.attrib["marker-start"] == "url(#ERmany)"
+
+
+def test_render_svg_straight_edges(generator: DrawioGenerator) -> None:
+    svg = ET.fromstring(render_svg(generator, edge_style="straight"))
+
+    (edge,) = list(svg.iter(f"{SVG_NS}polyline"))
+    assert edge.attrib["points"] == "171,175 400,145"
+
+
+def test_render_svg_rejects_unknown_edge_style(generator: DrawioGenerator) -> None:
+    with pytest.raises(ValueError, match="Invalid edge_style"):
+        render_svg(generator, edge_style="curved")
+
+
+def test_write_svg_creates_file(
+    generator: DrawioGenerator, tmp_path: pathlib.Path
+) -> None:
+    generator.write_svg("preview.svg")
+
+    root = ET.parse(tmp_path / "preview.svg").getroot()
+    assert root.tag == f"{SVG_NS}svg"
+
+
+def test_render_svg_summarizes_wide_tables(generator: DrawioGenerator) -> None:
+    # Arrange
+    generator.wide_table_threshold = 1
+
+    # Act
+    svg = ET.fromstring(render_svg(generator, edge_style="straight"))
+
+    # Assert
+    texts = [text.text for text in svg.iter(f"{SVG_NS}text")]
+    assert "NAME" not in texts
+    assert "+1 more" in texts
+    edge = next(svg.iter(f"{SVG_NS}polyline"))
+    # CUSTOMER_ID is referenced, so it keeps its own row.
+    assert edge.attrib["points"].endswith(",145")
+
+
+def test_render_svg_draws_schema_containers(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    dsl_file = tmp_path / "schemas.dsl"
+    dsl_file.write_text("TABLE sales.orders {\n ORDER_ID *\n}\n")
+    generator = DrawioGenerator()
+    generator.import_file(str(dsl_file))
+
+    # Act
+    svg = ET.fromstring(render_svg(generator))
+
+    # Assert
+    texts = [text.text for text in svg.iter(f"{SVG_NS}text")]
+    assert texts[:2] == ["sales", "sales.orders"]
@@ -0,0 +1,115 @@
+import xml.etree.ElementTree as ET
+from typing import Any
+
+import pytest
+
+from drawio_tools.drawio_generator import DrawioGenerator
+from drawio_tools.drawio_templates import TemplateRoot, escape_attribute
+from drawio_tools.style_rules import StyleRules
+
+
+def build_generator(**kwargs: Any) -> DrawioGenerator:
+    """Helper to create a generator exercising every kind of cell."""
+    generator = DrawioGenerator(**kwargs)
+    generator.tables = {
+        "FACT_SALES": [("SALE_ID", "PK"), ("CUSTOMER_ID", "FK")]
+        + [(f"AMOUNT_{i}", "") for i in range(6)],
+        "DIM_CUSTOMER": [("CUSTOMER_ID", "PK"), ("NAME", "")],
+        "sales.orders": [("ORDER_ID", "PK"), ("CUSTOMER_ID", "FK")],
+    }
+    generator.references = {
+        "FACT_SALES": [
+            {
+                "column_name": "CUSTOMER_ID",
+                "table_reference": "DIM_CUSTOMER",
+                "column_reference": "CUSTOMER_ID",
+                "start_arrow": "ERmany",
+                "end_arrow": "ERone",
+            }
+        ],
+        "sales.orders": [
+            {
+                "column_name": "CUSTOMER_ID",
+                "table_reference": "DIM_CUSTOMER",
+                "column_reference": "CUSTOMER_ID",
+                "start_arrow": "",
+                "end_arrow": "",
+            }
+        ],
+    }
+    # Characters ElementTree escapes inside attributes
+    generator.title = 'Sales & "Co" <ERD>\n\tv1 \r é'
+    generator.created_at_string = "2024-01-01"
+    generator.collapsed_tables = {"DIM_CUSTOMER"}
+    return generator
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"table_rendering": "html"},
+        {"wide_table_threshold": 4},
+        {"wide_table_threshold": 4, "wide_table_policy": "collapsed"},
+        {"edge_aggregation": "pair"},
+        {"edge_aggregation": "target", "edge_waypoints": True},
+        {
+            "style_rules": StyleRules(
+                columns=[("prefix", "AMOUNT_", {"fontColor": "#A&B"})]
+            )
+        },
+    ],
+)
+def test_template_output_matches_element_tree(options: dict) -> None:
+    # Act
+    expected = build_generator(**options).mxgraph_bytes()
+    actual = build_generator(serializer="template", **options).mxgraph_bytes()
+
+    # Assert
+    assert actual == expected
+    assert ET.fromstring(actual).find("root") is not None
+
+
+def test_template_serializer_keeps_table_sizes_and_compact_output() -> None:
+    # Arrange
+    etree = build_generator()
+    template = build_generator(serializer="template")
+
+    # Act
+    etree.mxgraph_bytes()
+    template.mxgraph_bytes()
+
+    # Assert
+    assert template.table_sizes == etree.table_sizes
+    # Compact output needs the tree, so both serializers agree on it too.
+    assert build_generator(serializer="template").mxgraph_bytes(
+        compact=True
+    ) == build_generator().mxgraph_bytes(compact=True)
+
+
+def test_escape_attribute_matches_element_tree() -> None:
+    # Arrange
+    value = 'a & b < c > d "e"\r\n\tf'
+    element = ET.Element("mxCell", value=value)
+
+    # Act
+    escaped = escape_attribute(value)
+
+    # Assert
+    assert ET.tostring(element, encoding="unicode") == f'<mxCell value="{escaped}" />'
+
+
+def test_empty_template_root_is_valid_document() -> None:
+    # Act
+    data = TemplateRoot().to_bytes({"grid": "0"})
+
+    # Assert
+    root = ET.fromstring(data).find("root")
+    assert data.startswith(b"<?xml version='1.0' encoding='utf-8'?>\n")
+    assert root is not None and len(root) == 2
+
+
+def test_invalid_serializer() -> None:
+    # Act / Assert
+    with pytest.raises(ValueError):
+        DrawioGenerator(serializer="lxml").mxgraph_bytes()
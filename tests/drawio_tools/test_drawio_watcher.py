@@ -0,0 +1,227 @@
+import os
+import pathlib
+import threading
+from typing import Callable, List, Optional
+
+import pytest
+
+from drawio_tools.drawio_generator import RenderCancelled
+from drawio_tools.drawio_watcher import (
+    RegenerationScheduler,
+    output_path_for,
+    regenerate,
+)
+from drawio_tools.dsl_parse_cache import DslParseCache
+
+
+def test_output_path_for_maps_each_model_to_its_own_output() -> None:
+    assert output_path_for("input/orders.dsl") == os.path.join(
+        "output", "orders.drawio"
+    )
+    assert output_path_for("input/sales/returns.dsl") == os.path.join(
+        "output", "sales", "returns.drawio"
+    )
+
+
+def test_regenerate_writes_mapped_output(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    input_path = tmp_path / "orders.dsl"
+    input_path.write_text("TABLE ORDERS {\n ORDER_ID *\n}\n")
+    output_path = tmp_path / "out" / "orders.drawio"
+
+    # Act
+    regenerate(str(input_path), str(output_path))
+
+    # Assert
+    assert output_path.exists()
+
+
+class BlockingRegenerate:
+    """Fake regeneration recording calls and blocking until released.
+
+    Like the real one, it stops with RenderCancelled once its run is stale.
+    """
+
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+        self.completed: List[str] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(
+        self,
+        input_path: str,
+        output_path: str,
+        cache: Optional[DslParseCache],
+        should_cancel: Callable[[], bool],
+    ) -> None:
+        with self._lock:
+            self.calls.append(output_path)
+        self.started.set()
+        assert self.release.wait(5)
+        if should_cancel():
+            raise RenderCancelled()
+        with self._lock:
+            self.completed.append(output_path)
+
+
+def test_scheduler_coalesces_changes_to_a_busy_file() -> None:
+    # Arrange
+    fake = BlockingRegenerate()
+    scheduler = RegenerationScheduler(max_workers=2, regenerate=fake)
+
+    # Act
+    scheduler.submit("input/orders.dsl")
+    assert fake.started.wait(5)
+    scheduler.submit("input/orders.dsl")
+    scheduler.submit("input/orders.dsl")
+    fake.release.set()
+    scheduler.shutdown()
+
+    # Assert: the running job plus one follow-up for both later saves
+    assert fake.calls == [os.path.join("output", "orders.drawio")] * 2
+
+
+def test_scheduler_cancels_stale_run_and_finishes_latest() -> None:
+    # Arrange
+    fake = BlockingRegenerate()
+    scheduler = RegenerationScheduler(max_workers=1, regenerate=fake)
+
+    # Act
+    scheduler.submit("input/orders.dsl")
+    assert fake.started.wait(5)
+    scheduler.submit("input/orders.dsl")
+    fake.release.set()
+    scheduler.shutdown()
+
+    # Assert: only the run started from the newest save completed
+    assert len(fake.calls) == 2
+    assert fake.completed == [os.path.join("output", "orders.drawio")]
+    assert scheduler.cancelled == 1
+
+
+def test_regenerate_stops_before_writing_when_cancelled(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    input_path = tmp_path / "orders.dsl"
+    input_path.write_text("TABLE ORDERS {\n ORDER_ID *\n}\n")
+    output_path = tmp_path / "orders.drawio"
+
+    # Act / Assert
+    with pytest.raises(RenderCancelled, match="after parse"):
+        regenerate(str(input_path), str(output_path), should_cancel=lambda: True)
+    assert not output_path.exists()
+
+
+def test_scheduler_regenerates_different_files_concurrently() -> None:
+    # Arrange
+    barrier = threading.Barrier(2, timeout=5)
+    outputs: List[str] = []
+
+    def fake(
+        input_path: str, output_path: str, cache: DslParseCache, *args: object
+    ) -> None:
+        barrier.wait()
+        outputs.append(output_path)
+
+    scheduler = RegenerationScheduler(max_workers=2, regenerate=fake)
+
+    # Act
+    scheduler.submit("input/orders.dsl")
+    scheduler.submit("input/customers.dsl")
+    scheduler.shutdown()
+
+    # Assert: both jobs reached the barrier together
+    assert sorted(outputs) == [
+        os.path.join("output", "customers.drawio"),
+        os.path.join("output", "orders.drawio"),
+    ]
+
+
+def test_scheduler_keeps_running_after_a_failed_job() -> None:
+    # Arrange
+    calls: List[str] = []
+
+    def fake(
+        input_path: str, output_path: str, cache: DslParseCache, *args: object
+    ) -> None:
+        calls.append(input_path)
+        if len(calls) == 1:
+            raise ValueError("broken model")
+
+    scheduler = RegenerationScheduler(max_workers=1, regenerate=fake)
+
+    # Act
+    scheduler.submit("input/broken.dsl")
+    scheduler.wait()
+    scheduler.submit("input/broken.dsl")
+    scheduler.shutdown()
+
+    # Assert
+    assert len(calls) == 2
+
+
+def test_scheduler_regenerates_models_including_a_changed_file(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    input_dir = tmp_path / "input"
+    (input_dir / "shared").mkdir(parents=True)
+    dims = input_dir / "shared" / "dims.dsl"
+    dims.write_text("TABLE DIM_CUSTOMER {\n CUSTOMER_ID *\n}\n")
+    (input_dir / "sales.dsl").write_text(
+        "INCLUDE shared/../shared/dims.dsl\nTABLE FACT_SALES {\n SALE_ID *\n}\n"
+    )
+    (input_dir / "report.dsl").write_text("INCLUDE sales.dsl\n")
+    output_dir = tmp_path / "output"
+    scheduler = RegenerationScheduler(
+        max_workers=2, input_dir=str(input_dir), output_dir=str(output_dir)
+    )
+    for name in ["sales.dsl", "report.dsl"]:
+        scheduler.submit(str(input_dir / name))
+    scheduler.wait()
+
+    # Act
+    dims.write_text(
+        "TABLE DIM_CUSTOMER {\n CUSTOMER_ID *\n}\nTABLE DIM_DATE {\n DATE_ID *\n}\n"
+    )
+    scheduler.submit(str(dims))
+    scheduler.shutdown()
+
+    # Assert
+    for name in ["sales.drawio", "report.drawio", "shared/dims.drawio"]:
+        assert "DIM_DATE" in (output_dir / name).read_text()
+
+
+def test_scheduler_scans_includes_at_startup_and_skips_fragment_errors(
+    tmp_path: pathlib.Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    # Arrange: a fragment referencing a table only the model defines
+    input_dir = tmp_path / "input"
+    input_dir.mkdir()
+    fragment = input_dir / "fragment.dsl"
+    fragment.write_text("TABLE DIM_DATE {\n DATE_ID *\n}\n")
+    (input_dir / "sales.dsl").write_text(
+        "INCLUDE fragment.dsl\nTABLE FACT_SALES {\n SALE_ID *\n DATE_ID\n}\n"
+    )
+    output_dir = tmp_path / "output"
+    scheduler = RegenerationScheduler(
+        max_workers=1, input_dir=str(input_dir), output_dir=str(output_dir)
+    )
+
+    # Act
+    scheduler.scan_includes()
+    fragment.write_text(
+        "TABLE DIM_DATE {\n DATE_ID *\n}\n"
+        "REFERENCE FACT_SALES.DATE_ID -> DIM_DATE.DATE_ID\n"
+    )
+    with caplog.at_level("INFO"):
+        scheduler.submit(str(fragment))
+        scheduler.shutdown()
+
+    # Assert
+    assert "DIM_DATE" in (output_dir / "sales.drawio").read_text()
+    assert "Skipped" in caplog.text
+    assert not [record for record in caplog.records if record.levelname == "ERROR"]
@@ -0,0 +1,154 @@
+import pathlib
+import tracemalloc
+
+import pytest
+
+from drawio_tools.drawio_generator import DrawioGenerator
+from drawio_tools.dsl_parse_cache import DslParseCache
+from drawio_tools.dsl_events import (
+    ArrangeEvent,
+    ColumnEvent,
+    CreatedAtEvent,
+    IncludeEvent,
+    ReferenceEvent,
+    TableEvent,
+    TitleEvent,
+)
+
+DSL_CONTENT = """TITLE Sales
+CREATEDAT 2024-01-01
+INCLUDE shared/dims.dsl
+
+TABLE FACT_SALES {
+    SALE_ID *
+    CUSTOMER_ID
+}
+REFERENCE FACT_SALES.CUSTOMER_ID -> DIM_CUSTOMER.CUSTOMER_ID [ERmany, ERone]
+ARRANGE FACT_SALES (10, -20)
+"""
+
+SHARED_CONTENT = """TITLE Ignored in included files
+TABLE DIM_CUSTOMER {
+    CUSTOMER_ID *
+}
+"""
+
+
+def write_model(tmp_path: pathlib.Path) -> str:
+    """Helper to write a model INCLUDing a shared file; returns its path."""
+    (tmp_path / "shared").mkdir()
+    (tmp_path / "shared" / "dims.dsl").write_text(SHARED_CONTENT)
+    dsl_file = tmp_path / "sales.dsl"
+    dsl_file.write_text(DSL_CONTENT)
+    return str(dsl_file)
+
+
+def test_iter_events_yields_typed_events_with_lines(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    path = write_model(tmp_path)
+    shared = str(tmp_path / "shared" / "dims.dsl")
+
+    # Act
+    events = list(DrawioGenerator().iter_events(path))
+
+    # Assert
+    assert events == [
+        TitleEvent(path, 1, "Sales"),
+        CreatedAtEvent(path, 2, "2024-01-01"),
+        IncludeEvent(path, 3, shared),
+        TableEvent(shared, 2, "DIM_CUSTOMER"),
+        ColumnEvent(shared, 3, "DIM_CUSTOMER", "CUSTOMER_ID", "PK"),
+        TableEvent(path, 5, "FACT_SALES"),
+        ColumnEvent(path, 6, "FACT_SALES", "SALE_ID", "PK"),
+        ColumnEvent(path, 7, "FACT_SALES", "CUSTOMER_ID", ""),
+        ReferenceEvent(
+            path,
+            9,
+            "FACT_SALES",
+            "CUSTOMER_ID",
+            "DIM_CUSTOMER",
+            "CUSTOMER_ID",
+            "ERmany",
+            "ERone",
+        ),
+        ArrangeEvent(path, 10, "FACT_SALES", 10, -20),
+    ]
+
+
+def test_parse_consumes_the_event_stream(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    path = write_model(tmp_path)
+
+    # Act
+    model = DrawioGenerator().parse(path)
+
+    # Assert
+    assert model.title == "Sales"
+    assert model.tables["FACT_SALES"] == (("SALE_ID", "PK"), ("CUSTOMER_ID", "FK"))
+    assert model.references["FACT_SALES"][0]["start_arrow"] == "ERmany"
+    assert model.positions["FACT_SALES"] == (10, -20)
+
+
+def test_import_file_streams_root_file_unless_cache_is_shared(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    path = write_model(tmp_path)
+    private = DrawioGenerator()
+    shared = DrawioGenerator(parse_cache=DslParseCache())
+
+    # Act
+    private.import_file(path)
+    shared.import_file(path)
+
+    # Assert
+    # Only the INCLUDEd file is kept unless other generators may reuse it.
+    assert private.parse_cache.misses == 1
+    assert shared.parse_cache.misses == 2
+    assert private.tables == shared.tables
+
+
+def test_iter_events_stops_early_and_reports_bad_lines(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    dsl_file = tmp_path / "broken.dsl"
+    dsl_file.write_text("TABLE A {\n    ID *\n}\nARRANGE A (x, y)\n")
+    generator = DrawioGenerator()
+
+    # Act
+    first_column = next(
+        event
+        for event in generator.iter_events(str(dsl_file))
+        if isinstance(event, ColumnEvent)
+    )
+
+    # Assert
+    assert first_column.column == "ID"
+    with pytest.raises(ValueError):
+        list(generator.iter_events(str(dsl_file)))
+
+
+def test_iter_events_memory_stays_flat(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    dsl_file = tmp_path / "large.dsl"
+    with open(dsl_file, "w") as f:
+        for i in range(3000):
+            f.write(f"TABLE T{i} {{\n")
+            f.writelines(f"    C{j}\n" for j in range(10))
+            f.write("}\n")
+            if i:
+                f.write(f"REFERENCE T{i}.C1 -> T{i - 1}.C0\n")
+    size = dsl_file.stat().st_size
+
+    # Act
+    tracemalloc.start()
+    try:
+        count = sum(1 for _ in DrawioGenerator().iter_events(str(dsl_file)))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # Assert
+    assert count == 3000 * 11 + 2999
+    assert peak < size / 10
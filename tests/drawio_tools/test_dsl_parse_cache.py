@@ -0,0 +1,120 @@
+import os
+import pathlib
+from typing import List
+
+from drawio_tools.drawio_generator import DrawioGenerator
+from drawio_tools.dsl_events import TitleEvent
+from drawio_tools.dsl_parse_cache import DslParseCache, DslStatement
+
+
+def write_dsl(tmp_path: pathlib.Path, content: str) -> str:
+    """Helper to write a DSL file and return its path."""
+    dsl_file = tmp_path / "model.dsl"
+    dsl_file.write_text(content)
+    return str(dsl_file)
+
+
+class CountingParser:
+    """Fake statement parser recording how often it is called."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def __call__(self, path_file_name: str) -> List[DslStatement]:
+        self.calls += 1
+        with open(path_file_name) as f:
+            return [TitleEvent("model.dsl", 1, f.read().strip())]
+
+
+def test_get_or_parse_reuses_entry_while_file_is_unchanged(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    path = write_dsl(tmp_path, "first")
+    cache = DslParseCache()
+    parser = CountingParser()
+
+    # Act
+    first = cache.get_or_parse(path, parser)
+    second = cache.get_or_parse(path, parser)
+
+    # Assert
+    assert first == second == [TitleEvent("model.dsl", 1, "first")]
+    assert parser.calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_get_or_parse_reparses_modified_file(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    path = write_dsl(tmp_path, "first")
+    cache = DslParseCache()
+    parser = CountingParser()
+    cache.get_or_parse(path, parser)
+
+    # Act
+    pathlib.Path(path).write_text("second version")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    statements = cache.get_or_parse(path, parser)
+
+    # Assert
+    assert statements == [TitleEvent("model.dsl", 1, "second version")]
+    assert parser.calls == 2
+
+
+def test_disk_cache_is_shared_between_instances(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    path = write_dsl(tmp_path, "shared")
+    cache_dir = str(tmp_path / "cache")
+    parser = CountingParser()
+    DslParseCache(cache_dir=cache_dir).get_or_parse(path, parser)
+
+    # Act
+    other = DslParseCache(cache_dir=cache_dir)
+    statements = other.get_or_parse(path, parser)
+
+    # Assert
+    assert statements == [TitleEvent("model.dsl", 1, "shared")]
+    assert parser.calls == 1
+    assert other.hits == 1
+    assert [name for name in os.listdir(cache_dir) if name.endswith(".tmp")] == []
+
+
+def test_disk_cache_ignores_corrupt_entries(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    path = write_dsl(tmp_path, "content")
+    cache_dir = tmp_path / "cache"
+    cache = DslParseCache(cache_dir=str(cache_dir))
+    parser = CountingParser()
+    cache.get_or_parse(path, parser)
+    for entry in cache_dir.iterdir():
+        entry.write_bytes(b"not a pickle")
+
+    # Act
+    statements = DslParseCache(cache_dir=str(cache_dir)).get_or_parse(path, parser)
+
+    # Assert
+    assert statements == [TitleEvent("model.dsl", 1, "content")]
+    assert parser.calls == 2
+
+
+def test_same_content_in_other_folder_includes_its_own_files(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    cache_dir = str(tmp_path / "cache")
+    for folder, table in (("a", "A_ONLY"), ("b", "B_ONLY")):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "model.dsl").write_text("INCLUDE shared.dsl\n")
+        (tmp_path / folder / "shared.dsl").write_text(f"TABLE {table} {{\n ID *\n}}\n")
+    DrawioGenerator(parse_cache=DslParseCache(cache_dir)).parse(
+        str(tmp_path / "a" / "model.dsl")
+    )
+
+    # Act
+    model = DrawioGenerator(parse_cache=DslParseCache(cache_dir)).parse(
+        str(tmp_path / "b" / "model.dsl")
+    )
+
+    # Assert
+    assert list(model.tables) == ["B_ONLY"]
@@ -0,0 +1,139 @@
+import json
+import pathlib
+import xml.etree.ElementTree as ET
+from unittest.mock import patch
+
+import pytest
+
+from drawio_tools.drawio_generator import DrawioGenerator
+from drawio_tools.emitters import EMITTERS, Emitter, Layout, register_emitter
+
+DSL_CONTENT = """
+TITLE Sales
+TABLE FACT_SALES {
+    SALE_ID *
+    CUSTOMER_ID
+}
+TABLE DIM_CUSTOMER {
+    CUSTOMER_ID *
+}
+REFERENCE FACT_SALES.CUSTOMER_ID -> DIM_CUSTOMER.CUSTOMER_ID [ERmany, ERone]
+ARRANGE DIM_CUSTOMER (400, 120)
+"""
+
+
+@pytest.fixture
+def generator(tmp_path: pathlib.Path) -> DrawioGenerator:
+    dsl_file = tmp_path / "sales.dsl"
+    dsl_file.write_text(DSL_CONTENT)
+    generator = DrawioGenerator()
+    generator.output_dir = str(tmp_path / "output")
+    generator.import_file(str(dsl_file))
+    return generator
+
+
+def test_write_outputs_shares_one_layout_across_emitters(
+    generator: DrawioGenerator,
+) -> None:
+    # Act
+    with patch.object(
+        generator, "_compute_layout", wraps=generator._compute_layout
+    ) as layout:
+        paths = generator.write_outputs("sales", list(EMITTERS))
+
+    # Assert
+    layout.assert_called_once_with()
+    assert [pathlib.Path(path).name for path in paths] == [
+        "sales.drawio",
+        "sales.svg",
+        "sales.mmd",
+        "sales.dot",
+        "sales.json",
+    ]
+    drawio = ET.parse(paths[0]).getroot()
+    assert drawio.tag == "mxGraphModel"
+
+
+def test_mermaid_emitter(generator: DrawioGenerator) -> None:
+    mermaid = EMITTERS["mermaid"].emit(generator, generator._compute_layout())
+
+    assert "erDiagram" in mermaid
+    assert "        column SALE_ID PK" in mermaid
+    assert "        column CUSTOMER_ID FK" in mermaid
+    assert '    FACT_SALES }o--|| DIM_CUSTOMER : "CUSTOMER_ID → CUSTOMER_ID"' in mermaid
+
+
+def test_mermaid_emitter_quotes_schema_qualified_names() -> None:
+    # Arrange
+    generator = DrawioGenerator()
+    generator.tables = {
+        "sales.orders": [("ORDER_ID", "PK"), ("CUSTOMER_ID", "FK")],
+        "DIM_CUSTOMER": [("CUSTOMER_ID", "PK")],
+    }
+    generator.references = {
+        "sales.orders": [
+            {
+                "column_name": "CUSTOMER_ID",
+                "table_reference": "DIM_CUSTOMER",
+                "column_reference": "CUSTOMER_ID",
+                "start_arrow": "ERmany",
+                "end_arrow": "ERone",
+            }
+        ]
+    }
+
+    # Act
+    mermaid = EMITTERS["mermaid"].emit(generator, generator._compute_layout())
+
+    # Assert
+    assert '    "sales.orders" {' in mermaid
+    assert '    "sales.orders" }o--|| DIM_CUSTOMER : ' in mermaid
+
+
+def test_dot_emitter_uses_layout_positions(generator: DrawioGenerator) -> None:
+    dot = EMITTERS["dot"].emit(generator, generator._compute_layout())
+
+    assert dot.startswith('digraph "Sales" {')
+    assert '"DIM_CUSTOMER" [pos="400,-120!"' in dot
+    assert '"FACT_SALES":"CUSTOMER_ID" -> "DIM_CUSTOMER":"CUSTOMER_ID";' in dot
+
+
+def test_json_emitter(generator: DrawioGenerator) -> None:
+    document = json.loads(EMITTERS["json"].emit(generator, generator._compute_layout()))
+
+    assert document["title"] == "Sales"
+    assert document["tables"][1] == {
+        "name": "DIM_CUSTOMER",
+        "columns": [{"name": "CUSTOMER_ID", "key": "PK"}],
+        "x": 400,
+        "y": 120,
+        "width": 170,
+        "height": 60,
+    }
+    assert document["references"][0]["table"] == "FACT_SALES"
+
+
+def test_register_emitter_adds_custom_backend(generator: DrawioGenerator) -> None:
+    # Arrange
+    class TableListEmitter(Emitter):
+        name = "tables"
+        extension = "txt"
+
+        def emit(self, generator: DrawioGenerator, layout: Layout) -> str:
+            return "\n".join(generator.tables)
+
+    register_emitter(TableListEmitter())
+
+    try:
+        # Act
+        (path,) = generator.write_outputs("sales", ["tables"])
+
+        # Assert
+        assert pathlib.Path(path).read_text() == "FACT_SALES\nDIM_CUSTOMER"
+    finally:
+        del EMITTERS["tables"]
+
+
+def test_write_outputs_rejects_unknown_format(generator: DrawioGenerator) -> None:
+    with pytest.raises(ValueError, match="Unknown output format"):
+        generator.write_outputs("sales", ["pdf"])
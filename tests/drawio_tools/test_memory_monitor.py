@@ -0,0 +1,182 @@
+import pathlib
+import tracemalloc
+
+import pytest
+
+from drawio_tools.drawio_generator import DrawioGenerator
+from drawio_tools.memory_monitor import (
+    MemoryBudgetExceeded,
+    MemoryMonitor,
+    parse_size,
+)
+
+DSL_CONTENT = """
+TABLE FACT_SALES {
+    SALE_ID *
+    CUSTOMER_ID +
+}
+TABLE DIM_CUSTOMER {
+    CUSTOMER_ID *
+}
+REFERENCE FACT_SALES.CUSTOMER_ID -> DIM_CUSTOMER.CUSTOMER_ID
+"""
+
+
+def build_wide_generator(
+    monitor: MemoryMonitor, table_count: int = 60, column_count: int = 20
+) -> DrawioGenerator:
+    """Helper to create a generator whose row cells dwarf its HTML cells."""
+    generator = DrawioGenerator(memory_monitor=monitor)
+    generator.tables = {
+        f"TABLE_{i}": [
+            (f"COLUMN_{j}", "PK" if j == 0 else "") for j in range(column_count)
+        ]
+        for i in range(table_count)
+    }
+    return generator
+
+
+def test_monitor_records_every_phase(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    dsl_file = tmp_path / "sales.dsl"
+    dsl_file.write_text(DSL_CONTENT)
+    monitor = MemoryMonitor(top=3)
+    generator = DrawioGenerator(memory_monitor=monitor)
+
+    # Act
+    monitor.start()
+    try:
+        generator.import_file(str(dsl_file))
+        generator.mxgraph_bytes()
+    finally:
+        monitor.stop()
+
+    # Assert
+    assert [stats.phase for stats in monitor.phases] == [
+        "parse",
+        "edges",
+        "tables",
+        "serialize",
+    ]
+    tables = monitor.phases[2]
+    assert tables.peak >= tables.net > 0
+    assert tables.top_sites
+    report = monitor.report()
+    assert "Memory by phase (budget none):" in report
+    assert "Top allocation sites of tables:" in report
+
+
+def test_budget_exceeded_fails_fast_with_report() -> None:
+    # Arrange
+    monitor = MemoryMonitor(budget=64 * 1024, top=0)
+    generator = build_wide_generator(monitor)
+
+    # Act
+    with pytest.raises(MemoryBudgetExceeded) as error:
+        generator.mxgraph_bytes()
+    monitor.stop()
+
+    # Assert
+    assert error.value.phase == "tables"
+    assert "tables (interrupted)" in error.value.report
+    assert "budget 0.1 MiB" in str(error.value)
+
+
+def test_snapshots_only_when_budget_trips(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Arrange
+    snapshots = []
+    take_snapshot = tracemalloc.take_snapshot
+
+    def counting_take_snapshot() -> tracemalloc.Snapshot:
+        snapshots.append(1)
+        return take_snapshot()
+
+    monkeypatch.setattr(tracemalloc, "take_snapshot", counting_take_snapshot)
+    within = MemoryMonitor()
+    over = MemoryMonitor(budget=64 * 1024)
+
+    # Act
+    build_wide_generator(within, table_count=5).mxgraph_bytes()
+    within.stop()
+    within_snapshots = len(snapshots)
+    with pytest.raises(MemoryBudgetExceeded) as error:
+        build_wide_generator(over).mxgraph_bytes()
+    over.stop()
+
+    # Assert
+    assert within_snapshots == 0
+    assert len(snapshots) == 1
+    assert "Top allocation sites of tables (interrupted):" in error.value.report
+
+
+def test_html_strategy_retries_over_budget_render() -> None:
+    # Arrange
+    measured = MemoryMonitor(top=0)
+    html_generator = build_wide_generator(measured)
+    html_generator.table_rendering = "html"
+    html_generator.mxgraph_bytes()
+    html_peak = max(stats.peak for stats in measured.phases)
+    measured.stop()
+    monitor = MemoryMonitor(budget=3 * html_peak, top=0, strategy="html")
+    generator = build_wide_generator(monitor)
+
+    # Act
+    data = generator.mxgraph_bytes()
+    monitor.stop()
+
+    # Assert
+    assert generator.table_rendering == "rows"
+    assert b"&lt;table" in data
+    assert b"shape=table" not in data
+    # The interrupted rows attempt only completed its edges phase.
+    assert [stats.phase for stats in monitor.phases] == [
+        "edges",
+        "edges",
+        "tables",
+        "serialize",
+    ]
+    assert all(stats.peak <= monitor.budget for stats in monitor.phases)
+
+
+def test_write_outputs_retries_over_budget_render(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    measured = MemoryMonitor()
+    html_generator = build_wide_generator(measured)
+    html_generator.table_rendering = "html"
+    html_generator.mxgraph_bytes()
+    html_peak = max(stats.peak for stats in measured.phases)
+    measured.stop()
+    monitor = MemoryMonitor(budget=3 * html_peak, strategy="html")
+    generator = build_wide_generator(monitor)
+    generator.output_dir = str(tmp_path)
+    generator.serializer = "template"
+
+    # Act
+    paths = generator.write_outputs("wide", ["drawio", "mermaid"])
+    monitor.stop()
+
+    # Assert
+    assert b"&lt;table" in pathlib.Path(paths[0]).read_bytes()
+    assert pathlib.Path(paths[1]).exists()
+
+
+def test_html_strategy_fails_when_html_is_over_budget() -> None:
+    # Arrange
+    monitor = MemoryMonitor(budget=1024, top=0, strategy="html")
+    generator = build_wide_generator(monitor, table_count=5)
+
+    # Act / Assert
+    with pytest.raises(MemoryBudgetExceeded):
+        generator.mxgraph_bytes()
+    monitor.stop()
+
+
+def test_parse_size_and_invalid_options() -> None:
+    # Assert
+    assert parse_size("1024") == 1024
+    assert parse_size("800M") == 800 * 1024**2
+    assert parse_size("1gib") == 1024**3
+    with pytest.raises(ValueError):
+        parse_size("lots")
+    with pytest.raises(ValueError):
+        MemoryMonitor(strategy="swap")
@@ -0,0 +1,164 @@
+import os
+import pathlib
+
+import pytest
+
+from drawio_tools.drawio_generator import DrawioGenerator
+from drawio_tools.model_cache import ModelCache
+
+DSL_CONTENT = """
+TITLE Sales
+INCLUDE dims.dsl
+TABLE FACT_SALES {
+    SALE_ID *
+    CUSTOMER_ID
+}
+REFERENCE FACT_SALES.CUSTOMER_ID -> DIM_CUSTOMER.CUSTOMER_ID
+ARRANGE FACT_SALES (100, 200)
+"""
+
+DIMS_CONTENT = """
+TABLE DIM_CUSTOMER {
+    CUSTOMER_ID *
+}
+"""
+
+
+def write_model(tmp_path: pathlib.Path) -> str:
+    """Helper to write a DSL file with one INCLUDE and return its path."""
+    (tmp_path / "dims.dsl").write_text(DIMS_CONTENT)
+    dsl_file = tmp_path / "sales.dsl"
+    dsl_file.write_text(DSL_CONTENT)
+    return str(dsl_file)
+
+
+def import_with_cache(path: str, cache: ModelCache) -> DrawioGenerator:
+    """Imports the file through a fresh generator sharing the model cache."""
+    generator = DrawioGenerator(model_cache=cache)
+    generator.import_file(path)
+    return generator
+
+
+def test_import_file_reuses_cached_model(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Arrange
+    path = write_model(tmp_path)
+    cache_dir = str(tmp_path / "cache")
+    first = import_with_cache(path, ModelCache(cache_dir))
+
+    def fail(*args: object) -> None:
+        raise AssertionError("parsed although the model was cached")
+
+    monkeypatch.setattr(DrawioGenerator, "_parse_dsl_file", fail)
+
+    # Act: a new cache instance, as in a later run
+    cache = ModelCache(cache_dir)
+    second = import_with_cache(path, cache)
+
+    # Assert
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert second.tables == first.tables
+    assert second.references == first.references
+    assert second.positions == {"FACT_SALES": (100, 200)}
+    assert second.title == "Sales"
+
+
+def test_changed_include_invalidates_entry(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    path = write_model(tmp_path)
+    cache = ModelCache(str(tmp_path / "cache"))
+    import_with_cache(path, cache)
+
+    # Act
+    (tmp_path / "dims.dsl").write_text(DIMS_CONTENT.replace("}", "    NAME\n}"))
+    generator = import_with_cache(path, cache)
+
+    # Assert
+    assert cache.misses == 2
+    assert ("NAME", "") in generator.tables["DIM_CUSTOMER"]
+
+
+def test_entries_are_keyed_by_content_not_path(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    path = write_model(tmp_path)
+    cache = ModelCache(str(tmp_path / "cache"))
+    import_with_cache(path, cache)
+    copy = tmp_path / "copy.dsl"
+    copy.write_text(DSL_CONTENT)
+
+    # Act
+    import_with_cache(str(copy), cache)
+    pathlib.Path(path).write_text(DSL_CONTENT + "\nTABLE X {\n A\n}\n")
+    import_with_cache(path, cache)
+
+    # Assert
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_corrupt_entry_is_reparsed(tmp_path: pathlib.Path) -> None:
+    # Arrange
+    path = write_model(tmp_path)
+    cache_dir = tmp_path / "cache"
+    cache = ModelCache(str(cache_dir))
+    import_with_cache(path, cache)
+    for entry in cache_dir.iterdir():
+        entry.write_bytes(b"not a cache entry")
+
+    # Act
+    generator = import_with_cache(path, cache)
+
+    # Assert
+    assert cache.misses == 2
+    assert "FACT_SALES" in generator.tables
+
+
+def test_eviction_removes_least_recently_used_entries(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    cache_dir = tmp_path / "cache"
+    cache = ModelCache(str(cache_dir), max_bytes=10**9)
+    paths = []
+    for index in range(3):
+        dsl_file = tmp_path / f"m{index}.dsl"
+        dsl_file.write_text(f"TABLE T{index} {{\n    ID *\n}}\n")
+        paths.append(str(dsl_file))
+        import_with_cache(str(dsl_file), cache)
+    entries = sorted(cache_dir.iterdir())
+    entry_size = entries[0].stat().st_size
+    for age, entry in enumerate(entries):
+        os.utime(entry, ns=(age * 10**9, age * 10**9))
+    # Reading the oldest entry makes it the most recently used.
+    oldest = min(entries, key=lambda entry: entry.stat().st_mtime_ns)
+    for path in paths:
+        if cache._entry_path(path) == str(oldest):
+            import_with_cache(path, cache)
+
+    # Act
+    cache.max_bytes = entry_size * 2
+    cache._evict()
+
+    # Assert
+    remaining = set(cache_dir.iterdir())
+    assert len(remaining) == 2
+    assert oldest in remaining
+
+
+def test_same_content_in_other_folder_checks_its_own_includes(
+    tmp_path: pathlib.Path,
+) -> None:
+    # Arrange
+    cache = ModelCache(str(tmp_path / "cache"))
+    for folder, table in (("a", "A_ONLY"), ("b", "B_ONLY")):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "model.dsl").write_text("INCLUDE shared.dsl\n")
+        (tmp_path / folder / "shared.dsl").write_text(f"TABLE {table} {{\n ID *\n}}\n")
+    import_with_cache(str(tmp_path / "a" / "model.dsl"), cache)
+
+    # Act
+    generator = import_with_cache(str(tmp_path / "b" / "model.dsl"), cache)
+
+    # Assert
+    assert list(generator.tables) == ["B_ONLY"]
+    assert (cache.hits, cache.misses) == (0, 2)
@@ -0,0 +1,114 @@
+import random
+import time
+from typing import Dict, List
+
+from drawio_tools.drawio_render import ErdModel
+from drawio_tools.schema_graph import SchemaGraph
+
+# Upper bound for indexing and querying 100k references, in seconds; about
+# half of it is spent with coverage tracing on a slow runner.
+LARGE_GRAPH_BUDGET_S = 2.0
+
+
+def make_references(*pairs: str) -> Dict[str, List[Dict[str, str]]]:
+    """Builds a references dict from "SOURCE->TARGET" strings."""
+    references: Dict[str, List[Dict[str, str]]] = {}
+    for pair in pairs:
+        source, target = pair.split("->")
+        references.setdefault(source, []).append(
+            {
+                "column_name": "ID",
+                "table_reference": target,
+                "column_reference": "ID",
+            }
+        )
+    return references
+
+
+def test_csr_adjacency_and_degrees() -> None:
+    # Arrange
+    references = make_references("FACT->DIM_A", "FACT->DIM_B", "OTHER->DIM_A")
+
+    # Act
+    graph = SchemaGraph(["DIM_A", "DIM_B", "FACT", "OTHER"], references)
+
+    # Assert
+    fact = graph.index["FACT"]
+    neighbours = graph.out_targets[
+        graph.out_offsets[fact] : graph.out_offsets[fact + 1]
+    ]
+    assert [graph.names[i] for i in neighbours] == ["DIM_A", "DIM_B"]
+    assert graph.out_degree("FACT") == 2
+    assert graph.in_degree("DIM_A") == 2
+    assert graph.in_degree("FACT") == 0
+    assert graph.top_fan_in(1) == [("DIM_A", 2)]
+
+
+def test_components_and_orphans() -> None:
+    # Arrange
+    references = make_references("SALES->CUSTOMER", "STOCK->PRODUCT")
+
+    # Act
+    graph = SchemaGraph(
+        ["SALES", "CUSTOMER", "STOCK", "PRODUCT", "WAREHOUSE", "AUDIT"], references
+    )
+
+    # Assert
+    assert graph.components() == [
+        ["SALES", "CUSTOMER"],
+        ["STOCK", "PRODUCT"],
+        ["WAREHOUSE"],
+        ["AUDIT"],
+    ]
+    assert graph.orphans() == ["WAREHOUSE", "AUDIT"]
+
+
+def test_cycles_include_loops_and_self_references() -> None:
+    # Arrange
+    references = make_references(
+        "A->B", "B->C", "C->A", "C->D", "EMPLOYEE->EMPLOYEE", "D->E"
+    )
+
+    # Act
+    graph = SchemaGraph(["A", "B", "C", "D", "E", "EMPLOYEE"], references)
+
+    # Assert
+    assert sorted(graph.cycles()) == [["A", "B", "C"], ["EMPLOYEE"]]
+
+
+def test_from_model_adds_undeclared_referenced_tables() -> None:
+    # Arrange
+    model = ErdModel(
+        tables={"FACT": [("ID", "PK")]}, references=make_references("FACT->DIM")
+    )
+
+    # Act
+    graph = SchemaGraph.from_model(model)
+
+    # Assert
+    assert graph.names == ["FACT", "DIM"]
+    assert graph.orphans() == []
+
+
+def test_large_graph_is_indexed_quickly() -> None:
+    # Arrange
+    rng = random.Random(7)
+    tables = [f"T{i}" for i in range(20_000)]
+    pairs = [
+        f"T{rng.randrange(20_000)}->T{rng.randrange(20_000)}" for _ in range(100_000)
+    ]
+    references = make_references(*pairs)
+
+    # Act
+    start = time.perf_counter()
+    graph = SchemaGraph(tables, references)
+    graph.components()
+    graph.orphans()
+    graph.top_fan_in()
+    cycles = graph.cycles()
+    elapsed = time.perf_counter() - start
+
+    # Assert
+    assert graph.edge_count == 100_000
+    assert cycles
+    assert elapsed < LARGE_GRAPH_BUDGET_S
@@ -0,0 +1,127 @@
+import json
+import pathlib
+import time
+
+import pytest
+
+from drawio_tools.style_rules import RuleMatcher, StyleRules, load_style_rules
+
+RULES = {
+    "tables": [
+        {"prefix": "BRIDGE_", "style": {"fillColor": "#C5E1A5"}},
+        {"prefix": "STG_", "style": {"fillColor": "#EEEEEE", "dashed": "1"}},
+        {"suffix": "_SNAP", "style": {"fillColor": "#FFE082"}},
+        {"regex": "^(SALES|CRM)_", "style": {"strokeColor": "#1E88E5"}},
+    ],
+    "columns": [
+        {"regex": "^(CREATED|UPDATED)_(AT|BY)$", "style": {"fontColor": "#999999"}},
+        {"suffix": "_AUDIT", "style": {"fontColor": "#999999"}},
+    ],
+}
+
+
+def write_rules(tmp_path: pathlib.Path, rules: dict) -> str:
+    """Helper to write a rules file and return its path."""
+    rules_file = tmp_path / "rules.json"
+    rules_file.write_text(json.dumps(rules))
+    return str(rules_file)
+
+
+def test_rules_match_prefixes_suffixes_and_regexes(tmp_path: pathlib.Path) -> None:
+    # Act
+    rules = load_style_rules(write_rules(tmp_path, RULES))
+
+    # Assert
+    assert rules.table_style("BRIDGE_ORDER_PRODUCT") == {"fillColor": "#C5E1A5"}
+    assert rules.table_style("STG_SALES_SNAP") == {
+        "fillColor": "#FFE082",
+        "dashed": "1",
+    }
+    assert rules.table_style("SALES_ORDERS") == {"strokeColor": "#1E88E5"}
+    assert rules.table_style("DIM_DATE") == {}
+    assert rules.column_style("CREATED_AT") == {"fontColor": "#999999"}
+    assert rules.column_style("CREATED_ATTR") == {}
+    assert rules.column_style("ROW_AUDIT") == {"fontColor": "#999999"}
+
+
+def test_later_rules_override_earlier_ones() -> None:
+    # Arrange
+    matcher = RuleMatcher(
+        [
+            ("regex", "ORDER", {"fillColor": "#111111"}),
+            ("prefix", "", {"fillColor": "#000000", "rounded": "0"}),
+            ("prefix", "FACT", {"fillColor": "#222222"}),
+        ]
+    )
+
+    # Act
+    style = matcher.style_for("FACT_ORDER")
+
+    # Assert
+    assert style == {"fillColor": "#222222", "rounded": "0"}
+    assert matcher.style_for("FACT_ORDER") is style
+
+
+@pytest.mark.parametrize(
+    "document, message",
+    [
+        ({"views": []}, "Invalid rules section 'views'"),
+        ({"tables": [{"style": {}}]}, "needs exactly one of"),
+        ({"tables": [{"prefix": "A", "suffix": "B", "style": {}}]}, "exactly one"),
+        ({"tables": [{"prefix": "A"}]}, "'style' must be an object"),
+        ({"columns": [{"regex": "(", "style": {}}]}, "Invalid regex '('"),
+        ({"columns": [{"regex": "a(?i)", "style": {}}]}, "Invalid regex 'a"),
+    ],
+)
+def test_invalid_rules_are_rejected(document: dict, message: str) -> None:
+    with pytest.raises(ValueError, match=message.replace("(", r"\(")):
+        StyleRules.from_dict(document)
+
+
+@pytest.mark.parametrize(
+    "rules, name",
+    [
+        ([("regex", "(?i)fact_", {"dashed": "1"})], "FACT_SALES"),
+        (
+            [
+                ("regex", "(?P<kind>DIM)_", {"dashed": "1"}),
+                ("regex", "(?P<kind>FACT)_", {"dashed": "1"}),
+            ],
+            "FACT_SALES",
+        ),
+        (
+            [
+                ("regex", "(A)B", {"rounded": "0"}),
+                ("regex", r"(X)(Y)\2", {"dashed": "1"}),
+            ],
+            "XYY",
+        ),
+    ],
+)
+def test_regexes_with_flags_groups_and_backreferences_match(
+    rules: list, name: str
+) -> None:
+    # Act
+    style = RuleMatcher(rules).style_for(name)
+
+    # Assert
+    assert style == {"dashed": "1"}
+
+
+def test_many_rules_match_many_names_quickly() -> None:
+    # Arrange
+    rules = [("prefix", f"P{i}_", {"fillColor": f"#{i:06d}"}) for i in range(300)]
+    rules += [("suffix", f"_S{i}", {"fontColor": f"#{i:06d}"}) for i in range(300)]
+    rules += [("regex", f"^X{i}$", {"dashed": "1"}) for i in range(50)]
+    matcher = RuleMatcher(rules)
+    names = [f"P{i % 400}_COLUMN_{i}_S{i % 350}" for i in range(20_000)]
+
+    # Act
+    start = time.perf_counter()
+    styles = [matcher.style_for(name) for name in names]
+    elapsed = time.perf_counter() - start
+
+    # Assert
+    assert styles[1] == {"fillColor": "#000001", "fontColor": "#000001"}
+    assert styles[340] == {}
+    assert elapsed < 2.0